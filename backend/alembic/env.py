@@ -9,6 +9,7 @@ import os
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
+from app.database import SQLALCHEMY_DATABASE_URL
 from app.models import Base
 
 # this is the Alembic Config object, which provides
@@ -20,6 +21,10 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+# Migrate the database the app is configured for (DB_* / DATABASE_URL)
+# rather than the URL in alembic.ini; % is escaped for configparser
+config.set_main_option("sqlalchemy.url", SQLALCHEMY_DATABASE_URL.replace("%", "%%"))
+
 # add your model's MetaData object here
 # for 'autogenerate' support
 target_metadata = Base.metadata
@@ -0,0 +1,43 @@
+"""add_search_vectors
+
+Revision ID: 1d9f63b8e2a5
+Revises: e7a4b1c06d28
+Create Date: 2026-10-18 15:58:02.716431
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1d9f63b8e2a5'
+down_revision: Union[str, None] = 'e7a4b1c06d28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Generated columns keep the vectors current on every write without triggers.
+    # The config ('english') must match SEARCH_CONFIG in app/routers/search.py.
+    op.execute("""
+        ALTER TABLE tasks ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B')
+        ) STORED
+    """)
+    op.create_index('ix_tasks_search_vector', 'tasks', ['search_vector'], unique=False, postgresql_using='gin')
+    op.execute("""
+        ALTER TABLE notes ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (to_tsvector('english', coalesce(content, ''))) STORED
+    """)
+    op.create_index('ix_notes_search_vector', 'notes', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notes_search_vector', table_name='notes')
+    op.drop_column('notes', 'search_vector')
+    op.drop_index('ix_tasks_search_vector', table_name='tasks')
+    op.drop_column('tasks', 'search_vector')
@@ -0,0 +1,31 @@
+"""make_revoked_token_jti_unique
+
+Revision ID: 2344b47b463c
+Revises: a96174b36e9c
+Create Date: 2026-10-18 14:12:51.407215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2344b47b463c'
+down_revision: Union[str, None] = 'a96174b36e9c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Concurrent refreshes may already have revoked a token twice; keep the first row
+    op.execute(
+        "DELETE FROM revoked_tokens WHERE jti IS NOT NULL AND id NOT IN "
+        "(SELECT min(id) FROM revoked_tokens WHERE jti IS NOT NULL GROUP BY jti)"
+    )
+    op.create_index(op.f('ix_revoked_tokens_jti'), 'revoked_tokens', ['jti'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_revoked_tokens_jti'), table_name='revoked_tokens')
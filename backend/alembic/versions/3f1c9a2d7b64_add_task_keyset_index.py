@@ -0,0 +1,26 @@
+"""add_task_keyset_index
+
+Revision ID: 3f1c9a2d7b64
+Revises: cd7fa85cd28b
+Create Date: 2026-10-18 09:12:04.118310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a2d7b64'
+down_revision: Union[str, None] = 'cd7fa85cd28b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tasks_created_at_id', 'tasks', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_created_at_id', table_name='tasks')
@@ -0,0 +1,38 @@
+"""add_updated_at_columns
+
+Revision ID: 4a6e2c9f1b37
+Revises: 1d9f63b8e2a5
+Create Date: 2026-10-18 17:12:44.381920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a6e2c9f1b37'
+down_revision: Union[str, None] = '1d9f63b8e2a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The initial migration created tasks.updated_at but databases built from
+    # the models with create_all do not have it
+    task_columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('tasks')}
+    if 'updated_at' not in task_columns:
+        op.add_column('tasks', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE tasks SET updated_at = created_at WHERE updated_at IS NULL")
+    op.create_index('ix_tasks_updated_at', 'tasks', ['updated_at'], unique=False)
+
+    op.execute("UPDATE notes SET updated_at = created_at WHERE updated_at IS NULL")
+
+    op.add_column('users', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'updated_at')
+    op.drop_index('ix_tasks_updated_at', table_name='tasks')
+    # tasks.updated_at is left in place; it predates this revision
@@ -0,0 +1,44 @@
+"""add_user_soft_delete
+
+Revision ID: 5c2e8f1a9d47
+Revises: 7d1b4e8a2c65
+Create Date: 2026-10-18 22:05:37.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2e8f1a9d47'
+down_revision: Union[str, None] = '7d1b4e8a2c65'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.create_table('user_deletions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('reassign_to', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('tasks_reassigned', sa.Integer(), nullable=False),
+    sa.Column('notes_detached', sa.Integer(), nullable=False),
+    sa.Column('error', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_user_deletions_id'), 'user_deletions', ['id'], unique=False)
+    op.create_index(op.f('ix_user_deletions_user_id'), 'user_deletions', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_user_deletions_user_id'), table_name='user_deletions')
+    op.drop_index(op.f('ix_user_deletions_id'), table_name='user_deletions')
+    op.drop_table('user_deletions')
+    op.drop_column('users', 'deleted_at')
@@ -0,0 +1,61 @@
+"""add_archive_tables
+
+Revision ID: 7d1b4e8a2c65
+Revises: 2e5a9c7d3f41
+Create Date: 2026-10-18 21:27:53.104876
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d1b4e8a2c65'
+down_revision: Union[str, None] = '2e5a9c7d3f41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Monthly partitions are created by app/archive.py as tasks are archived
+    op.create_table('tasks_archive',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('priority', sa.String(), nullable=True),
+    sa.Column('due_date', sa.Date(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.Column('assigned_to', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    postgresql_partition_by='RANGE (created_at)'
+    )
+    op.create_index('ix_tasks_archive_id', 'tasks_archive', ['id'], unique=False)
+    op.create_index('ix_tasks_archive_created_at_id', 'tasks_archive', ['created_at', 'id'], unique=False)
+    op.create_index('ix_tasks_archive_created_by_created_at', 'tasks_archive', ['created_by', 'created_at'], unique=False)
+    op.create_index('ix_tasks_archive_assigned_to_created_at', 'tasks_archive', ['assigned_to', 'created_at'], unique=False)
+    op.create_table('notes_archive',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('content', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('task_id', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('task_created_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    postgresql_partition_by='RANGE (task_created_at)'
+    )
+    op.create_index('ix_notes_archive_task_id_created_at_id', 'notes_archive', ['task_id', 'created_at', 'id'], unique=False)
+    # Rows without a created_at have no month to go to
+    op.execute("CREATE TABLE tasks_archive_default PARTITION OF tasks_archive DEFAULT")
+    op.execute("CREATE TABLE notes_archive_default PARTITION OF notes_archive DEFAULT")
+
+
+def downgrade() -> None:
+    # Dropping the parents drops every partition
+    op.drop_table('notes_archive')
+    op.drop_table('tasks_archive')
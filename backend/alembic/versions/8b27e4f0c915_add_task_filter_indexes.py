@@ -0,0 +1,36 @@
+"""add_task_filter_indexes
+
+Revision ID: 8b27e4f0c915
+Revises: 3f1c9a2d7b64
+Create Date: 2026-10-18 10:03:51.402877
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b27e4f0c915'
+down_revision: Union[str, None] = '3f1c9a2d7b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tasks_created_by_created_at', 'tasks', ['created_by', 'created_at'], unique=False)
+    op.create_index('ix_tasks_assigned_to_created_at', 'tasks', ['assigned_to', 'created_at'], unique=False)
+    op.create_index('ix_tasks_status_created_at', 'tasks', ['status', 'created_at'], unique=False)
+    op.create_index('ix_tasks_priority_created_at', 'tasks', ['priority', 'created_at'], unique=False)
+    op.create_index('ix_tasks_status_due_date', 'tasks', ['status', 'due_date'], unique=False)
+    op.create_index('ix_tasks_due_date', 'tasks', ['due_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_due_date', table_name='tasks')
+    op.drop_index('ix_tasks_status_due_date', table_name='tasks')
+    op.drop_index('ix_tasks_priority_created_at', table_name='tasks')
+    op.drop_index('ix_tasks_status_created_at', table_name='tasks')
+    op.drop_index('ix_tasks_assigned_to_created_at', table_name='tasks')
+    op.drop_index('ix_tasks_created_by_created_at', table_name='tasks')
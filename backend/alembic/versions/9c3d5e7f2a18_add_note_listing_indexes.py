@@ -0,0 +1,30 @@
+"""add_note_listing_indexes
+
+Revision ID: 9c3d5e7f2a18
+Revises: 4a6e2c9f1b37
+Create Date: 2026-10-18 18:03:27.514062
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3d5e7f2a18'
+down_revision: Union[str, None] = '4a6e2c9f1b37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_notes_task_id_created_at_id', 'notes', ['task_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_notes_user_id_created_at_id', 'notes', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_notes_created_at_id', 'notes', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notes_created_at_id', table_name='notes')
+    op.drop_index('ix_notes_user_id_created_at_id', table_name='notes')
+    op.drop_index('ix_notes_task_id_created_at_id', table_name='notes')
@@ -0,0 +1,38 @@
+"""make_task_sort_keys_not_null
+
+Revision ID: a96174b36e9c
+Revises: b3f7a1d9e452
+Create Date: 2026-10-18 09:41:27.318604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a96174b36e9c'
+down_revision: Union[str, None] = 'b3f7a1d9e452'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset pagination compares (created_at, id) and (title, id) as tuples,
+    # which skips rows whose key is null
+    op.execute("UPDATE tasks SET created_at = COALESCE(updated_at, now()) WHERE created_at IS NULL")
+    op.alter_column('tasks', 'created_at', existing_type=sa.DateTime(timezone=True), nullable=False)
+    op.execute("UPDATE tasks_archive SET created_at = COALESCE(updated_at, archived_at) WHERE created_at IS NULL")
+    op.execute(
+        "UPDATE notes_archive SET task_created_at = tasks_archive.created_at "
+        "FROM tasks_archive WHERE notes_archive.task_id = tasks_archive.id AND notes_archive.task_created_at IS NULL"
+    )
+    op.alter_column('tasks_archive', 'created_at', existing_type=sa.DateTime(), nullable=False)
+    op.alter_column('tasks_archive', 'title', existing_type=sa.String(), nullable=False)
+
+
+def downgrade() -> None:
+    op.alter_column('tasks_archive', 'title', existing_type=sa.String(), nullable=True)
+    op.alter_column('tasks_archive', 'created_at', existing_type=sa.DateTime(), nullable=True)
+    op.alter_column('tasks', 'created_at', existing_type=sa.DateTime(timezone=True), nullable=True)
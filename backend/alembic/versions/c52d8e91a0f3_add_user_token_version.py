@@ -0,0 +1,26 @@
+"""add_user_token_version
+
+Revision ID: c52d8e91a0f3
+Revises: 8b27e4f0c915
+Create Date: 2026-10-18 11:27:36.905114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c52d8e91a0f3'
+down_revision: Union[str, None] = '8b27e4f0c915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,47 @@
+"""add_task_summary_table
+
+Revision ID: e7a4b1c06d28
+Revises: c52d8e91a0f3
+Create Date: 2026-10-18 14:41:19.553602
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a4b1c06d28'
+down_revision: Union[str, None] = 'c52d8e91a0f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('task_summary',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('scope', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('priority', sa.String(), nullable=False),
+    sa.Column('task_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id', 'scope', 'status', 'priority')
+    )
+
+    # Backfill from the existing tasks; see models.TaskSummary for the layout
+    op.execute("""
+        INSERT INTO task_summary (user_id, scope, status, priority, task_count)
+        SELECT COALESCE(assigned_to, 0), 'assigned', status, priority, COUNT(*)
+        FROM tasks
+        GROUP BY COALESCE(assigned_to, 0), status, priority
+        UNION ALL
+        SELECT created_by, 'created', status, priority, COUNT(*)
+        FROM tasks
+        WHERE created_by IS NOT NULL
+          AND (assigned_to IS NULL OR assigned_to <> created_by)
+        GROUP BY created_by, status, priority
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('task_summary')
@@ -0,0 +1,144 @@
+import logging
+import os
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import delete, insert, literal, select, text, union_all
+from sqlalchemy.sql.util import ClauseAdapter
+
+from . import jobs, models
+from .database import SessionLocal, engine
+from .models import TaskStatus
+
+logger = logging.getLogger(__name__)
+
+# Completed tasks untouched for this many days are archived
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "180"))
+# Tasks moved per transaction; small batches keep row locks short
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+# Seconds to sleep between batches so regular writes aren't starved
+ARCHIVE_BATCH_PAUSE = float(os.getenv("ARCHIVE_BATCH_PAUSE", "0.1"))
+
+_tasks = models.Task.__table__
+_notes = models.Note.__table__
+_archived_tasks = models.ArchivedTask.__table__
+_archived_notes = models.ArchivedNote.__table__
+TASK_COLUMNS = [column.name for column in _tasks.columns]
+NOTE_COLUMNS = [column.name for column in _notes.columns]
+
+# Hot and archived tasks as one relation. Postgres pushes filters and the
+# keyset ORDER BY/LIMIT into both branches, so each still uses its indexes.
+all_tasks = union_all(
+    select(*_tasks.c),
+    select(*[_archived_tasks.c[name] for name in TASK_COLUMNS])
+).subquery("all_tasks")
+
+def including_archived(stmt, include_archived: bool = True):
+    """
+    Rewrite a finished statement over `tasks` (filters, visibility subqueries
+    and all) to read archived tasks as well.
+    """
+    return ClauseAdapter(all_tasks).traverse(stmt) if include_archived else stmt
+
+def _month(value: datetime) -> date:
+    return date(value.year, value.month, 1)
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+# Monthly partitions known to exist, so the DDL runs once per month per process
+_partitions = set()
+
+def ensure_partitions(months: Iterable[date]) -> None:
+    """
+    Create the tasks_archive and notes_archive partitions for the given months.
+    Runs in its own transaction: the DDL briefly locks the parent tables.
+    """
+    with engine.begin() as connection:
+        for month in sorted(set(months) - _partitions):
+            for table in ("tasks_archive", "notes_archive"):
+                connection.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {table}_{month:%Y_%m} PARTITION OF {table} "
+                    f"FOR VALUES FROM ('{month}') TO ('{_next_month(month)}')"
+                ))
+    _partitions.update(months)
+
+def archive_batch(cutoff: datetime, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """
+    Move up to `batch_size` tasks completed before `cutoff`, with their notes,
+    in one transaction. Rows locked by other transactions are skipped and
+    picked up by a later run. task_summary is left alone: archived tasks stay
+    counted. Returns the number of tasks moved.
+    """
+    db = SessionLocal()
+    try:
+        rows = db.execute(
+            select(models.Task.id, models.Task.created_at)
+            .where(models.Task.status == TaskStatus.completed.value, models.Task.updated_at < cutoff)
+            .order_by(models.Task.updated_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not rows:
+            return 0
+        if db.get_bind().dialect.name == "postgresql":
+            missing = {_month(row.created_at) for row in rows} - _partitions
+            if missing:
+                # Release the row locks while the partitions are created, then retry
+                db.rollback()
+                ensure_partitions(missing)
+                db.close()
+                return archive_batch(cutoff, batch_size)
+
+        ids = [row.id for row in rows]
+        now = datetime.utcnow()
+        db.execute(insert(_archived_tasks).from_select(
+            TASK_COLUMNS + ["archived_at"],
+            select(*_tasks.c, literal(now)).where(_tasks.c.id.in_(ids))
+        ))
+        db.execute(insert(_archived_notes).from_select(
+            NOTE_COLUMNS + ["task_created_at", "archived_at"],
+            select(*_notes.c, _tasks.c.created_at, literal(now))
+            .join_from(_notes, _tasks, _notes.c.task_id == _tasks.c.id)
+            .where(_notes.c.task_id.in_(ids))
+        ))
+        db.execute(delete(_notes).where(_notes.c.task_id.in_(ids)))
+        db.execute(delete(_tasks).where(_tasks.c.id.in_(ids)))
+        db.commit()
+        return len(ids)
+    finally:
+        db.close()
+
+def archive_completed(
+    older_than_days: int = ARCHIVE_AFTER_DAYS,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    max_batches: Optional[int] = None,
+    progress: Optional[Callable[[int], None]] = None
+) -> int:
+    """
+    Archive every completed task untouched for `older_than_days`, batch by batch.
+    Safe to run while the app serves traffic. `progress` is called with the
+    running total after each batch. Returns the number of tasks moved.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    total = batches = 0
+    while max_batches is None or batches < max_batches:
+        moved = archive_batch(cutoff, batch_size)
+        total += moved
+        batches += 1
+        if progress is not None:
+            progress(total)
+        if moved < batch_size:
+            break
+        time.sleep(ARCHIVE_BATCH_PAUSE)
+    logger.info("Archived completed tasks", extra={"tasks": total, "batches": batches})
+    return total
+
+@jobs.handler("archive")
+def archive_job(job: jobs.JobContext) -> dict:
+    """
+    archive_completed() as a background job, queued by POST /api/tasks/archive.
+    """
+    moved = archive_completed(job.params.get("older_than_days", ARCHIVE_AFTER_DAYS), progress=job.progress)
+    return {"tasks_archived": moved}
@@ -1,71 +1,261 @@
+import time
 from datetime import datetime, timedelta
 from typing import Optional
+from uuid import uuid4
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from . import models, schemas
-from .database import get_db
+import os
+from . import hashing, models, revocation, schemas
+from .cache import TTLCache
+from .database import get_async_db, get_db
 from .models import UserRole
 
 # Configuration
 SECRET_KEY = "your-secret-key-here"  # In production, use a secure secret key
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+# Refresh tokens get new access tokens from /api/auth/refresh without a password
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14"))
+
+# When enabled, requests are authorized from the id/role/version claims in the
+# token without loading the user. Tokens issued before these claims existed
+# still fall back to a database lookup.
+AUTH_STATELESS = os.getenv("AUTH_STATELESS", "false").lower() in ("1", "true", "yes")
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "1024"))
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
+# For endpoints that also accept the token some other way
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="/api/auth/token", auto_error=False)
+
+# Full User rows for endpoints that need more than the token claims, keyed by id
+user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
 
+# Hashing runs in the bounded process pool in hashing.py
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return hashing.verify_and_update(plain_password, hashed_password)[0]
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return hashing.hash_password(password)
 
 def authenticate_user(db: Session, email: str, password: str):
+    """
+    Return the user if the password matches, else None.
+    A hash made with an outdated work factor is replaced and committed.
+    """
     user = db.query(models.User).filter(models.User.email == email).first()
-    if not user:
+    if not user or user.deleted_at is not None:
+        hashing.verify_dummy(password)
         return None
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = hashing.verify_and_update(password, user.hashed_password)
+    if not valid:
         return None
+    if new_hash:
+        user.hashed_password = new_hash
+        db.commit()
     return user
 
+async def authenticate_user_async(db: AsyncSession, email: str, password: str):
+    result = await db.execute(select(models.User).where(models.User.email == email))
+    user = result.scalars().first()
+    if not user or user.deleted_at is not None:
+        await hashing.verify_dummy_async(password)
+        return None
+    valid, new_hash = await hashing.verify_and_update_async(password, user.hashed_password)
+    if not valid:
+        return None
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+    return user
+
+async def get_password_hash_async(password: str) -> str:
+    return await hashing.hash_password_async(password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
+        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    # jti names the token for logout; iat is fractional so a token issued right
+    # after a revocation is not caught by it
+    to_encode.update({"exp": expire, "iat": time.time(), "jti": uuid4().hex})
+    to_encode.setdefault("typ", "access")
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
+def create_user_token(user: models.User, expires_delta: Optional[timedelta] = None) -> str:
+    """
+    Issue an access token carrying the claims needed for stateless authorization.
+    """
+    role = user.role.value if isinstance(user.role, UserRole) else str(user.role)
+    return create_access_token(
+        data={"sub": user.email, "uid": user.id, "role": role, "ver": user.token_version},
+        expires_delta=expires_delta
+    )
+
+def create_refresh_token(user: models.User) -> str:
+    return create_access_token(
+        data={"sub": user.email, "uid": user.id, "ver": user.token_version, "typ": "refresh"},
+        expires_delta=timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    )
+
+def revoke_token(db, token_data: schemas.TokenData) -> None:
+    """
+    Revoke one token when `db` (sync or async session) commits.
+    """
+    if token_data.jti is not None:
+        revocation.revoke_token(db, token_data.jti, datetime.utcfromtimestamp(token_data.expires_at))
+
+def revoke_user_tokens(db, user: models.User) -> None:
+    """
+    Revoke every token issued to the user so far when `db` commits: the version
+    bump covers lookups of the user row, the revocation covers stateless checks
+    and refresh tokens.
+    """
+    user.token_version += 1
+    revocation.revoke_user(db, user.id, datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS))
+
+def warmup() -> None:
+    """
+    Sign and verify a throwaway token so the JWT code paths are loaded before the first request.
+    """
+    jwt.decode(create_access_token({"sub": "warmup"}), SECRET_KEY, algorithms=[ALGORITHM])
+
+def invalidate_user(user_id: int) -> None:
+    """
+    Drop a cached user row. Call after any change to the row.
+    """
+    user_cache.invalidate(user_id)
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def decode_token(token: str, token_type: str = "access") -> schemas.TokenData:
+    """
+    Validate a token of the given type. Revocation is checked in memory, without a query.
+    """
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-        token_data = schemas.TokenData(email=email)
-    except JWTError:
-        raise credentials_exception
-    
-    user = db.query(models.User).filter(models.User.email == token_data.email).first()
-    if user is None:
-        raise credentials_exception
-    
+        # Tokens from before refresh tokens existed have no typ and are access tokens
+        if email is None or payload.get("typ", "access") != token_type:
+            raise _credentials_exception()
+        if revocation.revocations.is_revoked(payload.get("jti"), payload.get("uid"), payload.get("iat")):
+            raise _credentials_exception()
+        return schemas.TokenData(
+            email=email,
+            id=payload.get("uid"),
+            role=payload.get("role"),
+            token_version=payload.get("ver"),
+            jti=payload.get("jti"),
+            expires_at=payload.get("exp")
+        )
+    except (JWTError, ValueError):
+        raise _credentials_exception()
+
+def _check_version(user: models.User, token_data: schemas.TokenData) -> models.User:
+    if user.deleted_at is not None:
+        raise _credentials_exception()
+    # Tokens from before the ver claim existed were issued at version 0
+    if user.token_version != (token_data.token_version or 0):
+        raise _credentials_exception()
     return user
 
-def get_current_active_admin(current_user: models.User = Depends(get_current_user)):
+def _principal(user: models.User) -> schemas.TokenData:
+    return schemas.TokenData(
+        email=user.email,
+        id=user.id,
+        role=user.role,
+        token_version=user.token_version
+    )
+
+def _load_user(db: Session, token_data: schemas.TokenData) -> models.User:
+    if token_data.id is None:
+        # Token issued before the id claim existed
+        user = db.query(models.User).filter(models.User.email == token_data.email).first()
+        if user is None:
+            raise _credentials_exception()
+        return _check_version(user, token_data)
+
+    user = user_cache.get(token_data.id)
+    if user is None:
+        user = db.get(models.User, token_data.id)
+        if user is None:
+            raise _credentials_exception()
+        # Detach so the cached row outlives this request's session
+        db.expunge(user)
+        user_cache.set(user.id, user)
+    return _check_version(user, token_data)
+
+async def _load_user_async(db: AsyncSession, token_data: schemas.TokenData) -> models.User:
+    if token_data.id is None:
+        result = await db.execute(select(models.User).where(models.User.email == token_data.email))
+        user = result.scalars().first()
+        if user is None:
+            raise _credentials_exception()
+        return _check_version(user, token_data)
+
+    user = user_cache.get(token_data.id)
+    if user is None:
+        user = await db.get(models.User, token_data.id)
+        if user is None:
+            raise _credentials_exception()
+        db.expunge(user)
+        user_cache.set(user.id, user)
+    return _check_version(user, token_data)
+
+def get_current_principal(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> schemas.TokenData:
+    """
+    Identify the caller. Returns the token claims (id, email, role).
+    In stateless mode no query is made; otherwise the claims are refreshed from the user row.
+    """
+    token_data = decode_token(token)
+    if AUTH_STATELESS and token_data.is_complete():
+        return token_data
+    return _principal(_load_user(db, token_data))
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> models.User:
+    """
+    Load the caller's full User row, served from the in-process cache when possible.
+    The returned row is detached; load it again in the request's session to modify it.
+    """
+    return _load_user(db, decode_token(token))
+
+async def get_current_principal_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> schemas.TokenData:
+    token_data = decode_token(token)
+    if AUTH_STATELESS and token_data.is_complete():
+        return token_data
+    return _principal(await _load_user_async(db, token_data))
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> models.User:
+    return await _load_user_async(db, decode_token(token))
+
+def _require_admin(current_user: schemas.TokenData) -> schemas.TokenData:
     if current_user.role != UserRole.admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    return current_user 
\ No newline at end of file
+    return current_user
+
+def get_current_active_admin(current_user: schemas.TokenData = Depends(get_current_principal)):
+    return _require_admin(current_user)
+
+async def get_current_active_admin_async(current_user: schemas.TokenData = Depends(get_current_principal_async)):
+    return _require_admin(current_user)
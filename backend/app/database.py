@@ -1,9 +1,21 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import DBAPIError, InvalidRequestError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 from dotenv import load_dotenv
+from .metrics import TimedAsyncAdaptedQueuePool, TimedQueuePool, pool_stats, register_engine
+import itertools
+import logging
 import os
+import threading
+from contextlib import contextmanager
+from typing import List
 from urllib.parse import quote_plus
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
 
 load_dotenv()
 
@@ -15,9 +27,192 @@ DB_PORT = os.getenv("DB_PORT", "5432")
 DB_NAME = os.getenv("DB_NAME", "taskmanagement")
 
 SQLALCHEMY_DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# A full URL overrides the DB_* settings, e.g. sqlite:///./bench.db for local benchmarking
+DATABASE_URL = os.getenv("DATABASE_URL")
+if DATABASE_URL:
+    SQLALCHEMY_DATABASE_URL = DATABASE_URL
+
+# Async drivers for the plain URLs DATABASE_URL and DB_REPLICA_URLS take
+_ASYNC_DRIVERS = {
+    "postgresql://": "postgresql+asyncpg://",
+    "sqlite://": "sqlite+aiosqlite://",
+}
+
+def _async_url(url: str) -> str:
+    for plain, driver in _ASYNC_DRIVERS.items():
+        if url.startswith(plain):
+            return driver + url[len(plain):]
+    return url
+
+ASYNC_SQLALCHEMY_DATABASE_URL = _async_url(SQLALCHEMY_DATABASE_URL)
+
+# Serve the hot CRUD endpoints from async handlers on an asyncpg (or aiosqlite) engine
+DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() in ("1", "true", "yes")
+
+# Pool settings per worker process; size them so workers x (size + overflow)
+# stays under the server's max_connections
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Seconds before a connection is replaced; keeps it under proxy/firewall idle cutoffs
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+# Test connections on checkout so ones broken by a failover are replaced, not handed out
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+# "transaction" when connecting through PgBouncer in transaction pooling mode:
+# PgBouncer does the pooling, so no pool is kept here and no server-side
+# prepared statements are used
+DB_POOL_MODE = os.getenv("DB_POOL_MODE", "session").lower()
+# Seconds to wait for the server when opening a connection, so an unreachable
+# database fails a request (or the startup warm-up) instead of hanging it
+DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "5"))
+# Connections each pool opens at startup, capped at DB_POOL_SIZE
+DB_POOL_WARM = int(os.getenv("DB_POOL_WARM", "2"))
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# Comma-separated URLs of read replicas. Read-only endpoints are spread over
+# the healthy ones; everything else, and all reads when none is healthy, uses
+# the primary. A second SQLite file works as a stand-in for local testing.
+DB_REPLICA_URLS = [url.strip() for url in os.getenv("DB_REPLICA_URLS", "").split(",") if url.strip()]
+# A replica further behind the primary than this many seconds is skipped
+DB_REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG", "5"))
+DB_REPLICA_CHECK_SECONDS = float(os.getenv("DB_REPLICA_CHECK_SECONDS", "5"))
+
+def _engine_options(url: str, timed_pool, connect_args: dict) -> dict:
+    if url.startswith("sqlite"):
+        # SQLite connections are shared across the threadpool's threads
+        return {"connect_args": {"check_same_thread": False}}
+    if DB_POOL_MODE == "transaction":
+        return {"poolclass": NullPool, "connect_args": connect_args}
+    return {
+        "connect_args": connect_args,
+        # Timed pools feed the db_pool_checkout_wait_seconds metric
+        "poolclass": timed_pool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+def _async_engine_options(url: str) -> dict:
+    options = _engine_options(url, TimedAsyncAdaptedQueuePool, {"timeout": DB_CONNECT_TIMEOUT})
+    if DB_POOL_MODE == "transaction":
+        # asyncpg prepares every statement; PgBouncer may run the next one on
+        # another server connection, so disable both caches and use unique names
+        options["connect_args"].update({
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        })
+    return options
+
+def _create_engine(url: str):
+    return create_engine(url, **_engine_options(url, TimedQueuePool, {"connect_timeout": DB_CONNECT_TIMEOUT}))
+
+engine = _create_engine(SQLALCHEMY_DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+register_engine("sync", engine)
+
+async_engine = None
+AsyncSessionLocal = None
+if DB_ASYNC:
+    async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL, **_async_engine_options(ASYNC_SQLALCHEMY_DATABASE_URL))
+    # Objects stay usable after commit; async sessions cannot lazily reload them
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    register_engine("async", async_engine)
+
+# Replay lag in seconds; 0 when caught up, and on a server that isn't a standby
+_REPLICA_LAG = text("""
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+class Replica:
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.engine = _create_engine(url)
+        self.async_engine = None
+        if DB_ASYNC:
+            async_url = _async_url(url)
+            self.async_engine = create_async_engine(async_url, **_async_engine_options(async_url))
+        # Trusted until the first check says otherwise
+        self.healthy = True
+        self.lag = None
+
+class ReplicaSet:
+    """
+    Round-robin over the replicas that passed their last health check. A
+    background thread checks each one's reachability and replay lag; a replica
+    that fails to connect during a request is taken out until it passes again.
+    """
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(f"replica{i}", url) for i, url in enumerate(urls, 1)]
+        self._turn = itertools.count()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def candidates(self) -> List[Replica]:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return []
+        start = next(self._turn) % len(healthy)
+        return healthy[start:] + healthy[:start]
+
+    def mark_down(self, replica: Replica, error: Exception) -> None:
+        if replica.healthy:
+            logger.warning("Replica %s unavailable, reading from the others: %s", replica.name, error)
+        replica.healthy = False
+
+    def check(self) -> None:
+        for replica in self.replicas:
+            try:
+                with replica.engine.connect() as connection:
+                    if connection.dialect.name == "postgresql":
+                        replica.lag = float(connection.execute(_REPLICA_LAG).scalar())
+                    else:
+                        connection.execute(text("SELECT 1"))
+                        replica.lag = 0.0
+            except Exception as e:
+                self.mark_down(replica, e)
+                continue
+            healthy = replica.lag <= DB_REPLICA_MAX_LAG
+            if healthy != replica.healthy:
+                logger.warning("Replica %s %s", replica.name, "back in rotation" if healthy else "lagging, taken out", extra={"lag": replica.lag})
+            replica.healthy = healthy
+
+    def _run(self) -> None:
+        while not self._stop.wait(DB_REPLICA_CHECK_SECONDS):
+            self.check()
+
+    def start(self) -> None:
+        if self.replicas and self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="replica-check", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread = None
+
+    def status(self) -> dict:
+        return {replica.name: {"healthy": replica.healthy, "lag": replica.lag} for replica in self.replicas}
+
+replicas = ReplicaSet(DB_REPLICA_URLS)
+for _replica in replicas.replicas:
+    register_engine(_replica.name, _replica.engine)
+    if _replica.async_engine is not None:
+        register_engine(f"{_replica.name}_async", _replica.async_engine)
+
+# Sessions for read-only endpoints. They are bound to one connection per request
+# (see get_read_db) and refuse to flush, so a write can't land on a replica.
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, info={"read_only": True})
+AsyncReadSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False, info={"read_only": True})
+
+@event.listens_for(Session, "before_flush")
+def _refuse_read_only_flush(session: Session, flush_context, instances) -> None:
+    if session.info.get("read_only"):
+        raise InvalidRequestError("Read-only session; write through get_db")
 
 Base = declarative_base()
 
@@ -26,4 +221,96 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def _read_connection():
+    for replica in replicas.candidates():
+        try:
+            return replica.engine.connect()
+        except DBAPIError as e:
+            replicas.mark_down(replica, e)
+    return engine.connect()
+
+@contextmanager
+def read_session():
+    """
+    A session on a healthy replica, or on the primary when none is. Only for
+    reads that may trail the latest writes by up to DB_REPLICA_MAX_LAG.
+    """
+    connection = _read_connection()
+    db = ReadSessionLocal(bind=connection)
+    try:
+        yield db
+    finally:
+        db.close()
+        connection.close()
+
+def get_read_db():
+    with read_session() as db:
+        yield db
+
+async def get_async_read_db():
+    connection = None
+    for replica in replicas.candidates():
+        try:
+            connection = await replica.async_engine.connect()
+            break
+        except DBAPIError as e:
+            replicas.mark_down(replica, e)
+    if connection is None:
+        connection = await async_engine.connect()
+    try:
+        async with AsyncReadSessionLocal(bind=connection) as db:
+            yield db
+    finally:
+        await connection.close()
+
+def pool_status() -> dict:
+    """
+    Occupancy of this process's connection pools, for health checks and debugging.
+    """
+    engines = {"sync": engine}
+    if async_engine is not None:
+        engines["async"] = async_engine
+    for replica in replicas.replicas:
+        engines[replica.name] = replica.engine
+    return {name: pool_stats(e.pool) for name, e in engines.items()}
+
+def _warm_count() -> int:
+    return 1 if DB_POOL_MODE == "transaction" else max(min(DB_POOL_WARM, DB_POOL_SIZE), 1)
+
+def ping() -> None:
+    """
+    Round-trip to the database through the pool; raises when it is unreachable.
+    """
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+async def ping_async() -> None:
+    async with async_engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+def warm_pool() -> None:
+    """
+    Open the first few pooled connections now rather than on the first requests.
+    """
+    connections = [engine.connect() for _ in range(_warm_count())]
+    try:
+        for connection in connections:
+            connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            connection.close()
+
+async def warm_pool_async() -> None:
+    connections = [await async_engine.connect() for _ in range(_warm_count())]
+    try:
+        for connection in connections:
+            await connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            await connection.close()
@@ -0,0 +1,85 @@
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+from sqlalchemy import func, select
+
+from . import models, schemas, stats
+
+# Clients must revalidate on every poll, but may reuse the body on a 304
+CACHE_CONTROL = "private, no-cache"
+
+def collection_etag(request: Request, principal: schemas.TokenData, *versions: Any) -> str:
+    """
+    Weak ETag for a collection response. It covers who is asking (their role
+    decides the visibility scope), the query string and the `versions` of the
+    rows shown: their max(updated_at) and count, read before the rows are.
+    Any insert, update or delete in scope changes one of them.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    parts = [principal.id, getattr(principal.role, "value", principal.role)]
+    parts += sorted(request.query_params.multi_items())
+    parts += versions
+    digest.update(repr(parts).encode())
+    return f'W/"{digest.hexdigest()}"'
+
+def _opaque(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+def _matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison: the W/ prefix is ignored on both sides
+    wanted = _opaque(etag)
+    return any(_opaque(candidate.strip()) == wanted for candidate in header.split(","))
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """
+    A 304 response when the client's If-None-Match already names `etag`, else None.
+    """
+    if _matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        )
+    return None
+
+def tag(response: Response, etag: str) -> Response:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
+
+def task_versions_statement(task_query, include_users: bool = True):
+    """
+    max(updated_at) and count of the tasks a listing reads: `task_query` is its
+    visibility-scoped, filtered select with the cursor applied. Run before the
+    page query, so a 304 costs one aggregate and no rows are loaded. With
+    `include_users`, max(users.updated_at) covers the users sent alongside.
+    """
+    columns = [func.max(models.Task.updated_at), func.count()]
+    if include_users:
+        columns.append(select(func.max(models.User.updated_at)).scalar_subquery())
+    return task_query.with_only_columns(*columns, maintain_column_froms=True)
+
+def note_versions_statement(*criteria):
+    """
+    max(updated_at) and count of the notes matching `criteria`.
+    """
+    return select(func.max(models.Note.updated_at), func.count()).where(*criteria)
+
+def user_versions_statement(include_tasks: bool = False):
+    """
+    max(updated_at) and count of active users. With `include_tasks`, for
+    listings carrying task counts, also max(tasks.updated_at) and the task
+    total from task_summary, so task writes and deletes change the tag too.
+    """
+    stmt = select(func.max(models.User.updated_at), func.count()).select_from(models.User).where(models.User.deleted_at.is_(None))
+    if include_tasks:
+        summary = models.TaskSummary
+        stmt = stmt.add_columns(
+            select(func.max(models.Task.updated_at)).scalar_subquery(),
+            select(func.sum(summary.task_count)).where(summary.scope == stats.SCOPE_ASSIGNED).scalar_subquery()
+        )
+    return stmt
@@ -0,0 +1,258 @@
+import asyncio
+import json
+import logging
+import os
+import select as select_module
+import threading
+import time
+from typing import Iterable, List, Optional
+
+from sqlalchemy import event, select, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import get_history
+
+from . import models, schemas
+from .database import engine
+from .models import UserRole
+
+logger = logging.getLogger(__name__)
+
+# "postgres" fans events out through LISTEN/NOTIFY so every worker process
+# sees every write; "local" delivers them in-process only (tests, single worker,
+# SQLite)
+EVENTS_BROKER = os.getenv("EVENTS_BROKER", "postgres" if engine.dialect.name == "postgresql" else "local").lower()
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "256"))
+# LISTEN needs a session-level connection; behind PgBouncer in transaction
+# mode, point this at the database directly
+EVENTS_DATABASE_URL = os.getenv("EVENTS_DATABASE_URL")
+CHANNEL = "task_events"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7900
+_PENDING = "pending_events"
+
+def task_event(action: str, task_id: int, audience: Iterable[Optional[int]]) -> dict:
+    """
+    `audience` holds the users who could see the task before or after the
+    change; admins receive every event regardless.
+    """
+    return {
+        "type": f"task.{action}",
+        "id": task_id,
+        "task_id": task_id,
+        "audience": sorted({user_id for user_id in audience if user_id is not None}),
+    }
+
+def note_event(action: str, note_id: int, task_id: int, audience: Iterable[Optional[int]]) -> dict:
+    event = task_event(action, task_id, audience)
+    event.update(type=f"note.{action}", id=note_id)
+    return event
+
+def public_event(event: dict) -> dict:
+    return {key: value for key, value in event.items() if key != "audience"}
+
+class Subscriber:
+    """
+    One connected client. Events are handed over from the broker's thread
+    through the subscriber's event loop.
+    """
+    def __init__(self, principal: schemas.TokenData, loop: asyncio.AbstractEventLoop):
+        self.principal = principal
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+
+    def can_see(self, event: dict) -> bool:
+        return self.principal.role == UserRole.admin or self.principal.id in event["audience"]
+
+    def offer(self, event: dict) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A client this far behind refetches instead of replaying the backlog
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"type": "resync"})
+
+class EventHub:
+    """
+    The subscribers of this worker process.
+    """
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, principal: schemas.TokenData) -> Subscriber:
+        subscriber = Subscriber(principal, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def dispatch(self, events: List[dict]) -> None:
+        """
+        Deliver events to the subscribers allowed to see them. Safe to call from any thread.
+        """
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            for event in events:
+                if event["type"] == "resync" or subscriber.can_see(event):
+                    subscriber.loop.call_soon_threadsafe(subscriber.offer, event)
+
+hub = EventHub()
+
+def _payloads(events: List[dict]) -> Iterable[str]:
+    """
+    Pack events into as few JSON arrays as fit the NOTIFY payload limit.
+    """
+    batch, size = [], 2
+    for event in events:
+        encoded = json.dumps(event, separators=(",", ":"))
+        if batch and size + len(encoded) + 1 > MAX_PAYLOAD_BYTES:
+            yield "[" + ",".join(batch) + "]"
+            batch, size = [], 2
+        batch.append(encoded)
+        size += len(encoded) + 1
+    if batch:
+        yield "[" + ",".join(batch) + "]"
+
+class PostgresBroker:
+    """
+    Publishes with pg_notify in the writer's transaction, so events go out on
+    commit and vanish on rollback. One listener thread per process holds a
+    dedicated connection (outside the pool) and feeds the hub.
+    """
+    def __init__(self, hub: EventHub):
+        self.hub = hub
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def stage(self, session: Session, events: List[dict]) -> None:
+        connection = session.connection()
+        for payload in _payloads(events):
+            connection.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": payload})
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._listen, name="event-listener", daemon=True)
+                self._thread.start()
+
+    def _connect(self):
+        url = make_url(EVENTS_DATABASE_URL) if EVENTS_DATABASE_URL else engine.url
+        args, kwargs = engine.dialect.create_connect_args(url)
+        connection = engine.dialect.loaded_dbapi.connect(*args, **kwargs)
+        connection.autocommit = True
+        return connection
+
+    def _listen(self) -> None:
+        while True:
+            connection = None
+            try:
+                connection = self._connect()
+                with connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {CHANNEL}")
+                # Anything published while we were not listening is lost
+                self.hub.dispatch([{"type": "resync"}])
+                while True:
+                    if select_module.select([connection], [], [], 30) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        notify = connection.notifies.pop(0)
+                        self.hub.dispatch(json.loads(notify.payload))
+            except Exception:
+                logger.warning("Event listener lost its connection; reconnecting", exc_info=True)
+                time.sleep(1)
+            finally:
+                if connection is not None:
+                    connection.close()
+
+class LocalBroker:
+    """
+    In-process stand-in for PostgresBroker: events are held on the session
+    and handed straight to the hub after commit.
+    """
+    def __init__(self, hub: EventHub):
+        self.hub = hub
+
+    def stage(self, session: Session, events: List[dict]) -> None:
+        session.info.setdefault(_PENDING, []).extend(events)
+
+    def start(self) -> None:
+        pass
+
+broker = LocalBroker(hub) if EVENTS_BROKER == "local" else PostgresBroker(hub)
+
+def publish(session: Session, events: List[dict]) -> None:
+    """
+    Publish events for writes made in the session's current transaction.
+    ORM writes are picked up automatically; bulk statements call this themselves.
+    """
+    if events:
+        broker.stage(session, events)
+
+def subscribe(principal: schemas.TokenData) -> Subscriber:
+    broker.start()
+    return hub.subscribe(principal)
+
+def _previous(obj, field: str):
+    history = get_history(obj, field)
+    return history.deleted[0] if history.deleted else getattr(obj, field)
+
+def _task_audience(task: models.Task) -> set:
+    return {
+        task.created_by, task.assigned_to,
+        _previous(task, "created_by"), _previous(task, "assigned_to"),
+    }
+
+def _collect_events(session: Session, flush_context) -> None:
+    """
+    Turn the ORM task and note writes of a flush into events.
+    """
+    events, notes = [], []
+    for action, objects in (("created", session.new), ("deleted", session.deleted), ("updated", session.dirty)):
+        for obj in objects:
+            if isinstance(obj, models.Task):
+                if action != "updated" or session.is_modified(obj):
+                    events.append(task_event(action, obj.id, _task_audience(obj)))
+            elif isinstance(obj, models.Note):
+                if action != "updated" or session.is_modified(obj):
+                    notes.append((action, obj))
+    if notes:
+        owners = {
+            row.id: (row.created_by, row.assigned_to)
+            for row in session.connection().execute(
+                select(models.Task.id, models.Task.created_by, models.Task.assigned_to)
+                .where(models.Task.id.in_({note.task_id for _, note in notes}))
+            )
+        }
+        for action, note in notes:
+            events.append(note_event(action, note.id, note.task_id, owners.get(note.task_id, ())))
+    publish(session, events)
+
+def _deliver_local(session: Session) -> None:
+    pending = session.info.pop(_PENDING, None)
+    if pending:
+        hub.dispatch(pending)
+
+def _discard_local(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+
+_LISTENERS = (
+    ("after_flush", _collect_events),
+    ("after_commit", _deliver_local),
+    ("after_rollback", _discard_local),
+)
+
+def register_listeners() -> None:
+    """
+    Hook the ORM write events into every Session. Called by models.py, so
+    scripts that write tasks notify connected clients too; safe to call again.
+    """
+    for name, listener in _LISTENERS:
+        if not event.contains(Session, name, listener):
+            event.listen(Session, name, listener)
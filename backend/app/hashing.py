@@ -0,0 +1,137 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from passlib.context import CryptContext
+
+from .metrics import PASSWORD_HASH_SECONDS
+
+# bcrypt work factor. Changing it re-hashes stored passwords on their next login.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Worker processes for hashing; 0 hashes inline on the calling thread, or on
+# a threadpool thread for the async helpers so the event loop isn't blocked
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(os.cpu_count() or 1)))
+# Max hashing jobs in flight; further callers wait for a slot
+HASH_MAX_CONCURRENCY = int(os.getenv("HASH_MAX_CONCURRENCY", str(max(HASH_WORKERS, 1) * 2)))
+
+# Pinning min/max rounds to the configured cost makes needs_update() flag
+# hashes made with any other cost, in either direction
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(HASH_MAX_CONCURRENCY)
+_async_slots: Optional[asyncio.Semaphore] = None
+# Verified against when a login names an unknown email, so that costs the same
+# bcrypt time as a wrong password and response times don't reveal which emails exist
+_dummy_hash: Optional[str] = None
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+def _verify_and_update(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(password, hashed_password)
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # spawn, not fork: the server process is multi-threaded
+                _pool = ProcessPoolExecutor(
+                    max_workers=HASH_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+    return _pool
+
+# Metric label per hashing function
+_OPERATIONS = {_hash: "hash", _verify_and_update: "verify"}
+
+def _run(fn, *args):
+    started = time.perf_counter()
+    try:
+        if HASH_WORKERS <= 0:
+            return fn(*args)
+        with _slots:
+            # Waiting on the future releases the GIL for the whole bcrypt run
+            return _get_pool().submit(fn, *args).result()
+    finally:
+        PASSWORD_HASH_SECONDS.labels(_OPERATIONS[fn]).observe(time.perf_counter() - started)
+
+async def _run_async(fn, *args):
+    global _async_slots
+    started = time.perf_counter()
+    try:
+        if HASH_WORKERS <= 0:
+            return await run_in_threadpool(fn, *args)
+        if _async_slots is None:
+            _async_slots = asyncio.Semaphore(HASH_MAX_CONCURRENCY)
+        async with _async_slots:
+            return await asyncio.wrap_future(_get_pool().submit(fn, *args))
+    finally:
+        PASSWORD_HASH_SECONDS.labels(_OPERATIONS[fn]).observe(time.perf_counter() - started)
+
+def hash_password(password: str) -> str:
+    return _run(_hash, password)
+
+def verify_and_update(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Check a password. The second item is a replacement hash when the stored one
+    was made with a different work factor, else None.
+    """
+    return _run(_verify_and_update, password, hashed_password)
+
+async def hash_password_async(password: str) -> str:
+    return await _run_async(_hash, password)
+
+async def verify_and_update_async(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return await _run_async(_verify_and_update, password, hashed_password)
+
+def verify_dummy(password: str) -> None:
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = hash_password("not-a-real-password")
+    verify_and_update(password, _dummy_hash)
+
+async def verify_dummy_async(password: str) -> None:
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = await hash_password_async("not-a-real-password")
+    await verify_and_update_async(password, _dummy_hash)
+
+def _load_backend() -> str:
+    return pwd_context.handler("bcrypt").get_backend()
+
+def warmup() -> None:
+    """
+    Start every hashing worker and load the bcrypt backend in it, and make the
+    dummy hash, so the first logins don't pay for process spawn and imports.
+    """
+    global _dummy_hash
+    if HASH_WORKERS <= 0:
+        _load_backend()
+    else:
+        pool = _get_pool()
+        # One job per worker: the executor only spawns a process when none is idle
+        for future in [pool.submit(_load_backend) for _ in range(HASH_WORKERS)]:
+            future.result()
+    if _dummy_hash is None:
+        _dummy_hash = hash_password("not-a-real-password")
+
+def shutdown() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
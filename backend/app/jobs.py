@@ -0,0 +1,255 @@
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import and_, delete, event, or_, select, update
+from sqlalchemy.orm import Session
+
+from . import metrics, models
+from .database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Worker threads per process running background jobs; 0 leaves the queue to
+# other processes. Every process sharing the database shares the queue.
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+# How often idle workers look for new jobs; jobs queued by this process wake them at once
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "2"))
+# A running job that reports no progress for this long is taken to be dead and run again
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "300"))
+# Runs per job before it is marked failed
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# Delay before the first retry, doubled for each later one
+JOB_RETRY_DELAY = float(os.getenv("JOB_RETRY_DELAY", "10"))
+# Finished jobs, and the files they wrote, are deleted after this many days
+JOB_RETENTION_DAYS = float(os.getenv("JOB_RETENTION_DAYS", "7"))
+# Where jobs write files for download (exports); must be shared by every
+# process serving /api/jobs when they run on separate hosts
+JOB_FILES_DIR = os.getenv("JOB_FILES_DIR", os.path.join(tempfile.gettempdir(), "task-jobs"))
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+_ENQUEUED = "jobs_enqueued"
+_PURGE_SECONDS = 3600
+
+_handlers = {}
+
+def handler(kind: str):
+    """
+    Register the function that runs jobs of `kind`. It receives a JobContext
+    and returns a JSON-serializable result, or raises to have the job retried.
+    Handlers must be safe to run again after a partial run.
+    """
+    def register(function: Callable):
+        _handlers[kind] = function
+        return function
+    return register
+
+def enqueue(db, kind: str, params: dict, created_by: Optional[int] = None,
+            max_attempts: int = JOB_MAX_ATTEMPTS) -> models.Job:
+    """
+    Queue a job; it becomes visible to workers when the session commits.
+    Takes sync or async sessions.
+    """
+    if kind not in _handlers:
+        raise ValueError(f"No handler for job kind {kind!r}")
+    job = models.Job(kind=kind, params=params, created_by=created_by, status=QUEUED,
+                     attempts=0, max_attempts=max_attempts, progress=0, run_at=datetime.utcnow())
+    db.add(job)
+    db.info[_ENQUEUED] = True
+    return job
+
+def file_path(job_id: int, suffix: str) -> str:
+    os.makedirs(JOB_FILES_DIR, exist_ok=True)
+    return os.path.join(JOB_FILES_DIR, f"job-{job_id}.{suffix}")
+
+class JobContext:
+    """
+    What a handler gets: the job's params, and progress() to report how far it got.
+    """
+    def __init__(self, job_id: int, params: dict, attempt: int):
+        self.job_id = job_id
+        self.params = params
+        self.attempt = attempt
+
+    def progress(self, done: int, total: Optional[int] = None) -> None:
+        """
+        Record progress and renew the lease. Call it between batches: a job
+        silent for longer than JOB_LEASE_SECONDS is handed to another worker.
+        """
+        values = {"progress": done, "locked_until": datetime.utcnow() + timedelta(seconds=JOB_LEASE_SECONDS)}
+        if total is not None:
+            values["total"] = total
+        # Own transaction, so progress shows while the handler's work is uncommitted
+        with SessionLocal() as db:
+            db.execute(update(models.Job).where(models.Job.id == self.job_id).values(**values))
+            db.commit()
+
+def _claim_statement(now: datetime):
+    """
+    Take the next due job, or a running one whose lease lapsed. The candidate
+    row is locked with SKIP LOCKED, so concurrent workers claim different jobs.
+    """
+    job = models.Job
+    claimable = (
+        select(job.id)
+        .where(or_(
+            and_(job.status == QUEUED, job.run_at <= now),
+            and_(job.status == RUNNING, job.locked_until < now),
+        ))
+        .order_by(job.run_at, job.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    return (
+        update(job)
+        .where(job.id == claimable)
+        .values(
+            status=RUNNING,
+            attempts=job.attempts + 1,
+            started_at=now,
+            locked_until=now + timedelta(seconds=JOB_LEASE_SECONDS),
+        )
+        .returning(job.id, job.kind, job.params, job.attempts, job.max_attempts)
+        .execution_options(synchronize_session=False)
+    )
+
+def _claim() -> Optional[tuple]:
+    with SessionLocal() as db:
+        row = db.execute(_claim_statement(datetime.utcnow())).first()
+        db.commit()
+    return row
+
+def _finish(job_id: int, attempt: int, **values) -> None:
+    with SessionLocal() as db:
+        # A worker whose lease lapsed and was reclaimed doesn't overwrite the newer run
+        db.execute(
+            update(models.Job)
+            .where(models.Job.id == job_id, models.Job.attempts == attempt)
+            .values(locked_until=None, **values)
+        )
+        db.commit()
+
+def run_one() -> bool:
+    """
+    Claim and run one due job. Returns False when there was none.
+    """
+    claimed = _claim()
+    if claimed is None:
+        return False
+    job_id, kind, params, attempt, max_attempts = claimed
+    started = time.perf_counter()
+    try:
+        function = _handlers.get(kind)
+        if function is None:
+            raise LookupError(f"No handler for job kind {kind!r}")
+        result = function(JobContext(job_id, params, attempt))
+    except Exception as e:
+        retry = attempt < max_attempts and kind in _handlers
+        logger.warning("Job failed", exc_info=True, extra={"job_id": job_id, "kind": kind, "attempt": attempt, "retry": retry})
+        now = datetime.utcnow()
+        if retry:
+            delay = JOB_RETRY_DELAY * 2 ** (attempt - 1)
+            _finish(job_id, attempt, status=QUEUED, run_at=now + timedelta(seconds=delay), error=str(e)[:500])
+        else:
+            _finish(job_id, attempt, status=FAILED, finished_at=now, error=str(e)[:500])
+        outcome = "retry" if retry else FAILED
+    else:
+        _finish(job_id, attempt, status=COMPLETED, result=result, error=None, finished_at=datetime.utcnow())
+        outcome = COMPLETED
+    seconds = time.perf_counter() - started
+    metrics.JOB_SECONDS.labels(kind, outcome).observe(seconds)
+    logger.info("Job finished", extra={"job_id": job_id, "kind": kind, "outcome": outcome, "duration_ms": round(seconds * 1000, 2)})
+    return True
+
+def purge() -> int:
+    """
+    Delete jobs finished more than JOB_RETENTION_DAYS ago, with their files.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=JOB_RETENTION_DAYS)
+    with SessionLocal() as db:
+        rows = db.execute(
+            delete(models.Job)
+            .where(models.Job.status.in_([COMPLETED, FAILED]), models.Job.finished_at < cutoff)
+            .returning(models.Job.result)
+        ).all()
+        db.commit()
+    for (result,) in rows:
+        path = (result or {}).get("file")
+        if path:
+            try:
+                os.remove(os.path.join(JOB_FILES_DIR, path))
+            except FileNotFoundError:
+                pass
+    return len(rows)
+
+class JobRunner:
+    """
+    JOB_WORKERS threads, each running one job at a time. Threads rather than
+    processes: the heavy jobs spend their time waiting on the database.
+    """
+    def __init__(self, workers: int = JOB_WORKERS):
+        self.workers = workers
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def _run(self, purges: bool) -> None:
+        purge_at = 0.0
+        while not self._stop.is_set():
+            try:
+                if purges and time.monotonic() >= purge_at:
+                    purge_at = time.monotonic() + _PURGE_SECONDS
+                    purge()
+                if run_one():
+                    continue
+            except Exception:
+                logger.warning("Job worker error", exc_info=True)
+            self._wake.wait(JOB_POLL_SECONDS)
+            self._wake.clear()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads or self.workers <= 0:
+                return
+            self._stop.clear()
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._run, args=(index == 0,), name=f"job-worker-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: float = 10) -> None:
+        """
+        Stop taking jobs and wait up to `timeout` for running ones. A job still
+        running is picked up again elsewhere once its lease lapses.
+        """
+        self._stop.set()
+        self._wake.set()
+        with self._lock:
+            threads, self._threads = self._threads, []
+        deadline = time.monotonic() + timeout
+        for thread in threads:
+            thread.join(max(0, deadline - time.monotonic()))
+
+runner = JobRunner()
+
+@event.listens_for(Session, "after_commit")
+def _wake_workers(session: Session) -> None:
+    if session.info.pop(_ENQUEUED, None):
+        runner.wake()
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session: Session) -> None:
+    session.info.pop(_ENQUEUED, None)
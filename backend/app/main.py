@@ -1,42 +1,150 @@
-from fastapi import FastAPI
+import time
+
+# Taken before the imports below so startup time includes them
+IMPORT_STARTED = time.perf_counter()
+
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from . import models
-from .database import engine
-from .routers import auth, tasks, notes
+from . import database, hashing, jobs, metrics, revocation
+from .auth import warmup as warm_up_tokens
+from .logging_config import configure_logging
+from .database import DB_ASYNC
+from .routers import auth, events, exports, health, search, tasks, notes
+from .routers import async_auth, async_notes, async_tasks, async_users
+from .routers.jobs import router as jobs_router
 from .routers.users import router as users_router
 
-models.Base.metadata.create_all(bind=engine)
-
-app = FastAPI(
-    title="Task Management System",
-    # Don't redirect when URLs have trailing slashes
-    redirect_slashes=False
-)
-
-# Configure CORS
-origins = [
-    "http://localhost:3000",  # React development server
-    "http://127.0.0.1:3000",  # React development server alternative
-    "http://localhost:5173",  # Vite development server
-    "http://127.0.0.1:5173",  # Vite development server alternative
-    "http://localhost:8000",  # Backend server
-    "http://127.0.0.1:8000",  # Backend server alternative
-]
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include routers with /api prefix
-app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
-app.include_router(users_router, prefix="/api/users", tags=["users"])
-app.include_router(tasks.router, prefix="/api/tasks", tags=["tasks"])
-app.include_router(notes.router, prefix="/api/notes", tags=["notes"])
-
-@app.get("/")
-def read_root():
-    return {"message": "Welcome to the Task Management API"} 
\ No newline at end of file
+logger = logging.getLogger(__name__)
+
+# Open pooled connections and start the hashing workers before serving
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "true").lower() in ("1", "true", "yes")
+# Seconds each warm-up step may take; a step that fails or times out is
+# logged and the app starts anyway, with /readyz reporting the database
+STARTUP_WARMUP_TIMEOUT = float(os.getenv("STARTUP_WARMUP_TIMEOUT", "10"))
+
+async def _warm(name: str, step) -> None:
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(step(), STARTUP_WARMUP_TIMEOUT)
+    except Exception as e:
+        logger.warning("Warm-up of %s failed: %s", name, e)
+    else:
+        logger.info("Warmed up %s", name, extra={"seconds": round(time.perf_counter() - started, 3)})
+
+async def _warm_up() -> None:
+    steps = {
+        "database pool": lambda: run_in_threadpool(database.warm_pool),
+        "password hashing": lambda: run_in_threadpool(hashing.warmup),
+        "tokens": lambda: run_in_threadpool(warm_up_tokens),
+    }
+    if DB_ASYNC:
+        steps["async database pool"] = database.warm_pool_async
+    # Independent, so they overlap: worker spawn doesn't wait for the database
+    await asyncio.gather(*(_warm(name, step) for name, step in steps.items()))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Loads the revoked tokens in the background and keeps them in sync;
+    # /readyz stays 503 until the first load has finished
+    revocation.revocations.start()
+    database.replicas.start()
+    if STARTUP_WARMUP:
+        await _warm_up()
+    startup_seconds = round(time.perf_counter() - IMPORT_STARTED, 3)
+    app.state.startup_seconds = startup_seconds
+    metrics.STARTUP_SECONDS.set(startup_seconds)
+    logger.info("Ready to serve", extra={"startup_seconds": startup_seconds})
+    # Job handlers are registered by the router modules imported above
+    jobs.runner.start()
+    yield
+    jobs.runner.stop()
+    revocation.revocations.stop()
+    database.replicas.stop()
+    hashing.shutdown()
+    database.engine.dispose()
+    if database.async_engine is not None:
+        await database.async_engine.dispose()
+    for replica in database.replicas.replicas:
+        replica.engine.dispose()
+        if replica.async_engine is not None:
+            await replica.async_engine.dispose()
+
+def create_app(async_routes: bool = DB_ASYNC) -> FastAPI:
+    """
+    Build the application. Importing and building it does no I/O: the schema
+    is managed by Alembic (`alembic upgrade head`) and connections are opened
+    by the lifespan warm-up. `async_routes` mounts the async routers; they need
+    the async engine that DB_ASYNC creates.
+    """
+    configure_logging()
+
+    app = FastAPI(
+        title="Task Management System",
+        # Don't redirect when URLs have trailing slashes
+        redirect_slashes=False,
+        lifespan=lifespan
+    )
+
+    # Configure CORS
+    origins = [
+        "http://localhost:3000",  # React development server
+        "http://127.0.0.1:3000",  # React development server alternative
+        "http://localhost:5173",  # Vite development server
+        "http://127.0.0.1:5173",  # Vite development server alternative
+        "http://localhost:8000",  # Backend server
+        "http://127.0.0.1:8000",  # Backend server alternative
+    ]
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    # Added last so it is the outermost middleware and times everything beneath it
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    app.include_router(health.router)
+
+    # With DB_ASYNC the async routers are matched first; endpoints they don't
+    # implement fall through to the sync routers below
+    if async_routes:
+        app.include_router(async_auth.router, prefix="/api/auth", tags=["auth"])
+        app.include_router(async_users.router, prefix="/api/users", tags=["users"])
+        app.include_router(async_tasks.router, prefix="/api/tasks", tags=["tasks"])
+        app.include_router(async_notes.router, prefix="/api/notes", tags=["notes"])
+
+    # Export routes go ahead of the tasks router so /tasks/export isn't taken for a task id
+    app.include_router(exports.router, prefix="/api")
+
+    # Include routers with /api prefix
+    app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
+    app.include_router(users_router, prefix="/api/users", tags=["users"])
+    app.include_router(tasks.router, prefix="/api/tasks", tags=["tasks"])
+    app.include_router(notes.router, prefix="/api/notes", tags=["notes"])
+    app.include_router(search.router, prefix="/api/search", tags=["search"])
+    app.include_router(events.router, prefix="/api/events", tags=["events"])
+    app.include_router(jobs_router, prefix="/api/jobs", tags=["jobs"])
+
+    @app.get("/")
+    def read_root():
+        return {"message": "Welcome to the Task Management API"}
+
+    @app.get("/metrics", include_in_schema=False)
+    def read_metrics():
+        """
+        Prometheus scrape endpoint: per-route latency, SQL time and statement
+        counts, pool checkout wait, bcrypt time and startup time.
+        """
+        body, content_type = metrics.render()
+        return Response(content=body, media_type=content_type)
+
+    return app
+
+app = create_app()
@@ -0,0 +1,205 @@
+import os
+import time
+from contextvars import ContextVar
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client import multiprocess
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# With several worker processes, point this at a shared empty directory so
+# /metrics aggregates every worker (prometheus_client multiprocess mode)
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Request latency by route",
+    ["method", "route", "status"]
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds", "Time spent executing SQL per request",
+    ["method", "route"]
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_queries", "SQL statements executed per request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+)
+QUERY_SECONDS = Histogram("db_query_duration_seconds", "SQL statement execution time")
+POOL_WAIT_SECONDS = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    "password_hash_duration_seconds", "bcrypt time per call, including waiting for a hashing worker",
+    ["operation"]
+)
+
+RATE_LIMITED = Counter(
+    "rate_limited_requests", "Requests rejected with 429 by the rate limiter",
+    ["limit"]
+)
+JOB_SECONDS = Histogram(
+    "job_duration_seconds", "Background job run time by kind and outcome",
+    ["kind", "outcome"],
+    buckets=(0.1, 0.5, 1, 5, 15, 60, 300, 900, 3600)
+)
+# "max" keeps one value across workers in multiprocess mode: the slowest start
+STARTUP_SECONDS = Gauge(
+    "app_startup_seconds", "Time from importing the app to being ready to serve",
+    multiprocess_mode="max"
+)
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+# The stats of the request being served. The object is mutated in place so
+# statements run in threadpool workers (sync endpoints) count towards it too.
+_current = ContextVar("request_stats", default=None)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    QUERY_SECONDS.observe(elapsed)
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute
+    if context.connection is not None and context.connection.info.get("query_started"):
+        context.connection.info["query_started"].pop()
+
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool that records how long each checkout waited, including the time
+    to open a new connection when the pool has none idle.
+    """
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_WAIT_SECONDS.labels("sync").observe(time.perf_counter() - started)
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_WAIT_SECONDS.labels("async").observe(time.perf_counter() - started)
+
+def pool_stats(pool) -> dict:
+    """
+    Occupancy of a connection pool. Pools that do not hold connections
+    (NullPool in PgBouncer mode) only report their class.
+    """
+    if not isinstance(pool, QueuePool):
+        return {"pool": type(pool).__name__}
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    }
+
+class PoolCollector:
+    """
+    Reads pool occupancy at scrape time instead of tracking it on every checkout.
+    """
+    def __init__(self):
+        self.engines = {}
+
+    def collect(self):
+        connections = GaugeMetricFamily("db_pool_connections", "Pooled connections by state", labels=["pool", "state"])
+        size = GaugeMetricFamily("db_pool_size", "Configured pool size", labels=["pool"])
+        for name, engine in self.engines.items():
+            # Looked up each time: dispose() replaces an engine's pool
+            stats = pool_stats(engine.pool)
+            if "size" not in stats:
+                continue
+            size.add_metric([name], stats["size"])
+            for state in ("checked_out", "idle", "overflow"):
+                connections.add_metric([name, state], stats[state])
+        yield connections
+        yield size
+
+_pools = PoolCollector()
+REGISTRY.register(_pools)
+
+def register_engine(name: str, engine) -> None:
+    _pools.engines[name] = engine
+
+def _route_name(scope) -> str:
+    """
+    The matched route's path template, so /api/tasks/1 and /api/tasks/2 share a label.
+    """
+    endpoint = scope.get("endpoint")
+    app = scope.get("app")
+    if endpoint is None or app is None:
+        return "unmatched"
+    routes = getattr(app.state, "metrics_routes", None)
+    if routes is None:
+        routes = {route.endpoint: route.path for route in app.routes if hasattr(route, "endpoint")}
+        app.state.metrics_routes = routes
+    return routes.get(endpoint, "unmatched")
+
+class MetricsMiddleware:
+    """
+    Records latency, SQL time and SQL statement count for every HTTP request.
+    Plain ASGI rather than BaseHTTPMiddleware, so streamed responses are timed
+    to their last byte and nothing is buffered.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            _current.reset(token)
+            method, route = scope["method"], _route_name(scope)
+            REQUEST_SECONDS.labels(method, route, str(status_code)).observe(elapsed)
+            REQUEST_DB_SECONDS.labels(method, route).observe(stats.db_seconds)
+            REQUEST_QUERIES.labels(method, route).observe(stats.queries)
+
+def render() -> tuple:
+    """
+    The exposition body and content type for GET /metrics.
+    """
+    registry = REGISTRY
+    if PROMETHEUS_MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        # Pool gauges are live values of the process serving the scrape
+        registry.register(_pools)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
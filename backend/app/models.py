@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Date, Text, Enum
+from sqlalchemy import Boolean, Column, Float, Integer, JSON, String, ForeignKey, DateTime, Date, Text, Enum, Index, PrimaryKeyConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from .database import Base
@@ -35,6 +35,12 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     role = Column(Enum(UserRole), nullable=False, default=UserRole.member)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Bumped whenever existing tokens for the user must stop working
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
+    # Set when deletion starts; the row is removed once the delete_user job
+    # (user_deletion.py) has moved the user's tasks and notes off it
+    deleted_at = Column(DateTime, nullable=True)
 
     # Relationships
     assigned_tasks = relationship("Task", back_populates="assignee", foreign_keys="Task.assigned_to")
@@ -45,20 +51,37 @@ class Task(Base):
     __tablename__ = "tasks"
 
     id = Column(Integer, primary_key=True, index=True)
-    title = Column(String, index=True)
+    title = Column(String, index=True, nullable=False)
     description = Column(String, nullable=True)
     status = Column(String)
     priority = Column(String)
     due_date = Column(Date, nullable=True)
     created_by = Column(Integer, ForeignKey("users.id"))
     assigned_to = Column(Integer, ForeignKey("users.id"), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    # Non-null, like title: both are keyset pagination sort keys
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Also bumped by bulk UPDATE statements; collection ETags are built from it
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    # Relationships
-    assignee = relationship("User", foreign_keys=[assigned_to], back_populates="assigned_tasks", lazy="joined")
-    creator = relationship("User", foreign_keys=[created_by], back_populates="created_tasks", lazy="joined")
+    # Relationships. Not eager by default: endpoints that return users ask for
+    # them (see queries.TaskFieldParams), so permission checks stay single-table.
+    assignee = relationship("User", foreign_keys=[assigned_to], back_populates="assigned_tasks")
+    creator = relationship("User", foreign_keys=[created_by], back_populates="created_tasks")
     notes = relationship("Note", back_populates="task", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Keyset pagination walks tasks in (created_at, id) order
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        # Listing filters; each is paired with the default sort key
+        Index("ix_tasks_created_by_created_at", "created_by", "created_at"),
+        Index("ix_tasks_assigned_to_created_at", "assigned_to", "created_at"),
+        Index("ix_tasks_status_created_at", "status", "created_at"),
+        Index("ix_tasks_priority_created_at", "priority", "created_at"),
+        Index("ix_tasks_status_due_date", "status", "due_date"),
+        Index("ix_tasks_due_date", "due_date"),
+        Index("ix_tasks_updated_at", "updated_at"),
+    )
+
     def __repr__(self):
         return f"<Task(id={self.id}, title='{self.title}', status='{self.status}')>"
 
@@ -74,4 +97,171 @@ class Note(Base):
 
     # Relationships
     task = relationship("Task", back_populates="notes")
-    user = relationship("User", back_populates="notes") 
\ No newline at end of file
+    user = relationship("User", back_populates="notes")
+
+    __table_args__ = (
+        # Newest-first listings: per task (batch fetch), per author, and all notes
+        Index("ix_notes_task_id_created_at_id", "task_id", "created_at", "id"),
+        Index("ix_notes_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_notes_created_at_id", "created_at", "id"),
+    )
+
+class ArchivedTask(Base):
+    """
+    Completed tasks moved out of `tasks` by archive.py; same columns plus
+    `archived_at`. On Postgres the table is range-partitioned by month of
+    `created_at`, with partitions created as they are first needed.
+    """
+    __tablename__ = "tasks_archive"
+
+    id = Column(Integer, nullable=False)
+    title = Column(String, nullable=False)
+    description = Column(String, nullable=True)
+    status = Column(String)
+    priority = Column(String)
+    due_date = Column(Date, nullable=True)
+    created_by = Column(Integer)
+    assigned_to = Column(Integer, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime)
+    archived_at = Column(DateTime, nullable=False)
+
+    # A partitioned table's unique keys must include the partition key,
+    # so ids are indexed rather than constrained
+    __mapper_args__ = {"primary_key": [id]}
+    __table_args__ = (
+        Index("ix_tasks_archive_id", "id"),
+        Index("ix_tasks_archive_created_at_id", "created_at", "id"),
+        Index("ix_tasks_archive_created_by_created_at", "created_by", "created_at"),
+        Index("ix_tasks_archive_assigned_to_created_at", "assigned_to", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+class ArchivedNote(Base):
+    """
+    Notes of archived tasks, partitioned like tasks_archive by their task's
+    `created_at` so a task and its notes share a partition.
+    """
+    __tablename__ = "notes_archive"
+
+    id = Column(Integer, nullable=False)
+    content = Column(String, nullable=False)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    task_id = Column(Integer)
+    user_id = Column(Integer)
+    task_created_at = Column(DateTime)
+    archived_at = Column(DateTime, nullable=False)
+
+    __mapper_args__ = {"primary_key": [id]}
+    __table_args__ = (
+        Index("ix_notes_archive_task_id_created_at_id", "task_id", "created_at", "id"),
+        {"postgresql_partition_by": "RANGE (task_created_at)"},
+    )
+
+class TaskSummary(Base):
+    """
+    Task counts per user, status and priority, kept in step with `tasks` by stats.py.
+    Every task adds one "assigned" row for its assignee (user_id 0 when unassigned)
+    and, when the creator is someone else, one "created" row for the creator, so a
+    user's rows sum to exactly the tasks they can see. Archived tasks stay counted.
+    """
+    __tablename__ = "task_summary"
+
+    user_id = Column(Integer, nullable=False)
+    scope = Column(String, nullable=False)
+    status = Column(String, nullable=False)
+    priority = Column(String, nullable=False)
+    task_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("user_id", "scope", "status", "priority"),
+    )
+
+class RateLimitBucket(Base):
+    """
+    Token buckets of ratelimit.DatabaseBackend, shared by every worker.
+    `updated_at` is epoch seconds so the refill arithmetic is plain SQL.
+    """
+    __tablename__ = "rate_limit_buckets"
+
+    key = Column(String, primary_key=True)
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(Float, nullable=False, index=True)
+    allowed = Column(Boolean, nullable=False)
+
+class RevokedToken(Base):
+    """
+    Revoked JWTs, held in memory by revocation.py. A row either names one token
+    (`jti`: logout, rotated refresh tokens) or revokes every token issued to
+    `user_id` before `revoked_at` (password change, deletion). Rows are deleted
+    once `expires_at` has passed, as the tokens they cover have expired too.
+    """
+    __tablename__ = "revoked_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # Unique so a refresh token can only be rotated once
+    jti = Column(String, nullable=True, index=True, unique=True)
+    user_id = Column(Integer, nullable=True)
+    revoked_at = Column(DateTime, nullable=False, index=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+class UserDeletion(Base):
+    """
+    Progress of one user deletion, run by the delete_user job in
+    user_deletion.py and polled through GET /api/users/deletions/{id}.
+    Outlives the user row it deletes.
+    """
+    __tablename__ = "user_deletions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    reassign_to = Column(Integer, nullable=True)
+    # pending, running, completed or failed
+    status = Column(String, nullable=False, default="pending")
+    tasks_reassigned = Column(Integer, nullable=False, default=0)
+    notes_detached = Column(Integer, nullable=False, default=0)
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+class Job(Base):
+    """
+    Background work queued by jobs.enqueue. Workers in any process claim rows
+    with SELECT ... FOR UPDATE SKIP LOCKED; a running job whose lease lapses,
+    because its worker died, is claimed again.
+    """
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)
+    params = Column(JSON, nullable=False, default=dict)
+    # queued, running, completed or failed
+    status = Column(String, nullable=False, default="queued")
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    # Units of work done so far, and out of how many when the job knows
+    progress = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(String, nullable=True)
+    created_by = Column(Integer, nullable=True, index=True)
+    # Not claimed before this time; pushed back between retries
+    run_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_until = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Claim order among queued jobs, and expired leases among running ones
+        Index("ix_jobs_status_run_at", "status", "run_at"),
+    )
+
+# Listeners that keep task_summary and the event stream in step with ORM writes,
+# registered here so every importer of the models gets them
+from . import events, stats  # noqa: E402
+stats.register_listeners()
+events.register_listeners()
@@ -0,0 +1,61 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List
+
+from fastapi import HTTPException, status
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the sort key of the last row on a page into an opaque cursor.
+    Clients must treat the value as a black box and pass it back unchanged.
+    """
+    payload = [v.isoformat() if isinstance(v, (datetime, date)) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor"
+    )
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor, expecting `size` key values.
+    Cursors are client-supplied: callers check each value's type with the
+    parse_* helpers before it reaches SQL.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise _invalid_cursor()
+    return values
+
+def parse_id(value: Any) -> int:
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise _invalid_cursor()
+    return value
+
+def parse_str(value: Any) -> str:
+    if not isinstance(value, str):
+        raise _invalid_cursor()
+    return value
+
+def parse_date(value: Any) -> date:
+    try:
+        return date.fromisoformat(value)
+    except (ValueError, TypeError):
+        raise _invalid_cursor()
+
+def parse_datetime(value: Any) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        raise _invalid_cursor()
@@ -0,0 +1,300 @@
+from datetime import date
+from typing import Any, List, Optional
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import and_, func, or_, select, tuple_, union
+from sqlalchemy.orm import aliased, load_only, noload, selectinload
+
+from . import models
+from .models import Priority, TaskStatus, UserRole
+from .pagination import decode_cursor, encode_cursor, parse_date, parse_datetime, parse_id, parse_str
+from .serializers import TASK_FIELDS, TASK_RELATIONS, USER_COLUMNS
+
+def member_task_ids(user_id: int):
+    """
+    Ids of the tasks a user created or is assigned to.
+    Written as a UNION of two single-column lookups instead of
+    `created_by = X OR assigned_to = X` so each side is an index scan.
+    """
+    return union(
+        select(models.Task.id).where(models.Task.created_by == user_id),
+        select(models.Task.id).where(models.Task.assigned_to == user_id),
+    )
+
+def visible_to(user_id: int):
+    return models.Task.id.in_(member_task_ids(user_id))
+
+def task_scope(current_user, member_id: Optional[int] = None):
+    """
+    Visibility clause for task listings, or None when every task is visible.
+    Admins see everything, optionally narrowed to one member; everyone else
+    sees the tasks they created or are assigned to.
+    """
+    if current_user.role == UserRole.admin:
+        return visible_to(member_id) if member_id is not None else None
+    return visible_to(current_user.id)
+
+def task_count_statement(task_query):
+    """
+    count() over the rows of a filtered task listing, for `include_total`.
+    """
+    return task_query.with_only_columns(func.count(), maintain_column_froms=True)
+
+def split_page(rows: list, limit: int, task_sort: "TaskSort"):
+    """
+    Trim a `limit + 1` row fetch to one page and derive the next cursor.
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, task_sort.cursor_for(rows[-1])
+
+class TaskFilterParams:
+    """
+    Query-string filters shared by the task listing endpoints.
+    """
+    def __init__(
+        self,
+        status: Optional[List[TaskStatus]] = Query(None),
+        priority: Optional[List[Priority]] = Query(None),
+        due_after: Optional[date] = None,
+        due_before: Optional[date] = None,
+        assigned_to: Optional[int] = None,
+    ):
+        self.status = status
+        self.priority = priority
+        self.due_after = due_after
+        self.due_before = due_before
+        self.assigned_to = assigned_to
+
+    def apply(self, query):
+        if self.status:
+            query = query.filter(models.Task.status.in_([s.value for s in self.status]))
+        if self.priority:
+            query = query.filter(models.Task.priority.in_([p.value for p in self.priority]))
+        if self.due_after is not None:
+            query = query.filter(models.Task.due_date >= self.due_after)
+        if self.due_before is not None:
+            query = query.filter(models.Task.due_date <= self.due_before)
+        if self.assigned_to is not None:
+            query = query.filter(models.Task.assigned_to == self.assigned_to)
+        return query
+
+    def params(self) -> dict:
+        """
+        JSON-safe form, for background jobs that apply the filters later.
+        """
+        return {
+            "status": [s.value for s in self.status] if self.status else None,
+            "priority": [p.value for p in self.priority] if self.priority else None,
+            "due_after": self.due_after.isoformat() if self.due_after else None,
+            "due_before": self.due_before.isoformat() if self.due_before else None,
+            "assigned_to": self.assigned_to,
+        }
+
+    @classmethod
+    def from_params(cls, params: dict) -> "TaskFilterParams":
+        return cls(
+            status=[TaskStatus(s) for s in params.get("status") or []] or None,
+            priority=[Priority(p) for p in params.get("priority") or []] or None,
+            due_after=date.fromisoformat(params["due_after"]) if params.get("due_after") else None,
+            due_before=date.fromisoformat(params["due_before"]) if params.get("due_before") else None,
+            assigned_to=params.get("assigned_to"),
+        )
+
+def _parse_names(value: str, allowed, param: str) -> tuple:
+    names = tuple(name.strip() for name in value.split(",") if name.strip())
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown {param}: {', '.join(unknown)}. Allowed: {', '.join(allowed)}"
+        )
+    return names
+
+class TaskFieldParams:
+    """
+    `fields` and `include` query parameters shaping task responses.
+    `fields` is a comma-separated list of task columns (id is always returned);
+    `include` lists the related users to return (creator, assignee). Leaving a
+    parameter out means everything; passing it empty means nothing.
+    Unrequested columns are not selected and unrequested users are not loaded.
+    """
+    def __init__(
+        self,
+        fields: Optional[str] = Query(None, description="Comma-separated task columns"),
+        include: Optional[str] = Query(None, description="Comma-separated related users: creator, assignee"),
+    ):
+        requested = TASK_FIELDS if fields is None else _parse_names(fields, TASK_FIELDS, "field")
+        self.fields = tuple(name for name in TASK_FIELDS if name == "id" or name in requested)
+        self.include = tuple(TASK_RELATIONS) if include is None else _parse_names(include, tuple(TASK_RELATIONS), "include")
+
+    def columns(self, *extra: str) -> list:
+        """
+        Columns to select: the requested fields, the id columns of included users,
+        and any `extra` columns the caller needs internally.
+        """
+        needed = set(self.fields) | set(extra) | {TASK_RELATIONS[r] for r in self.include}
+        return [getattr(models.Task, name) for name in TASK_FIELDS if name in needed]
+
+def task_detail_statement(task_id: int, params: TaskFieldParams):
+    """
+    Load one task with only the requested columns, plus what the permission
+    check needs, and eager-load only the requested users.
+    """
+    options = [load_only(*params.columns("created_by", "assigned_to"))]
+    for relation in TASK_RELATIONS:
+        attribute = getattr(models.Task, relation)
+        options.append(selectinload(attribute) if relation in params.include else noload(attribute))
+    return select(models.Task).where(models.Task.id == task_id).options(*options)
+
+class TaskSort:
+    """
+    A whitelisted sort order for task listings.
+    Every order ends with `id` as a tie-breaker so keyset pagination is stable.
+    Null due dates always sort last.
+    """
+    # name -> (cursor value parser, whether the column may hold nulls)
+    FIELDS = {
+        "created_at": (parse_datetime, False),
+        "due_date": (parse_date, True),
+        "title": (parse_str, False),
+    }
+
+    def __init__(self, sort: str):
+        descending = sort.startswith("-")
+        name = sort[1:] if descending else sort
+        if name not in self.FIELDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot sort by '{name}'. Allowed: {', '.join(sorted(self.FIELDS))}"
+            )
+        self.sort = sort
+        self.name = name
+        self.descending = descending
+        self.column = getattr(models.Task, name)
+        self.parse, self.nullable = self.FIELDS[name]
+
+    def order_by(self) -> list:
+        column, task_id = self.column, models.Task.id
+        if self.descending:
+            column, task_id = column.desc(), task_id.desc()
+        if self.nullable:
+            column = column.nulls_last()
+        return [column, task_id]
+
+    def cursor_for(self, task) -> str:
+        return encode_cursor(self.sort, getattr(task, self.name), task.id)
+
+    def after(self, cursor: str):
+        """
+        Filter clause selecting the rows that follow `cursor` in this order.
+        """
+        sort, value, task_id = decode_cursor(cursor, 3)
+        if sort != self.sort:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor does not match the requested sort"
+            )
+        task_id = parse_id(task_id)
+        if value is not None or not self.nullable:
+            value = self.parse(value)
+        return self._after(value, task_id)
+
+    def _after(self, value: Any, task_id: int):
+        column, id_column = self.column, models.Task.id
+        id_after = id_column < task_id if self.descending else id_column > task_id
+        if not self.nullable:
+            key = tuple_(column, id_column)
+            return key < (value, task_id) if self.descending else key > (value, task_id)
+        if value is None:
+            # Only the trailing block of null keys is left
+            return and_(column.is_(None), id_after)
+        value_after = column < value if self.descending else column > value
+        return or_(value_after, and_(column == value, id_after), column.is_(None))
+
+def parse_ids(value: str, max_count: int) -> List[int]:
+    """
+    Parse a comma-separated id list such as `task_ids=1,2,3`, dropping duplicates.
+    """
+    try:
+        ids = list(dict.fromkeys(int(part) for part in value.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Ids must be a comma-separated list of integers"
+        )
+    if not ids or len(ids) > max_count:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Between 1 and {max_count} ids are allowed"
+        )
+    return ids
+
+def task_owners_statement(task_ids: List[int]):
+    return select(models.Task.id, models.Task.created_by, models.Task.assigned_to).where(models.Task.id.in_(task_ids))
+
+def require_task_access(owners: list, task_ids: List[int], current_user) -> None:
+    """
+    Check access to every task of a batch at once, given the rows of
+    task_owners_statement. Unknown ids are a 404, inaccessible ones a 403.
+    """
+    found = {row.id: row for row in owners}
+    missing = [task_id for task_id in task_ids if task_id not in found]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tasks not found: {', '.join(map(str, missing))}"
+        )
+    if current_user.role == UserRole.admin:
+        return
+    denied = [row.id for row in found.values() if current_user.id not in (row.created_by, row.assigned_to)]
+    if denied:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Not authorized to view notes for tasks: {', '.join(map(str, sorted(denied)))}"
+        )
+
+def note_order() -> list:
+    return [models.Note.created_at.desc(), models.Note.id.desc()]
+
+def note_cursor_for(note) -> str:
+    return encode_cursor(note.created_at, note.id)
+
+def notes_after(cursor: str):
+    """
+    Filter clause for the notes following `cursor` in newest-first order.
+    """
+    created_at, note_id = decode_cursor(cursor, 2)
+    return tuple_(models.Note.created_at, models.Note.id) < (parse_datetime(created_at), parse_id(note_id))
+
+def notes_for_tasks(task_ids: List[int], per_task: Optional[int] = None):
+    """
+    Notes of several tasks, newest first within each task. With `per_task`
+    only the latest N of each task are kept, ranked in SQL with row_number().
+    """
+    if per_task is None:
+        return (
+            select(models.Note)
+            .where(models.Note.task_id.in_(task_ids))
+            .order_by(models.Note.task_id, *note_order())
+        )
+    rank = func.row_number().over(partition_by=models.Note.task_id, order_by=note_order()).label("rank")
+    ranked = select(models.Note, rank).where(models.Note.task_id.in_(task_ids)).subquery()
+    note = aliased(models.Note, ranked)
+    return (
+        select(note)
+        .where(ranked.c.rank <= per_task)
+        .order_by(note.task_id, note.created_at.desc(), note.id.desc())
+    )
+
+def user_page_statement(limit: int, cursor: Optional[str] = None):
+    """
+    Active users in id order, `limit + 1` rows so the caller can tell whether
+    another page follows.
+    """
+    stmt = select(*USER_COLUMNS).where(models.User.deleted_at.is_(None))
+    if cursor is not None:
+        (last_id,) = decode_cursor(cursor, 1)
+        stmt = stmt.where(models.User.id > parse_id(last_id))
+    return stmt.order_by(models.User.id).limit(limit + 1)
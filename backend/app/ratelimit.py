@@ -0,0 +1,166 @@
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+
+from .database import engine
+from .metrics import RATE_LIMITED
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+# "memory" keeps buckets per worker process; "database" shares them between
+# every worker and host through the rate_limit_buckets table
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+# Buckets tracked per process by the memory backend; the least recently used go first
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+
+class Limit:
+    """
+    A token bucket of `capacity` requests that refills at capacity / seconds,
+    written "capacity/seconds" in the environment, e.g. "5/60".
+    """
+    def __init__(self, name: str, spec: str):
+        capacity, _, seconds = spec.partition("/")
+        self.name = name
+        self.capacity = int(capacity)
+        self.seconds = float(seconds or 60)
+        self.rate = self.capacity / self.seconds
+
+LOGIN_BY_IP = Limit("login_ip", os.getenv("LOGIN_RATE_LIMIT_IP", "20/60"))
+LOGIN_BY_EMAIL = Limit("login_email", os.getenv("LOGIN_RATE_LIMIT_EMAIL", "5/60"))
+PASSWORD_BY_IP = Limit("password_ip", os.getenv("PASSWORD_RATE_LIMIT_IP", "10/300"))
+PASSWORD_BY_USER = Limit("password_user", os.getenv("PASSWORD_RATE_LIMIT_USER", "5/300"))
+LIMITS = (LOGIN_BY_IP, LOGIN_BY_EMAIL, PASSWORD_BY_IP, PASSWORD_BY_USER)
+
+class MemoryBackend:
+    """
+    Buckets held in this process. With N workers a client gets up to N times
+    the configured rate, which still caps the bcrypt work each worker does.
+    """
+    blocking = False
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, limit: Limit) -> float:
+        """
+        Take a token from the bucket. Returns 0 when one was available, else the
+        seconds until there will be one.
+        """
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(limit.capacity), now]
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+            tokens = min(limit.capacity, bucket[0] + (now - bucket[1]) * limit.rate)
+            bucket[1] = now
+            if tokens >= 1:
+                bucket[0] = tokens - 1
+                return 0.0
+            bucket[0] = tokens
+            return (1 - tokens) / limit.rate
+
+# Bucket refilled up to now, capped at capacity; SET expressions all see the old row
+_REFILLED = (
+    "CASE WHEN rate_limit_buckets.tokens + (:now - rate_limit_buckets.updated_at) * :rate > :capacity"
+    " THEN :capacity"
+    " ELSE rate_limit_buckets.tokens + (:now - rate_limit_buckets.updated_at) * :rate END"
+)
+_TAKE = text(f"""
+    INSERT INTO rate_limit_buckets (key, tokens, updated_at, allowed)
+    VALUES (:key, :capacity - 1, :now, true)
+    ON CONFLICT (key) DO UPDATE SET
+        tokens = CASE WHEN {_REFILLED} >= 1 THEN {_REFILLED} - 1 ELSE {_REFILLED} END,
+        updated_at = :now,
+        allowed = {_REFILLED} >= 1
+    RETURNING tokens, allowed
+""")
+
+class DatabaseBackend:
+    """
+    Buckets in the rate_limit_buckets table, shared by every worker. Each take
+    is one atomic upsert in its own short transaction, outside the request's session.
+    """
+    blocking = True
+    # Takes between sweeps of idle rows, per process
+    SWEEP_EVERY = 1000
+
+    def __init__(self, bind=engine):
+        self.bind = bind
+        self._takes = 0
+
+    def take(self, key: str, limit: Limit) -> float:
+        now = time.time()
+        with self.bind.begin() as connection:
+            tokens, allowed = connection.execute(
+                _TAKE, {"key": key, "capacity": limit.capacity, "rate": limit.rate, "now": now}
+            ).one()
+            self._takes += 1
+            if self._takes % self.SWEEP_EVERY == 0:
+                # A bucket idle for longer than the longest window is full again,
+                # so dropping its row loses nothing
+                idle = max(other.seconds for other in LIMITS)
+                connection.execute(text("DELETE FROM rate_limit_buckets WHERE updated_at < :cutoff"), {"cutoff": now - idle})
+        return 0.0 if allowed else (1 - tokens) / limit.rate
+
+backend = DatabaseBackend() if RATE_LIMIT_BACKEND == "database" else MemoryBackend()
+
+def set_backend(new_backend) -> None:
+    """
+    Swap in another shared-state backend: any object with a `take(key, limit)`
+    method as above and a `blocking` flag telling async callers to use a thread.
+    """
+    global backend
+    backend = new_backend
+
+def client_ip(request: Request) -> str:
+    # Behind a proxy, run uvicorn with --proxy-headers and --forwarded-allow-ips
+    # so request.client is the real client rather than the proxy
+    return request.client.host if request.client else "unknown"
+
+def enforce(buckets: Iterable[Tuple[Limit, str]]) -> None:
+    """
+    Take a token from each (limit, key) bucket in turn, raising 429 with
+    Retry-After at the first empty one. Call before doing any hashing.
+    """
+    if not RATE_LIMIT_ENABLED:
+        return
+    for limit, key in buckets:
+        retry_after = backend.take(f"{limit.name}:{key}", limit)
+        if retry_after > 0:
+            RATE_LIMITED.labels(limit.name).inc()
+            logger.info("Rate limited", extra={"limit": limit.name, "key": key})
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many attempts, try again later",
+                headers={"Retry-After": str(math.ceil(retry_after))}
+            )
+
+async def enforce_async(buckets: Iterable[Tuple[Limit, str]]) -> None:
+    if backend.blocking:
+        await run_in_threadpool(enforce, list(buckets))
+    else:
+        enforce(buckets)
+
+def login_buckets(request: Request, email: str):
+    return [(LOGIN_BY_IP, client_ip(request)), (LOGIN_BY_EMAIL, email.strip().lower())]
+
+def password_buckets(request: Request, user_id: Optional[int] = None):
+    buckets = [(PASSWORD_BY_IP, client_ip(request))]
+    if user_id is not None:
+        buckets.append((PASSWORD_BY_USER, str(user_id)))
+    return buckets
@@ -0,0 +1,203 @@
+import hashlib
+import logging
+import math
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from . import models
+from .database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Revoked token ids the filter is sized for before it is rebuilt bigger
+REVOCATION_BLOOM_CAPACITY = int(os.getenv("REVOCATION_BLOOM_CAPACITY", "100000"))
+# Chance that a token that was never revoked is rejected anyway; its owner
+# just logs in again
+REVOCATION_BLOOM_ERROR_RATE = float(os.getenv("REVOCATION_BLOOM_ERROR_RATE", "0.000001"))
+# How often each worker picks up revocations made by the other workers
+REVOCATION_SYNC_SECONDS = float(os.getenv("REVOCATION_SYNC_SECONDS", "5"))
+# How often the filter is rebuilt without expired entries, which are also deleted
+REVOCATION_REBUILD_SECONDS = float(os.getenv("REVOCATION_REBUILD_SECONDS", "3600"))
+
+_PENDING = "pending_revocations"
+# Polls re-read this many seconds before the newest revocation seen, to catch
+# rows whose transactions committed after a later one did
+_SYNC_OVERLAP = timedelta(seconds=60)
+
+def _epoch(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+class BloomFilter:
+    """
+    Fixed-size set membership with no false negatives. Sized for `capacity`
+    keys at `error_rate` false positives: about 29 bits per key at one in a million.
+    """
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = max(capacity, 1)
+        self.size = math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str) -> Iterable[int]:
+        # Double hashing: k positions from two halves of one digest
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+_ROWS = select(
+    models.RevokedToken.jti, models.RevokedToken.user_id, models.RevokedToken.revoked_at
+).order_by(models.RevokedToken.revoked_at)
+
+class RevocationSet:
+    """
+    The revoked_tokens table held in memory: a Bloom filter of revoked token
+    ids plus, per user, a cutoff before which all their tokens are revoked.
+    Checks are O(1) and make no query. Each worker loads the table at startup
+    and then polls it for rows other workers added.
+    """
+    def __init__(self):
+        self._tokens = BloomFilter(REVOCATION_BLOOM_CAPACITY, REVOCATION_BLOOM_ERROR_RATE)
+        self._cutoffs = {}
+        self._seen_until = datetime.min
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.loaded = False
+
+    def is_revoked(self, jti: Optional[str], user_id: Optional[int], issued_at: Optional[float]) -> bool:
+        if user_id is not None and issued_at is not None:
+            cutoff = self._cutoffs.get(user_id)
+            if cutoff is not None and issued_at < cutoff:
+                return True
+        return jti is not None and jti in self._tokens
+
+    def _add(self, tokens: BloomFilter, cutoffs: dict, jti: Optional[str], user_id: Optional[int], revoked_at: datetime) -> None:
+        if jti is not None:
+            # Polls overlap, so skip ids already in to keep `count` honest
+            if jti not in tokens:
+                tokens.add(jti)
+        elif user_id is not None:
+            cutoffs[user_id] = max(cutoffs.get(user_id, 0), _epoch(revoked_at))
+
+    def apply(self, revoked: Iterable[tuple]) -> None:
+        """
+        Add (jti, user_id, revoked_at) rows just committed by this process, ahead of the next poll.
+        """
+        with self._lock:
+            for jti, user_id, revoked_at in revoked:
+                self._add(self._tokens, self._cutoffs, jti, user_id, revoked_at)
+
+    def load(self) -> None:
+        """
+        Rebuild from the table, dropping (and deleting) rows whose tokens have expired.
+        """
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            db.execute(delete(models.RevokedToken).where(models.RevokedToken.expires_at < now))
+            db.commit()
+            rows = db.execute(_ROWS).all()
+        finally:
+            db.close()
+        tokens = BloomFilter(max(REVOCATION_BLOOM_CAPACITY, len(rows) * 2), REVOCATION_BLOOM_ERROR_RATE)
+        cutoffs = {}
+        for row in rows:
+            self._add(tokens, cutoffs, row.jti, row.user_id, row.revoked_at)
+        with self._lock:
+            # Swapped whole, so checks never see a half-built filter
+            self._tokens, self._cutoffs = tokens, cutoffs
+            self._seen_until = max([now] + [row.revoked_at for row in rows])
+            self.loaded = True
+        logger.info("Loaded token revocations", extra={"rows": len(rows)})
+
+    def sync(self) -> None:
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                _ROWS.where(models.RevokedToken.revoked_at >= self._seen_until - _SYNC_OVERLAP)
+            ).all()
+        finally:
+            db.close()
+        if not rows:
+            return
+        with self._lock:
+            for row in rows:
+                self._add(self._tokens, self._cutoffs, row.jti, row.user_id, row.revoked_at)
+            self._seen_until = max(self._seen_until, rows[-1].revoked_at)
+            full = self._tokens.count > self._tokens.capacity
+        if full:
+            self.load()
+
+    def _run(self) -> None:
+        rebuild_at = 0.0
+        while not self._stop.is_set():
+            try:
+                if not self.loaded or time.monotonic() >= rebuild_at:
+                    self.load()
+                    rebuild_at = time.monotonic() + REVOCATION_REBUILD_SECONDS
+                else:
+                    self.sync()
+            except Exception:
+                logger.warning("Could not refresh token revocations", exc_info=True)
+            self._stop.wait(REVOCATION_SYNC_SECONDS)
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="revocation-sync", daemon=True)
+                self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=5)
+
+revocations = RevocationSet()
+
+def _stage(session, row: models.RevokedToken) -> None:
+    session.add(row)
+    # Plain values: the row is expired by the time the commit hook runs
+    session.info.setdefault(_PENDING, []).append((row.jti, row.user_id, row.revoked_at))
+
+def revoke_token(session, jti: str, expires_at: datetime) -> None:
+    """
+    Revoke one token (logout, refresh token rotation) when the session commits.
+    """
+    _stage(session, models.RevokedToken(jti=jti, revoked_at=datetime.utcnow(), expires_at=expires_at))
+
+def revoke_user(session, user_id: int, expires_at: datetime) -> None:
+    """
+    Revoke every token issued to the user so far when the session commits.
+    `expires_at` is when the longest-lived of those tokens will have expired anyway.
+    """
+    _stage(session, models.RevokedToken(user_id=user_id, revoked_at=datetime.utcnow(), expires_at=expires_at))
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed(session: Session) -> None:
+    pending = session.info.pop(_PENDING, None)
+    if pending:
+        revocations.apply(pending)
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session: Session) -> None:
+    session.info.pop(_PENDING, None)
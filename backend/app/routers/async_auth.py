@@ -0,0 +1,42 @@
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from .. import schemas, auth, ratelimit
+from ..database import get_async_db
+from ..models import UserRole
+
+logger = logging.getLogger(__name__)
+
+# Async twin of routers/auth.py, mounted ahead of it when DB_ASYNC is enabled
+router = APIRouter()
+
+@router.post("/login", response_model=schemas.TokenResponse)
+async def login(
+    request: Request,
+    credentials: schemas.LoginCredentials,
+    db: AsyncSession = Depends(get_async_db)
+):
+    await ratelimit.enforce_async(ratelimit.login_buckets(request, credentials.email))
+    user = await auth.authenticate_user_async(db, credentials.email, credentials.password)
+    if not user:
+        logger.info("Login failed", extra={"email": credentials.email})
+        raise HTTPException(
+            status_code=401,
+            detail="Incorrect email or password"
+        )
+
+    access_token = auth.create_user_token(user)
+    user_role = user.role.value if isinstance(user.role, UserRole) else str(user.role)
+
+    return {
+        "access_token": access_token,
+        "refresh_token": auth.create_refresh_token(user),
+        "token_type": "bearer",
+        "user": {
+            "id": user.id,
+            "email": user.email,
+            "name": user.name,
+            "role": user_role,
+            "created_at": user.created_at
+        }
+    }
@@ -0,0 +1,150 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
+
+from .. import etag
+from ..database import get_async_db, get_async_read_db
+from ..models import Note, Task, UserRole
+from ..pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ..queries import (
+    note_cursor_for, note_order, notes_after, notes_for_tasks, parse_ids, require_task_access, task_owners_statement
+)
+from ..schemas import NoteBatch, NoteCreate, NotePage, Note as NoteSchema, TokenData
+from ..auth import get_current_principal_async
+
+# Async twin of routers/notes.py, mounted ahead of it when DB_ASYNC is enabled
+router = APIRouter(prefix="/notes", tags=["notes"])
+
+async def _get_task(db: AsyncSession, task_id: int):
+    # Only the ownership columns are needed for the permission check
+    result = await db.execute(
+        select(Task.id, Task.created_by, Task.assigned_to).where(Task.id == task_id)
+    )
+    return result.first()
+
+@router.post("/", response_model=NoteSchema)
+async def create_note(
+    note: NoteCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenData = Depends(get_current_principal_async)
+):
+    task = await _get_task(db, note.task_id)
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
+
+    if task.created_by != current_user.id and task.assigned_to != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to add notes to this task"
+        )
+
+    db_note = Note(
+        content=note.content,
+        task_id=note.task_id,
+        user_id=current_user.id
+    )
+    db.add(db_note)
+    await db.commit()
+    await db.refresh(db_note)
+    return db_note
+
+@router.get("/task/{task_id:int}", response_model=List[NoteSchema])
+async def get_task_notes(
+    task_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenData = Depends(get_current_principal_async)
+):
+    task = await _get_task(db, task_id)
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
+
+    if task.created_by != current_user.id and task.assigned_to != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view notes for this task"
+        )
+
+    versions = (await db.execute(etag.note_versions_statement(Note.task_id == task_id))).one()
+    notes_etag = etag.collection_etag(request, current_user, task_id, *versions)
+    not_modified = etag.not_modified(request, notes_etag)
+    if not_modified is not None:
+        return not_modified
+    etag.tag(response, notes_etag)
+    result = await db.execute(select(Note).where(Note.task_id == task_id))
+    return result.scalars().all()
+
+@router.delete("/{note_id:int}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_note(
+    note_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenData = Depends(get_current_principal_async)
+):
+    note = await db.get(Note, note_id)
+    if not note:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Note not found"
+        )
+
+    if note.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to delete this note"
+        )
+
+    await db.delete(note)
+    await db.commit()
+    return None
+
+@router.get("/", response_model=Union[NotePage, NoteBatch])
+async def get_notes(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    task_ids: Optional[str] = Query(None, description="Comma-separated task ids to fetch notes for in one call"),
+    per_task: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Latest N notes per task with task_ids"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: TokenData = Depends(get_current_principal_async)
+):
+    if task_ids is not None:
+        ids = parse_ids(task_ids, MAX_PAGE_SIZE)
+        owners = (await db.execute(task_owners_statement(ids))).all()
+        require_task_access(owners, ids, current_user)
+        criteria = [Note.task_id.in_(ids)]
+    else:
+        criteria = []
+        if current_user.role != UserRole.admin:
+            criteria.append(Note.user_id == current_user.id)
+        if cursor is not None:
+            criteria.append(notes_after(cursor))
+
+    versions = (await db.execute(etag.note_versions_statement(*criteria))).one()
+    notes_etag = etag.collection_etag(request, current_user, *versions)
+    not_modified = etag.not_modified(request, notes_etag)
+    if not_modified is not None:
+        return not_modified
+    etag.tag(response, notes_etag)
+
+    if task_ids is not None:
+        grouped = {task_id: [] for task_id in ids}
+        for note in (await db.execute(notes_for_tasks(ids, per_task))).scalars():
+            grouped[note.task_id].append(note)
+        return {"notes": grouped}
+
+    stmt = select(Note).where(*criteria).order_by(*note_order()).limit(limit + 1)
+    notes = (await db.execute(stmt)).scalars().all()
+    next_cursor = None
+    if len(notes) > limit:
+        notes = notes[:limit]
+        next_cursor = note_cursor_for(notes[-1])
+    return {"items": notes, "next_cursor": next_cursor}
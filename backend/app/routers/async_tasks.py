@@ -0,0 +1,145 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import Optional
+from .. import schemas, models, archive, auth, etag, serializers
+from ..database import get_async_db, get_async_read_db
+from ..models import UserRole
+from ..pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ..queries import TaskFieldParams, TaskFilterParams, TaskSort, split_page, task_count_statement, task_detail_statement, visible_to
+
+# Async twin of routers/tasks.py, mounted ahead of it when DB_ASYNC is enabled.
+# Id routes use the :int convertor so other paths fall through to the sync router.
+router = APIRouter(
+    tags=["tasks"],
+    include_in_schema=True
+)
+
+async def _get_task(db: AsyncSession, task_id: int, with_users: bool = False) -> Optional[models.Task]:
+    # Async sessions cannot lazy-load, so users are loaded up front when needed
+    stmt = select(models.Task).where(models.Task.id == task_id)
+    if with_users:
+        stmt = stmt.options(
+            selectinload(models.Task.creator),
+            selectinload(models.Task.assignee)
+        ).execution_options(populate_existing=True)
+    result = await db.execute(stmt)
+    return result.scalars().first()
+
+@router.post("", response_model=schemas.TaskResponse)
+async def create_task(
+    task: schemas.TaskCreate,
+    current_user: schemas.TokenData = Depends(auth.get_current_principal_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    db_task = models.Task(
+        **task.dict(),
+        created_by=current_user.id
+    )
+    db.add(db_task)
+    await db.commit()
+    return await _get_task(db, db_task.id, with_users=True)
+
+@router.get("", response_model=schemas.TaskListPage, response_class=ORJSONResponse)
+async def read_tasks(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    include_archived: bool = False,
+    sort: str = "-created_at",
+    member_id: int = None,
+    filters: TaskFilterParams = Depends(),
+    shape: TaskFieldParams = Depends(),
+    current_user: schemas.TokenData = Depends(auth.get_current_principal_async),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    task_sort = TaskSort(sort)
+    stmt = select(*shape.columns("id", "updated_at", task_sort.name))
+    if current_user.role == UserRole.admin:
+        if member_id is not None:
+            if await db.get(models.User, member_id) is None:
+                raise HTTPException(status_code=404, detail="Member not found")
+            stmt = stmt.where(visible_to(member_id))
+    else:
+        stmt = stmt.where(visible_to(current_user.id))
+
+    stmt = filters.apply(stmt)
+    total = None
+    if include_total:
+        total = await db.scalar(archive.including_archived(task_count_statement(stmt), include_archived))
+
+    if cursor is not None:
+        stmt = stmt.where(task_sort.after(cursor))
+
+    versions = (await db.execute(archive.including_archived(
+        etag.task_versions_statement(stmt, bool(shape.include)), include_archived
+    ))).one()
+    page_etag = etag.collection_etag(request, current_user, total, *versions)
+    not_modified = etag.not_modified(request, page_etag)
+    if not_modified is not None:
+        return not_modified
+
+    page = stmt.order_by(*task_sort.order_by()).limit(limit + 1)
+    result = await db.execute(archive.including_archived(page, include_archived))
+    rows, next_cursor = split_page(result.all(), limit, task_sort)
+
+    user_ids = serializers.referenced_user_ids(rows, shape.include)
+    users = (await db.execute(serializers.users_statement(user_ids))).all() if user_ids else []
+    return etag.tag(serializers.task_page_response(
+        serializers.task_dicts(rows, shape.fields),
+        serializers.user_dicts(users),
+        next_cursor,
+        total
+    ), page_etag)
+
+@router.get("/{task_id:int}", response_model=schemas.TaskResponse)
+async def read_task(
+    task_id: int,
+    shape: TaskFieldParams = Depends(),
+    current_user: schemas.TokenData = Depends(auth.get_current_principal_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    task = (await db.execute(task_detail_statement(task_id, shape))).scalars().first()
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if current_user.role != UserRole.admin and task.created_by != current_user.id and task.assigned_to != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to access this task")
+    return ORJSONResponse(serializers.task_detail(task, shape.fields, shape.include))
+
+@router.put("/{task_id:int}", response_model=schemas.TaskResponse)
+async def update_task(
+    task_id: int,
+    task_update: schemas.TaskUpdate,
+    current_user: schemas.TokenData = Depends(auth.get_current_principal_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    db_task = await _get_task(db, task_id)
+    if db_task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if current_user.role != UserRole.admin and db_task.created_by != current_user.id and db_task.assigned_to != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to update this task")
+
+    for key, value in task_update.dict(exclude_unset=True).items():
+        setattr(db_task, key, value)
+
+    await db.commit()
+    return await _get_task(db, task_id, with_users=True)
+
+@router.delete("/{task_id:int}")
+async def delete_task(
+    task_id: int,
+    current_user: schemas.TokenData = Depends(auth.get_current_principal_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    db_task = await _get_task(db, task_id)
+    if db_task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if current_user.role != UserRole.admin and db_task.created_by != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to delete this task")
+
+    await db.delete(db_task)
+    await db.commit()
+    return {"message": "Task deleted successfully"}
@@ -0,0 +1,204 @@
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from .. import schemas, models, auth, etag, ratelimit, serializers, stats, user_deletion
+from ..database import get_async_db, get_async_read_db
+from ..models import UserRole
+from ..pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ..queries import user_page_statement
+
+# Async twin of routers/users.py, mounted ahead of it when DB_ASYNC is enabled
+router = APIRouter(
+    tags=["users"],
+    include_in_schema=True
+)
+
+async def _get_user(db: AsyncSession, user_id: int) -> models.User:
+    db_user = await db.get(models.User, user_id)
+    if db_user is None or db_user.deleted_at is not None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return db_user
+
+@router.get("", response_model=schemas.UserPage, response_class=ORJSONResponse)
+async def get_users(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_workload: bool = False,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: schemas.TokenData = Depends(auth.get_current_principal_async)
+):
+    if str(current_user.role) != str(UserRole.admin):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this resource"
+        )
+    versions = (await db.execute(etag.user_versions_statement(include_tasks=include_workload))).one()
+    users_etag = etag.collection_etag(request, current_user, *versions, date.today() if include_workload else None)
+    not_modified = etag.not_modified(request, users_etag)
+    if not_modified is not None:
+        return not_modified
+    rows = (await db.execute(user_page_statement(limit, cursor))).all()
+    workloads = None
+    if include_workload:
+        workloads = stats.workload_map(await db.execute(stats.workload_statement(row.id for row in rows[:limit])))
+    return etag.tag(serializers.user_page_response(rows, limit, workloads), users_etag)
+
+@router.post("/", response_model=schemas.User)
+async def create_user(
+    request: Request,
+    user: schemas.UserCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    await ratelimit.enforce_async(ratelimit.password_buckets(request))
+    result = await db.execute(select(models.User).where(models.User.email == user.email))
+    if result.scalars().first():
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    hashed_password = await auth.get_password_hash_async(user.password)
+    db_user = models.User(
+        email=user.email,
+        name=user.name,
+        role=user.role or UserRole.member,
+        hashed_password=hashed_password
+    )
+    db.add(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+@router.get("/me", response_model=schemas.User)
+async def read_user_me(current_user: models.User = Depends(auth.get_current_user_async)):
+    return current_user
+
+@router.put("/me", response_model=schemas.User)
+async def update_user(
+    user_update: schemas.UserUpdate,
+    current_user: schemas.TokenData = Depends(auth.get_current_principal_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    db_user = await _get_user(db, current_user.id)
+    changes = user_update.dict(exclude_unset=True)
+    for key, value in changes.items():
+        setattr(db_user, key, value)
+    if "role" in changes:
+        auth.revoke_user_tokens(db, db_user)
+
+    await db.commit()
+    auth.invalidate_user(db_user.id)
+    await db.refresh(db_user)
+    return db_user
+
+@router.put("/me/password")
+async def update_password(
+    request: Request,
+    password_update: schemas.PasswordUpdate,
+    current_user: schemas.TokenData = Depends(auth.get_current_principal_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    await ratelimit.enforce_async(ratelimit.password_buckets(request, current_user.id))
+    db_user = await _get_user(db, current_user.id)
+    db_user.hashed_password = await auth.get_password_hash_async(password_update.new_password)
+    auth.revoke_user_tokens(db, db_user)
+    await db.commit()
+    auth.invalidate_user(db_user.id)
+    return {
+        "message": "Password updated successfully",
+        "access_token": auth.create_user_token(db_user),
+        "refresh_token": auth.create_refresh_token(db_user),
+        "token_type": "bearer"
+    }
+
+@router.get("/deletions/{deletion_id:int}", response_model=schemas.UserDeletion)
+async def read_user_deletion(
+    deletion_id: int,
+    current_user: schemas.TokenData = Depends(auth.get_current_active_admin_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    deletion = await db.get(models.UserDeletion, deletion_id)
+    if deletion is None:
+        raise HTTPException(status_code=404, detail="Deletion not found")
+    return deletion
+
+@router.get("/{user_id:int}", response_model=schemas.User)
+async def read_user(
+    user_id: int,
+    current_user: schemas.TokenData = Depends(auth.get_current_active_admin_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await _get_user(db, user_id)
+
+@router.delete("/{user_id:int}", response_model=schemas.UserDeletion, status_code=202)
+async def delete_user(
+    user_id: int,
+    response: Response,
+    reassign_to: Optional[int] = None,
+    current_user: schemas.TokenData = Depends(auth.get_current_principal_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if str(current_user.role) != str(UserRole.admin):
+        raise HTTPException(
+            status_code=403,
+            detail="Not authorized to delete users"
+        )
+    if user_id == current_user.id:
+        raise HTTPException(
+            status_code=400,
+            detail="Cannot delete your own account"
+        )
+
+    # Not _get_user: deleting a soft-deleted user again resumes its deletion
+    db_user = await db.get(models.User, user_id)
+    if db_user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    if reassign_to is not None:
+        target = await db.get(models.User, reassign_to)
+        if target is None or target.deleted_at is not None or reassign_to == user_id:
+            raise HTTPException(status_code=400, detail="Cannot reassign to this user")
+
+    auth.revoke_user_tokens(db, db_user)
+    deletion = user_deletion.start(db, db_user, reassign_to)
+    await db.flush()
+    user_deletion.queue(db, deletion, created_by=current_user.id)
+    await db.commit()
+    auth.invalidate_user(user_id)
+    response.headers["Location"] = f"/api/users/deletions/{deletion.id}"
+    return deletion
+
+@router.put("/{user_id:int}", response_model=schemas.User)
+async def update_user_by_id(
+    user_id: int,
+    user_update: schemas.UserUpdate,
+    current_user: schemas.TokenData = Depends(auth.get_current_active_admin_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    db_user = await _get_user(db, user_id)
+    changes = user_update.dict(exclude_unset=True)
+    for key, value in changes.items():
+        setattr(db_user, key, value)
+    if "role" in changes:
+        auth.revoke_user_tokens(db, db_user)
+
+    await db.commit()
+    auth.invalidate_user(db_user.id)
+    await db.refresh(db_user)
+    return db_user
+
+@router.put("/{user_id:int}/password")
+async def admin_update_user_password(
+    request: Request,
+    user_id: int,
+    password_update: schemas.PasswordUpdate,
+    current_user: schemas.TokenData = Depends(auth.get_current_active_admin_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    await ratelimit.enforce_async(ratelimit.password_buckets(request, user_id))
+    db_user = await _get_user(db, user_id)
+    db_user.hashed_password = await auth.get_password_hash_async(password_update.new_password)
+    auth.revoke_user_tokens(db, db_user)
+    await db.commit()
+    auth.invalidate_user(db_user.id)
+    return {"message": f"Password updated successfully for user {db_user.email}"}
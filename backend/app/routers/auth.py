@@ -1,36 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from .. import schemas, auth
+from typing import Optional
+from .. import schemas, auth, ratelimit
 from ..database import get_db
 from .. import models
 from ..models import UserRole
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()  # Remove the prefix since it's added in main.py
 
+def _unauthorized() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
 @router.post("/login", response_model=schemas.TokenResponse)
 def login(
+    request: Request,
     credentials: schemas.LoginCredentials,
     db: Session = Depends(get_db)
 ):
-    print(f"Login attempt for email: {credentials.email}")  # Debug log
-    
-    user = db.query(models.User).filter(models.User.email == credentials.email).first()
-    if not user or not auth.verify_password(credentials.password, user.hashed_password):
+    ratelimit.enforce(ratelimit.login_buckets(request, credentials.email))
+    user = auth.authenticate_user(db, credentials.email, credentials.password)
+    if not user:
+        logger.info("Login failed", extra={"email": credentials.email})
         raise HTTPException(
             status_code=401,
             detail="Incorrect email or password"
         )
     
-    # Create token with just the email
-    access_token = auth.create_access_token(data={"sub": user.email})
-    print(f"Login successful for user: {user.email} with role: {user.role}")  # Debug log
+    access_token = auth.create_user_token(user)
+    logger.debug("Login succeeded", extra={"user_id": user.id})
     
     # Ensure role is properly serialized
     user_role = user.role.value if isinstance(user.role, UserRole) else str(user.role)
     
     return {
         "access_token": access_token,
+        "refresh_token": auth.create_refresh_token(user),
         "token_type": "bearer",
         "user": {
             "id": user.id,
@@ -39,4 +52,57 @@ def login(
             "role": user_role,
             "created_at": user.created_at
         }
-    } 
\ No newline at end of file
+    }
+
+@router.post("/refresh", response_model=schemas.TokenPair)
+def refresh(
+    body: schemas.RefreshRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Trade a refresh token for a new access token without a password check.
+    The refresh token is rotated: the one presented is revoked and a new one returned.
+    Each refresh token works once, even when presented twice at the same time:
+    the unique jti on revoked_tokens lets only one of the revocations commit.
+    """
+    token_data = auth.decode_token(body.refresh_token, token_type="refresh")
+    user = db.get(models.User, token_data.id) if token_data.id is not None else None
+    if user is None or token_data.jti is None or user.token_version != token_data.token_version:
+        raise _unauthorized()
+    auth.revoke_token(db, token_data)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Revoked by a concurrent refresh (possibly in another process) first
+        db.rollback()
+        raise _unauthorized()
+    return {
+        "access_token": auth.create_user_token(user),
+        "refresh_token": auth.create_refresh_token(user),
+        "token_type": "bearer"
+    }
+
+@router.post("/logout")
+def logout(
+    body: Optional[schemas.LogoutRequest] = None,
+    token: str = Depends(auth.oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    """
+    Revoke the access token used for this request and, when given, the refresh token.
+    """
+    auth.revoke_token(db, auth.decode_token(token))
+    if body is not None and body.refresh_token:
+        try:
+            auth.revoke_token(db, auth.decode_token(body.refresh_token, token_type="refresh"))
+        except HTTPException:
+            # Already expired or revoked: nothing left to revoke
+            pass
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent logout or refresh revoked one of the tokens first
+        db.rollback()
+        raise _unauthorized()
+    return {"message": "Logged out"}
+
@@ -0,0 +1,64 @@
+import asyncio
+import json
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Optional
+from .. import schemas, auth, events
+from ..database import SessionLocal
+
+router = APIRouter(
+    tags=["events"],
+    include_in_schema=True
+)
+
+# Comment lines keep proxies from closing idle streams
+KEEPALIVE_SECONDS = 15
+
+def _authenticate(token: Optional[str]) -> schemas.TokenData:
+    # A short-lived session: the request's own would stay checked out for as
+    # long as the stream is open
+    db = SessionLocal()
+    try:
+        return auth.get_current_principal(token or "", db)
+    finally:
+        db.close()
+
+def _format(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(events.public_event(event))}\n\n"
+
+async def _stream(request: Request, subscriber: events.Subscriber) -> AsyncIterator[str]:
+    try:
+        # Tell EventSource how soon to reconnect
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": keepalive\n\n"
+                continue
+            yield _format(event)
+    finally:
+        events.hub.unsubscribe(subscriber)
+
+@router.get("")
+async def stream_events(
+    request: Request,
+    token: Optional[str] = Query(None, description="Access token, for clients such as EventSource that cannot set headers"),
+    header_token: Optional[str] = Depends(auth.oauth2_scheme_optional)
+):
+    """
+    Server-sent events for task and note changes the caller can see:
+    task.created, task.updated, task.deleted and the note.* equivalents, each
+    with the task id. A `resync` event means some events may have been missed
+    and the client should refetch.
+    """
+    principal = await run_in_threadpool(_authenticate, header_token or token)
+    subscriber = events.subscribe(principal)
+    return StreamingResponse(
+        _stream(request, subscriber),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
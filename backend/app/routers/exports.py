@@ -0,0 +1,230 @@
+import csv
+import io
+import json
+import os
+from datetime import date, datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from typing import Callable, Iterator, Optional
+from .. import schemas, models, archive, auth, jobs
+from ..database import get_db, get_read_db, read_session
+from ..models import UserRole
+from ..queries import TaskFilterParams, TaskSort, task_scope
+
+router = APIRouter(
+    tags=["export"],
+    include_in_schema=True
+)
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+TASK_EXPORT_COLUMNS = [
+    models.Task.id,
+    models.Task.title,
+    models.Task.description,
+    models.Task.status,
+    models.Task.priority,
+    models.Task.due_date,
+    models.Task.created_by,
+    models.Task.assigned_to,
+    models.Task.created_at,
+]
+
+NOTE_EXPORT_COLUMNS = [
+    models.Note.id,
+    models.Note.task_id,
+    models.Note.user_id,
+    models.Note.content,
+    models.Note.created_at,
+    models.Note.updated_at,
+]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+def _plain(value):
+    return value.isoformat() if isinstance(value, (datetime, date)) else value
+
+def stream_rows(stmt, fmt: str, on_batch: Optional[Callable[[int], None]] = None) -> Iterator[str]:
+    """
+    Stream the rows of a column-only select as NDJSON or CSV, one batch at a time.
+    Runs on its own read session because the response outlives the request's
+    session, and uses a server-side cursor so memory stays flat whatever the row count.
+    `on_batch` is called with the row count of each batch once it is yielded.
+    """
+    with read_session() as db:
+        result = db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        keys = list(result.keys())
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(keys)
+            yield buffer.getvalue()
+            for batch in result.partitions():
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows([_plain(v) for v in row] for row in batch)
+                yield buffer.getvalue()
+                if on_batch is not None:
+                    on_batch(len(batch))
+        else:
+            for batch in result.partitions():
+                yield "".join(
+                    json.dumps({k: _plain(v) for k, v in zip(keys, row)}) + "\n"
+                    for row in batch
+                )
+                if on_batch is not None:
+                    on_batch(len(batch))
+
+def _export_response(stmt, fmt: str, name: str) -> StreamingResponse:
+    return StreamingResponse(
+        stream_rows(stmt, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'}
+    )
+
+def task_export_statement(
+    current_user: schemas.TokenData,
+    sort: str,
+    member_id: Optional[int],
+    include_archived: bool,
+    filters: TaskFilterParams
+):
+    stmt = select(*TASK_EXPORT_COLUMNS)
+    scope = task_scope(current_user, member_id)
+    if scope is not None:
+        stmt = stmt.where(scope)
+    stmt = filters.apply(stmt).order_by(*TaskSort(sort).order_by())
+    return archive.including_archived(stmt, include_archived)
+
+def note_export_statement(current_user: schemas.TokenData, task_id: Optional[int]):
+    stmt = select(*NOTE_EXPORT_COLUMNS)
+    if current_user.role != UserRole.admin:
+        stmt = stmt.where(models.Note.user_id == current_user.id)
+    if task_id is not None:
+        stmt = stmt.where(models.Note.task_id == task_id)
+    # Id order follows creation order and streams straight off the primary key
+    return stmt.order_by(models.Note.id)
+
+def _check_member(db: Session, current_user: schemas.TokenData, member_id: Optional[int]) -> None:
+    if current_user.role == UserRole.admin and member_id is not None:
+        if db.get(models.User, member_id) is None:
+            raise HTTPException(status_code=404, detail="Member not found")
+
+@router.get("/tasks/export")
+def export_tasks(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    sort: str = "-created_at",
+    member_id: Optional[int] = None,
+    include_archived: bool = False,
+    filters: TaskFilterParams = Depends(),
+    current_user: schemas.TokenData = Depends(auth.get_current_principal),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Stream every task the caller can see, with the same filters and sort as GET /api/tasks.
+    """
+    _check_member(db, current_user, member_id)
+    stmt = task_export_statement(current_user, sort, member_id, include_archived, filters)
+    return _export_response(stmt, format, "tasks")
+
+@router.get("/notes/export")
+def export_notes(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    task_id: Optional[int] = None,
+    current_user: schemas.TokenData = Depends(auth.get_current_principal)
+):
+    """
+    Stream notes oldest first. Admins get every note, other users their own,
+    matching GET /api/notes.
+    """
+    return _export_response(note_export_statement(current_user, task_id), format, "notes")
+
+def _queue_export(db: Session, response: Response, current_user: schemas.TokenData, params: dict) -> models.Job:
+    job = jobs.enqueue(db, "export", {
+        **params,
+        "user_id": current_user.id,
+        "role": current_user.role.value,
+    }, created_by=current_user.id)
+    db.commit()
+    response.headers["Location"] = f"/api/jobs/{job.id}"
+    return job
+
+@router.post("/tasks/export", response_model=schemas.Job, status_code=202)
+def queue_task_export(
+    response: Response,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    sort: str = "-created_at",
+    member_id: Optional[int] = None,
+    include_archived: bool = False,
+    filters: TaskFilterParams = Depends(),
+    current_user: schemas.TokenData = Depends(auth.get_current_principal),
+    db: Session = Depends(get_db)
+):
+    """
+    GET /api/tasks/export as a background job: the file is written by a job
+    worker and downloaded from GET /api/jobs/{id}/download once the job completes.
+    """
+    _check_member(db, current_user, member_id)
+    # Built now so a bad sort is reported to the caller rather than by the job
+    task_export_statement(current_user, sort, member_id, include_archived, filters)
+    return _queue_export(db, response, current_user, {
+        "resource": "tasks",
+        "format": format,
+        "sort": sort,
+        "member_id": member_id,
+        "include_archived": include_archived,
+        "filters": filters.params(),
+    })
+
+@router.post("/notes/export", response_model=schemas.Job, status_code=202)
+def queue_note_export(
+    response: Response,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    task_id: Optional[int] = None,
+    current_user: schemas.TokenData = Depends(auth.get_current_principal),
+    db: Session = Depends(get_db)
+):
+    """
+    GET /api/notes/export as a background job, downloaded like task exports.
+    """
+    return _queue_export(db, response, current_user, {"resource": "notes", "format": format, "task_id": task_id})
+
+@jobs.handler("export")
+def export_job(job: jobs.JobContext) -> dict:
+    """
+    Write an export to JOB_FILES_DIR with the permissions of the user who queued it.
+    """
+    params = job.params
+    current_user = schemas.TokenData(id=params["user_id"], role=params["role"])
+    if params["resource"] == "tasks":
+        stmt = task_export_statement(
+            current_user, params["sort"], params.get("member_id"), params.get("include_archived", False),
+            TaskFilterParams.from_params(params["filters"])
+        )
+    else:
+        stmt = note_export_statement(current_user, params.get("task_id"))
+
+    fmt = params["format"]
+    path = jobs.file_path(job.job_id, fmt)
+    rows = 0
+    def counted(batch_rows: int) -> None:
+        nonlocal rows
+        rows += batch_rows
+        job.progress(rows)
+    # Written aside and renamed, so a retried job never serves a partial file
+    with open(path + ".part", "w", newline="") as file:
+        for chunk in stream_rows(stmt, fmt, counted):
+            file.write(chunk)
+    os.replace(path + ".part", path)
+    return {
+        "file": os.path.basename(path),
+        "filename": f"{params['resource']}.{fmt}",
+        "media_type": MEDIA_TYPES[fmt],
+        "rows": rows,
+    }
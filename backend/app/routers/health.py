@@ -0,0 +1,46 @@
+import logging
+from fastapi import APIRouter, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from .. import database, revocation
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    tags=["health"],
+    include_in_schema=False
+)
+
+@router.get("/healthz")
+def liveness():
+    """
+    The process is up and serving. Never touches the database, so an outage
+    doesn't get healthy workers restarted.
+    """
+    return {"status": "ok"}
+
+@router.get("/readyz")
+async def readiness(request: Request):
+    """
+    Ready for traffic: startup has finished, the revoked tokens are loaded and
+    the database answers through the pool.
+    """
+    body = {
+        "status": "ok",
+        "startup_seconds": getattr(request.app.state, "startup_seconds", None),
+        "pools": database.pool_status(),
+        # Informational: reads fall back to the primary when no replica is healthy
+        "replicas": database.replicas.status(),
+    }
+    if body["startup_seconds"] is None or not revocation.revocations.loaded:
+        body["status"] = "starting"
+        return JSONResponse(body, status_code=503)
+    try:
+        await run_in_threadpool(database.ping)
+        if database.async_engine is not None:
+            await database.ping_async()
+    except Exception as e:
+        logger.warning("Readiness check failed: %s", e)
+        body["status"] = "unavailable"
+        return JSONResponse(body, status_code=503)
+    return body
@@ -0,0 +1,68 @@
+import os
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from typing import List
+from .. import schemas, models, auth, jobs
+from ..database import get_db
+from ..models import UserRole
+
+router = APIRouter(
+    tags=["jobs"],
+    include_in_schema=True
+)
+
+def _get_job(db: Session, job_id: int, current_user: schemas.TokenData) -> models.Job:
+    job = db.get(models.Job, job_id)
+    # Other users' jobs are reported missing rather than forbidden
+    if job is None or (current_user.role != UserRole.admin and job.created_by != current_user.id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("", response_model=List[schemas.Job])
+def read_jobs(
+    limit: int = Query(50, ge=1, le=200),
+    current_user: schemas.TokenData = Depends(auth.get_current_principal),
+    db: Session = Depends(get_db)
+):
+    """
+    The caller's most recent jobs, newest first.
+    """
+    return db.scalars(
+        select(models.Job)
+        .where(models.Job.created_by == current_user.id)
+        .order_by(models.Job.id.desc())
+        .limit(limit)
+    ).all()
+
+@router.get("/{job_id}", response_model=schemas.Job)
+def read_job(
+    job_id: int,
+    current_user: schemas.TokenData = Depends(auth.get_current_principal),
+    db: Session = Depends(get_db)
+):
+    """
+    Status, progress and, once completed, the result of a job.
+    """
+    return _get_job(db, job_id, current_user)
+
+@router.get("/{job_id}/download")
+def download_job_file(
+    job_id: int,
+    current_user: schemas.TokenData = Depends(auth.get_current_principal),
+    db: Session = Depends(get_db)
+):
+    """
+    The file written by a completed job, such as a queued export.
+    """
+    job = _get_job(db, job_id, current_user)
+    if job.status != jobs.COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    result = job.result or {}
+    if not result.get("file"):
+        raise HTTPException(status_code=404, detail="Job has no file")
+    path = os.path.join(jobs.JOB_FILES_DIR, result["file"])
+    if not os.path.exists(path):
+        raise HTTPException(status_code=410, detail="File has been removed")
+    return FileResponse(path, media_type=result.get("media_type"), filename=result.get("filename"))
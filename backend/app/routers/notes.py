@@ -1,12 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Union
 
-from ..database import get_db
-from ..models import Note, Task
-from ..schemas import NoteCreate, Note as NoteSchema
-from ..auth import get_current_user
-from ..models import User
+from .. import etag
+from ..database import get_db, get_read_db
+from ..models import Note, Task, UserRole
+from ..pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ..queries import (
+    note_cursor_for, note_order, notes_after, notes_for_tasks, parse_ids, require_task_access, task_owners_statement
+)
+from ..schemas import NoteBatch, NoteCreate, NotePage, Note as NoteSchema, TokenData
+from ..auth import get_current_principal
 
 router = APIRouter(prefix="/notes", tags=["notes"])
 
@@ -14,10 +18,10 @@ router = APIRouter(prefix="/notes", tags=["notes"])
 def create_note(
     note: NoteCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: TokenData = Depends(get_current_principal)
 ):
     # Verify task exists and user has access to it
-    task = db.query(Task).filter(Task.id == note.task_id).first()
+    task = db.query(Task.id, Task.created_by, Task.assigned_to).filter(Task.id == note.task_id).first()
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -43,10 +47,12 @@ def create_note(
 @router.get("/task/{task_id}", response_model=List[NoteSchema])
 def get_task_notes(
     task_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: TokenData = Depends(get_current_principal)
 ):
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = db.query(Task.id, Task.created_by, Task.assigned_to).filter(Task.id == task_id).first()
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -59,13 +65,18 @@ def get_task_notes(
             detail="Not authorized to view notes for this task"
         )
 
+    notes_etag = etag.collection_etag(request, current_user, task_id, *db.execute(etag.note_versions_statement(Note.task_id == task_id)).one())
+    not_modified = etag.not_modified(request, notes_etag)
+    if not_modified is not None:
+        return not_modified
+    etag.tag(response, notes_etag)
     return db.query(Note).filter(Note.task_id == task_id).all()
 
 @router.delete("/{note_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_note(
     note_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: TokenData = Depends(get_current_principal)
 ):
     note = db.query(Note).filter(Note.id == note_id).first()
     if not note:
@@ -84,17 +95,52 @@ def delete_note(
     db.commit()
     return None
 
-@router.get("/", response_model=List[NoteSchema])
+@router.get("/", response_model=Union[NotePage, NoteBatch])
 def get_notes(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    task_ids: Optional[str] = Query(None, description="Comma-separated task ids to fetch notes for in one call"),
+    per_task: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Latest N notes per task with task_ids"),
+    db: Session = Depends(get_read_db),
+    current_user: TokenData = Depends(get_current_principal)
 ):
     """
-    Get all notes for the current user.
-    Admin users can see all notes.
-    Regular users can only see their own notes.
+    Without `task_ids`: the caller's notes one page at a time, newest first
+    (every note for admins). Pass `next_cursor` back as `cursor` for the next page.
+    With `task_ids`: the notes of all those tasks grouped by task id, with
+    access to every task checked in one query; `per_task` keeps the latest N.
+    Responses carry an ETag; send it back in If-None-Match to get a 304 while
+    no note in scope has changed.
     """
-    if current_user.role == "admin":
-        return db.query(Note).all()
+    if task_ids is not None:
+        ids = parse_ids(task_ids, MAX_PAGE_SIZE)
+        require_task_access(db.execute(task_owners_statement(ids)).all(), ids, current_user)
+        criteria = [Note.task_id.in_(ids)]
     else:
-        return db.query(Note).filter(Note.user_id == current_user.id).all() 
\ No newline at end of file
+        criteria = []
+        if current_user.role != UserRole.admin:
+            criteria.append(Note.user_id == current_user.id)
+        if cursor is not None:
+            criteria.append(notes_after(cursor))
+
+    # Tagged from an aggregate over the notes in scope, before any is loaded
+    notes_etag = etag.collection_etag(request, current_user, *db.execute(etag.note_versions_statement(*criteria)).one())
+    not_modified = etag.not_modified(request, notes_etag)
+    if not_modified is not None:
+        return not_modified
+    etag.tag(response, notes_etag)
+
+    if task_ids is not None:
+        grouped = {task_id: [] for task_id in ids}
+        for note in db.scalars(notes_for_tasks(ids, per_task)):
+            grouped[note.task_id].append(note)
+        return {"notes": grouped}
+
+    notes = db.query(Note).filter(*criteria).order_by(*note_order()).limit(limit + 1).all()
+    next_cursor = None
+    if len(notes) > limit:
+        notes = notes[:limit]
+        next_cursor = note_cursor_for(notes[-1])
+    return {"items": notes, "next_cursor": next_cursor}
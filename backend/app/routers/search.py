@@ -0,0 +1,113 @@
+from enum import Enum
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import case, func, literal, literal_column, or_, select
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from .. import schemas, models, auth
+from ..database import get_read_db
+from ..models import UserRole
+from ..queries import member_task_ids
+
+router = APIRouter(
+    tags=["search"],
+    include_in_schema=True
+)
+
+# Must match the configuration used by the generated search_vector columns
+SEARCH_CONFIG = "english"
+SNIPPET_LENGTH = 200
+
+# search_vector is a Postgres-only generated column, so it isn't mapped on the models
+TASK_VECTOR = literal_column("tasks.search_vector")
+NOTE_VECTOR = literal_column("notes.search_vector")
+
+class SearchType(str, Enum):
+    tasks = "tasks"
+    notes = "notes"
+
+def _snippet(text: Optional[str]) -> Optional[str]:
+    if text is None or len(text) <= SNIPPET_LENGTH:
+        return text
+    return text[:SNIPPET_LENGTH].rstrip() + "…"
+
+def _task_search(q: str, postgres: bool):
+    if postgres:
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        rank = func.ts_rank_cd(TASK_VECTOR, tsquery)
+        match = TASK_VECTOR.op("@@")(tsquery)
+    else:
+        # LIKE fallback for SQLite test runs: title hits outrank description hits
+        in_title = func.lower(models.Task.title).contains(q.lower(), autoescape=True)
+        in_description = func.lower(models.Task.description).contains(q.lower(), autoescape=True)
+        rank = case((in_title, 1.0), else_=0.5)
+        match = or_(in_title, in_description)
+    return select(
+        literal("task").label("type"),
+        models.Task.id.label("id"),
+        models.Task.id.label("task_id"),
+        models.Task.title.label("title"),
+        models.Task.description.label("text"),
+        rank.label("rank")
+    ).where(match), rank
+
+def _note_search(q: str, postgres: bool):
+    if postgres:
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        rank = func.ts_rank_cd(NOTE_VECTOR, tsquery)
+        match = NOTE_VECTOR.op("@@")(tsquery)
+    else:
+        rank = literal(0.5)
+        match = func.lower(models.Note.content).contains(q.lower(), autoescape=True)
+    return select(
+        literal("note").label("type"),
+        models.Note.id.label("id"),
+        models.Note.task_id.label("task_id"),
+        models.Task.title.label("title"),
+        models.Note.content.label("text"),
+        rank.label("rank")
+    ).join(models.Task, models.Task.id == models.Note.task_id).where(match), rank
+
+@router.get("", response_model=schemas.SearchResponse)
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    types: List[SearchType] = Query(list(SearchType)),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: schemas.TokenData = Depends(auth.get_current_principal),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Ranked full-text search over task titles and descriptions and note contents.
+    Uses the GIN-indexed tsvector columns on Postgres and a LIKE scan elsewhere.
+    Non-admins only see tasks they created or are assigned to, and notes on those tasks.
+    """
+    postgres = db.get_bind().dialect.name == "postgresql"
+    scope = None
+    if current_user.role != UserRole.admin:
+        scope = member_task_ids(current_user.id)
+
+    results = []
+    searches = []
+    if SearchType.tasks in types:
+        searches.append((_task_search(q, postgres), models.Task.id))
+    if SearchType.notes in types:
+        searches.append((_note_search(q, postgres), models.Note.task_id))
+    for (stmt, rank), task_column in searches:
+        if scope is not None:
+            stmt = stmt.where(task_column.in_(scope))
+        stmt = stmt.order_by(rank.desc()).limit(limit)
+        results.extend(db.execute(stmt))
+
+    results.sort(key=lambda row: row.rank, reverse=True)
+    return {
+        "results": [
+            {
+                "type": row.type,
+                "id": row.id,
+                "task_id": row.task_id,
+                "title": row.title,
+                "snippet": _snippet(row.text),
+                "rank": float(row.rank)
+            }
+            for row in results[:limit]
+        ]
+    }
@@ -1,9 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import logging
+from collections import Counter, defaultdict
+from enum import Enum
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.orm import Session
-from typing import List
-from .. import schemas, models, auth
-from ..database import get_db
+from typing import List, Optional
+from .. import schemas, models, archive, auth, etag, events, jobs, serializers, stats
+from ..database import get_db, get_read_db
 from ..models import UserRole
+from ..pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ..queries import (
+    TaskFieldParams, TaskFilterParams, TaskSort, split_page, task_count_statement, task_detail_statement, task_scope, visible_to
+)
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     tags=["tasks"],
@@ -13,10 +24,9 @@ router = APIRouter(
 @router.post("", response_model=schemas.TaskResponse)
 def create_task(
     task: schemas.TaskCreate,
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: schemas.TokenData = Depends(auth.get_current_principal),
     db: Session = Depends(get_db)
 ):
-    print(f"Creating task with data: {task.dict()}")  # Debug log
     db_task = models.Task(
         **task.dict(),
         created_by=current_user.id
@@ -24,75 +34,355 @@ def create_task(
     db.add(db_task)
     db.commit()
     db.refresh(db_task)
-    print(f"Created task: {db_task.__dict__}")  # Debug log
+    logger.debug("Task created", extra={"task_id": db_task.id, "user_id": current_user.id})
     return db_task
 
-@router.get("", response_model=List[schemas.TaskResponse])
+@router.get("", response_model=schemas.TaskListPage, response_class=ORJSONResponse)
 def read_tasks(
-    skip: int = 0,
-    limit: int = 100,
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    include_archived: bool = False,
+    sort: str = "-created_at",
     member_id: int = None,  # Optional filter for admin to view specific member's tasks
-    current_user: models.User = Depends(auth.get_current_user),
-    db: Session = Depends(get_db)
+    filters: TaskFilterParams = Depends(),
+    shape: TaskFieldParams = Depends(),
+    current_user: schemas.TokenData = Depends(auth.get_current_principal),
+    db: Session = Depends(get_read_db)
 ):
+    """
+    List tasks one page at a time, newest first unless `sort` says otherwise.
+    `sort` is one of created_at, due_date or title, prefixed with `-` for
+    descending order. Pass the returned `next_cursor` back as `cursor` to fetch
+    the following page; it is null on the last page. `include_total` adds a
+    count of all matching tasks. Archived tasks are left out unless
+    `include_archived` is set.
+    Creators and assignees are listed once in `included_users`; use `fields`
+    and `include` to trim the columns and users returned.
+    Responses carry an ETag; send it back in If-None-Match to get a 304 while
+    no matching task from `cursor` on has changed.
+    """
     try:
-        print(f"Current user role: {current_user.role}")  # Debug log
-        print(f"Current user id: {current_user.id}")  # Debug log
-        
-        # Start with base query
-        query = db.query(models.Task)
+        task_sort = TaskSort(sort)
+        # Start with base query; the sort key is selected to build the next cursor
+        query = select(*shape.columns("id", "updated_at", task_sort.name))
         
         # Admin users can see all tasks or filter by member
         if current_user.role == UserRole.admin:
-            print("User is admin, checking for member filter")  # Debug log
             if member_id is not None:
                 # Verify the member exists
                 member = db.query(models.User).filter(models.User.id == member_id).first()
                 if not member:
                     raise HTTPException(status_code=404, detail="Member not found")
-                print(f"Filtering tasks for member: {member.name}")  # Debug log
-                query = query.filter(
-                    (models.Task.created_by == member_id) |
-                    (models.Task.assigned_to == member_id)
-                )
-            tasks = query.all()
-            print(f"Found {len(tasks)} tasks")  # Debug log
-            return tasks
+                query = query.filter(visible_to(member_id))
         else:
-            print("User is not admin, filtering tasks")  # Debug log
             # Regular users can only see tasks they created or are assigned to
-            tasks = query.filter(
-                (models.Task.created_by == current_user.id) |
-                (models.Task.assigned_to == current_user.id)
-            ).all()
-            print(f"Found {len(tasks)} tasks for user")  # Debug log
-            return tasks
+            query = query.filter(visible_to(current_user.id))
+
+        query = filters.apply(query)
+        total = None
+        if include_total:
+            total = db.scalar(archive.including_archived(task_count_statement(query), include_archived))
+
+        if cursor is not None:
+            query = query.filter(task_sort.after(cursor))
+
+        # Tagged from an aggregate over the tasks from the cursor on, before
+        # any row is loaded, so a 304 skips the page and user queries
+        versions = db.execute(archive.including_archived(
+            etag.task_versions_statement(query, bool(shape.include)), include_archived
+        )).one()
+        page_etag = etag.collection_etag(request, current_user, total, *versions)
+        not_modified = etag.not_modified(request, page_etag)
+        if not_modified is not None:
+            return not_modified
+
+        # Fetch one extra row to learn whether another page exists
+        page = query.order_by(*task_sort.order_by()).limit(limit + 1)
+        rows = db.execute(archive.including_archived(page, include_archived)).all()
+        rows, next_cursor = split_page(rows, limit, task_sort)
+
+        user_ids = serializers.referenced_user_ids(rows, shape.include)
+        users = db.execute(serializers.users_statement(user_ids)).all() if user_ids else []
+        return etag.tag(serializers.task_page_response(
+            serializers.task_dicts(rows, shape.fields),
+            serializers.user_dicts(users),
+            next_cursor,
+            total
+        ), page_etag)
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Error in read_tasks: {str(e)}")  # Debug log
+        logger.exception("Error in read_tasks")
         raise HTTPException(
             status_code=500,
             detail=f"Internal server error: {str(e)}"
         )
 
+MAX_BULK_ITEMS = 1000
+
+def _check_bulk_size(items: list):
+    if len(items) > MAX_BULK_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {MAX_BULK_ITEMS} items per request"
+        )
+
+def _column_values(data: dict) -> dict:
+    # Task.status and Task.priority are plain string columns
+    return {key: value.value if isinstance(value, Enum) else value for key, value in data.items()}
+
+def _existing_user_ids(db: Session, user_ids: set) -> set:
+    if not user_ids:
+        return set()
+    return set(db.scalars(select(models.User.id).where(models.User.id.in_(user_ids), models.User.deleted_at.is_(None))))
+
+def _task_rows(db: Session, task_ids: set) -> dict:
+    """
+    Map task id -> row of (created_by, assigned_to, status, priority) for every
+    existing task in one query. Enough for permission checks and stats upkeep.
+    """
+    if not task_ids:
+        return {}
+    rows = db.execute(
+        select(
+            models.Task.id,
+            models.Task.created_by,
+            models.Task.assigned_to,
+            models.Task.status,
+            models.Task.priority
+        ).where(models.Task.id.in_(task_ids))
+    )
+    return {row.id: row._asdict() for row in rows}
+
+@router.post("/bulk", response_model=schemas.BulkResult)
+def bulk_create_tasks(
+    tasks: List[schemas.TaskCreate],
+    current_user: schemas.TokenData = Depends(auth.get_current_principal),
+    db: Session = Depends(get_db)
+):
+    """
+    Create many tasks in one transaction. Items assigned to unknown users are
+    reported as errors; the rest are inserted with a single multi-row INSERT.
+    """
+    _check_bulk_size(tasks)
+    known_users = _existing_user_ids(db, {t.assigned_to for t in tasks if t.assigned_to is not None})
+
+    results = [None] * len(tasks)
+    rows, row_indexes = [], []
+    for index, task in enumerate(tasks):
+        if task.assigned_to is not None and task.assigned_to not in known_users:
+            results[index] = schemas.BulkItemResult(index=index, status="error", detail="Assignee not found")
+            continue
+        rows.append(_column_values({**task.dict(), "created_by": current_user.id}))
+        row_indexes.append(index)
+
+    if rows:
+        deltas = Counter()
+        for row in rows:
+            stats.count_task(deltas, row, 1)
+        stats.apply_deltas(db, deltas)
+        new_ids = db.scalars(
+            insert(models.Task).returning(models.Task.id, sort_by_parameter_order=True),
+            rows
+        ).all()
+        for index, task_id in zip(row_indexes, new_ids):
+            results[index] = schemas.BulkItemResult(index=index, id=task_id, status="created")
+        events.publish(db, [
+            events.task_event("created", task_id, (row["created_by"], row["assigned_to"]))
+            for row, task_id in zip(rows, new_ids)
+        ])
+    db.commit()
+    return {"results": results}
+
+@router.put("/bulk", response_model=schemas.BulkResult)
+def bulk_update_tasks(
+    updates: List[schemas.TaskBulkUpdate],
+    current_user: schemas.TokenData = Depends(auth.get_current_principal),
+    db: Session = Depends(get_db)
+):
+    """
+    Update many tasks in one transaction. Items that set the same fields to the
+    same values share one `UPDATE ... WHERE id IN (...)`, so reassigning a batch
+    of tasks to one user is a single statement.
+    """
+    _check_bulk_size(updates)
+    existing = _task_rows(db, {u.id for u in updates})
+    known_users = _existing_user_ids(db, {u.assigned_to for u in updates if u.assigned_to is not None})
+    is_admin = current_user.role == UserRole.admin
+
+    results = [None] * len(updates)
+    groups = defaultdict(list)  # frozen change set -> [(index, task id)]
+    seen = set()
+    for index, item in enumerate(updates):
+        changes = _column_values(item.dict(exclude_unset=True, exclude={"id"}))
+        error = None
+        if item.id in seen:
+            error = "Duplicate task id in request"
+        elif item.id not in existing:
+            error = "Task not found"
+        elif not is_admin and current_user.id not in (existing[item.id]["created_by"], existing[item.id]["assigned_to"]):
+            error = "Not authorized to update this task"
+        elif changes.get("assigned_to") is not None and changes["assigned_to"] not in known_users:
+            error = "Assignee not found"
+        seen.add(item.id)
+        if error:
+            results[index] = schemas.BulkItemResult(index=index, id=item.id, status="error", detail=error)
+        elif not changes:
+            results[index] = schemas.BulkItemResult(index=index, id=item.id, status="updated")
+        else:
+            groups[frozenset(changes.items())].append((index, item.id))
+
+    deltas = Counter()
+    task_events = []
+    for change_set, members in groups.items():
+        for _, task_id in members:
+            stats.count_task(deltas, existing[task_id], -1)
+            stats.count_task(deltas, {**existing[task_id], **dict(change_set)}, 1)
+            # Previous and new assignee both hear about a reassignment
+            audience = (existing[task_id]["created_by"], existing[task_id]["assigned_to"], dict(change_set).get("assigned_to"))
+            task_events.append(events.task_event("updated", task_id, audience))
+        db.execute(
+            update(models.Task)
+            .where(models.Task.id.in_([task_id for _, task_id in members]))
+            .values(**dict(change_set))
+            .execution_options(synchronize_session=False)
+        )
+        for index, task_id in members:
+            results[index] = schemas.BulkItemResult(index=index, id=task_id, status="updated")
+    stats.apply_deltas(db, deltas)
+    events.publish(db, task_events)
+    db.commit()
+    return {"results": results}
+
+@router.delete("/bulk", response_model=schemas.BulkResult)
+def bulk_delete_tasks(
+    request: schemas.TaskBulkDelete,
+    current_user: schemas.TokenData = Depends(auth.get_current_principal),
+    db: Session = Depends(get_db)
+):
+    """
+    Delete many tasks with one DELETE. Their notes go with them through the
+    ON DELETE CASCADE foreign key.
+    """
+    _check_bulk_size(request.ids)
+    existing = _task_rows(db, set(request.ids))
+    is_admin = current_user.role == UserRole.admin
+
+    results, deletable, seen = [], [], set()
+    for index, task_id in enumerate(request.ids):
+        error = None
+        if task_id in seen:
+            error = "Duplicate task id in request"
+        elif task_id not in existing:
+            error = "Task not found"
+        elif not is_admin and existing[task_id]["created_by"] != current_user.id:
+            error = "Not authorized to delete this task"
+        seen.add(task_id)
+        if error:
+            results.append(schemas.BulkItemResult(index=index, id=task_id, status="error", detail=error))
+        else:
+            deletable.append(task_id)
+            results.append(schemas.BulkItemResult(index=index, id=task_id, status="deleted"))
+
+    if deletable:
+        deltas = Counter()
+        for task_id in deletable:
+            stats.count_task(deltas, existing[task_id], -1)
+        stats.apply_deltas(db, deltas)
+        db.execute(
+            delete(models.Task)
+            .where(models.Task.id.in_(deletable))
+            .execution_options(synchronize_session=False)
+        )
+        events.publish(db, [
+            events.task_event("deleted", task_id, (existing[task_id]["created_by"], existing[task_id]["assigned_to"]))
+            for task_id in deletable
+        ])
+    db.commit()
+    return {"results": results}
+
+@router.post("/reassign", response_model=schemas.Job, status_code=202)
+def reassign_tasks(
+    body: schemas.TaskReassign,
+    response: Response,
+    current_user: schemas.TokenData = Depends(auth.get_current_active_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Move every task assigned to `from_user` to `to_user` (or unassign them) in a
+    background job, batch by batch. Poll GET /api/jobs/{id}.
+    """
+    if not _existing_user_ids(db, {body.from_user}):
+        raise HTTPException(status_code=404, detail="User not found")
+    if body.to_user is not None and (body.to_user == body.from_user or not _existing_user_ids(db, {body.to_user})):
+        raise HTTPException(status_code=400, detail="Cannot reassign to this user")
+    job = jobs.enqueue(db, "reassign_tasks", body.dict(), created_by=current_user.id)
+    db.commit()
+    response.headers["Location"] = f"/api/jobs/{job.id}"
+    return job
+
+@router.post("/archive", response_model=schemas.Job, status_code=202)
+def archive_tasks(
+    response: Response,
+    older_than_days: int = Query(archive.ARCHIVE_AFTER_DAYS, ge=0),
+    current_user: schemas.TokenData = Depends(auth.get_current_active_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Run the archiver (archive_tasks.py) as a background job.
+    """
+    job = jobs.enqueue(db, "archive", {"older_than_days": older_than_days}, created_by=current_user.id)
+    db.commit()
+    response.headers["Location"] = f"/api/jobs/{job.id}"
+    return job
+
+@router.get("/stats", response_model=schemas.TaskStats)
+def read_task_stats(
+    member_id: Optional[int] = None,
+    current_user: schemas.TokenData = Depends(auth.get_current_principal),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Dashboard counts by status, priority and assignee plus the overdue count.
+    Admins get every task, or one member's with `member_id`; other users get
+    the tasks they created or are assigned to. Every status and priority is
+    listed, with zero counts included. Archived tasks are counted, as with
+    include_archived=true on GET /api/tasks.
+    """
+    if current_user.role == UserRole.admin:
+        user_id = member_id
+    else:
+        user_id = current_user.id
+    result = stats.summary_stats(db, user_id)
+    result["overdue"] = stats.overdue_count(db, task_scope(current_user, member_id))
+    return result
+
 @router.get("/{task_id}", response_model=schemas.TaskResponse)
 def read_task(
     task_id: int,
-    current_user: models.User = Depends(auth.get_current_user),
+    shape: TaskFieldParams = Depends(),
+    current_user: schemas.TokenData = Depends(auth.get_current_principal),
     db: Session = Depends(get_db)
 ):
-    task = db.query(models.Task).filter(models.Task.id == task_id).first()
+    """
+    Get one task with its creator and assignee nested in.
+    `fields` and `include` trim the columns and users returned.
+    """
+    task = db.scalars(task_detail_statement(task_id, shape)).first()
     if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
     # Admin users can access any task
     if current_user.role != UserRole.admin and task.created_by != current_user.id and task.assigned_to != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to access this task")
-    return task
+    return ORJSONResponse(serializers.task_detail(task, shape.fields, shape.include))
 
 @router.put("/{task_id}", response_model=schemas.TaskResponse)
 def update_task(
     task_id: int,
     task_update: schemas.TaskUpdate,
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: schemas.TokenData = Depends(auth.get_current_principal),
     db: Session = Depends(get_db)
 ):
     db_task = db.query(models.Task).filter(models.Task.id == task_id).first()
@@ -114,7 +404,7 @@ def update_task(
 @router.delete("/{task_id}")
 def delete_task(
     task_id: int,
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: schemas.TokenData = Depends(auth.get_current_principal),
     db: Session = Depends(get_db)
 ):
     db_task = db.query(models.Task).filter(models.Task.id == task_id).first()
@@ -1,41 +1,63 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import logging
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from typing import List
-from .. import schemas, models, auth
-from ..database import get_db
+from typing import Optional
+from .. import schemas, models, auth, etag, ratelimit, serializers, stats, user_deletion
+from ..database import get_db, get_read_db
 from ..models import UserRole
+from ..pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ..queries import user_page_statement
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     tags=["users"],
     include_in_schema=True
 )
 
-@router.get("", response_model=List[schemas.User])
+@router.get("", response_model=schemas.UserPage, response_class=ORJSONResponse)
 def get_users(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.get_current_user)
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_workload: bool = False,
+    db: Session = Depends(get_read_db),
+    current_user: schemas.TokenData = Depends(auth.get_current_principal)
 ):
     """
-    Get all users. Only accessible by admin users.
+    Users one page at a time in id order. Only accessible by admin users.
+    Pass `next_cursor` back as `cursor` for the next page. With
+    `include_workload` each user carries open, in-progress and overdue task
+    counts, all computed in one aggregate query for the page.
+    Answers If-None-Match with 304 while nothing on the page could have changed.
     """
-    print(f"Current user role: {current_user.role}")  # Debug log
-    print(f"Admin role: {UserRole.admin}")  # Debug log
-    print(f"Role comparison: {current_user.role == UserRole.admin}")  # Debug log
-    
     if str(current_user.role) != str(UserRole.admin):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to access this resource"
         )
     
-    users = db.query(models.User).all()
-    return users
+    versions = db.execute(etag.user_versions_statement(include_tasks=include_workload)).one()
+    # Overdue counts move with the date
+    users_etag = etag.collection_etag(request, current_user, *versions, date.today() if include_workload else None)
+    not_modified = etag.not_modified(request, users_etag)
+    if not_modified is not None:
+        return not_modified
+    rows = db.execute(user_page_statement(limit, cursor)).all()
+    workloads = None
+    if include_workload:
+        workloads = stats.workload_map(db.execute(stats.workload_statement(row.id for row in rows[:limit])))
+    return etag.tag(serializers.user_page_response(rows, limit, workloads), users_etag)
 
 @router.post("/", response_model=schemas.User)
 def create_user(
+    request: Request,
     user: schemas.UserCreate,
     db: Session = Depends(get_db)
 ):
+    ratelimit.enforce(ratelimit.password_buckets(request))
     # Check if email already exists
     db_user = db.query(models.User).filter(models.User.email == user.email).first()
     if db_user:
@@ -49,10 +71,10 @@ def create_user(
         role=user.role or UserRole.member,  # Ensure role is set
         hashed_password=hashed_password
     )
-    print(f"Creating user with role: {db_user.role}")  # Debug log
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
+    logger.info("User created", extra={"user_id": db_user.id, "role": db_user.role.value})
     return db_user
 
 @router.get("/me", response_model=schemas.User)
@@ -60,49 +82,95 @@ def read_user_me(current_user: models.User = Depends(auth.get_current_user)):
     """
     Get current user information.
     """
-    print(f"Fetching current user: {current_user.email}")  # Debug log
     return current_user
 
 @router.put("/me", response_model=schemas.User)
 def update_user(
     user_update: schemas.UserUpdate,
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: schemas.TokenData = Depends(auth.get_current_principal),
     db: Session = Depends(get_db)
 ):
-    for key, value in user_update.dict(exclude_unset=True).items():
-        setattr(current_user, key, value)
+    db_user = db.get(models.User, current_user.id)
+    if db_user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    changes = user_update.dict(exclude_unset=True)
+    for key, value in changes.items():
+        setattr(db_user, key, value)
+    if "role" in changes:
+        # Outstanding tokens still carry the old role
+        auth.revoke_user_tokens(db, db_user)
     
     db.commit()
-    db.refresh(current_user)
-    return current_user
+    auth.invalidate_user(db_user.id)
+    db.refresh(db_user)
+    return db_user
 
 @router.put("/me/password")
 def update_password(
+    request: Request,
     password_update: schemas.PasswordUpdate,
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: schemas.TokenData = Depends(auth.get_current_principal),
     db: Session = Depends(get_db)
 ):
-    current_user.hashed_password = auth.get_password_hash(password_update.new_password)
+    """
+    Change the caller's password. Tokens issued before the change stop working,
+    so a fresh access token is returned.
+    """
+    ratelimit.enforce(ratelimit.password_buckets(request, current_user.id))
+    db_user = db.get(models.User, current_user.id)
+    if db_user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    db_user.hashed_password = auth.get_password_hash(password_update.new_password)
+    auth.revoke_user_tokens(db, db_user)
     db.commit()
-    return {"message": "Password updated successfully"}
+    auth.invalidate_user(db_user.id)
+    return {
+        "message": "Password updated successfully",
+        "access_token": auth.create_user_token(db_user),
+        "refresh_token": auth.create_refresh_token(db_user),
+        "token_type": "bearer"
+    }
+
+@router.get("/deletions/{deletion_id}", response_model=schemas.UserDeletion)
+def read_user_deletion(
+    deletion_id: int,
+    current_user: schemas.TokenData = Depends(auth.get_current_active_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Progress of a deletion started by DELETE /api/users/{id}.
+    """
+    deletion = db.get(models.UserDeletion, deletion_id)
+    if deletion is None:
+        raise HTTPException(status_code=404, detail="Deletion not found")
+    return deletion
 
 @router.get("/{user_id}", response_model=schemas.User)
 def read_user(
     user_id: int,
-    current_user: models.User = Depends(auth.get_current_active_admin),
+    current_user: schemas.TokenData = Depends(auth.get_current_active_admin),
     db: Session = Depends(get_db)
 ):
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
+    db_user = db.query(models.User).filter(models.User.id == user_id, models.User.deleted_at.is_(None)).first()
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
     return db_user
 
-@router.delete("/{user_id}")
+@router.delete("/{user_id}", response_model=schemas.UserDeletion, status_code=202)
 def delete_user(
     user_id: int,
-    current_user: models.User = Depends(auth.get_current_user),
+    response: Response,
+    reassign_to: Optional[int] = None,
+    current_user: schemas.TokenData = Depends(auth.get_current_principal),
     db: Session = Depends(get_db)
 ):
+    """
+    Soft-delete a user at once and return 202 with the deletion's progress.
+    A delete_user job moves their tasks to `reassign_to` (or clears that
+    creator/assignee) and clears the author of their notes, batch by batch,
+    then removes the user row. Poll GET /api/users/deletions/{id}; deleting
+    the user again resumes a failed deletion.
+    """
     # Only admin users can delete other users
     if str(current_user.role) != str(UserRole.admin):
         raise HTTPException(
@@ -117,49 +185,68 @@ def delete_user(
             detail="Cannot delete your own account"
         )
     
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
+    db_user = db.get(models.User, user_id)
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
+    if reassign_to is not None:
+        target = db.get(models.User, reassign_to)
+        if target is None or target.deleted_at is not None or reassign_to == user_id:
+            raise HTTPException(status_code=400, detail="Cannot reassign to this user")
     
-    db.delete(db_user)
+    auth.revoke_user_tokens(db, db_user)
+    deletion = user_deletion.start(db, db_user, reassign_to)
+    db.flush()
+    user_deletion.queue(db, deletion, created_by=current_user.id)
     db.commit()
-    return {"message": "User deleted successfully"} 
+    auth.invalidate_user(user_id)
+    response.headers["Location"] = f"/api/users/deletions/{deletion.id}"
+    return deletion
 
 @router.put("/{user_id}", response_model=schemas.User)
 def update_user_by_id(
     user_id: int,
     user_update: schemas.UserUpdate,
-    current_user: models.User = Depends(auth.get_current_active_admin),
+    current_user: schemas.TokenData = Depends(auth.get_current_active_admin),
     db: Session = Depends(get_db)
 ):
     """
     Update a user by ID. Only accessible by admin users.
     """
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
+    db_user = db.query(models.User).filter(models.User.id == user_id, models.User.deleted_at.is_(None)).first()
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
     
     # Update user fields
-    for key, value in user_update.dict(exclude_unset=True).items():
+    changes = user_update.dict(exclude_unset=True)
+    for key, value in changes.items():
         setattr(db_user, key, value)
+    if "role" in changes:
+        # Outstanding tokens still carry the old role
+        auth.revoke_user_tokens(db, db_user)
     
     db.commit()
+    auth.invalidate_user(db_user.id)
     db.refresh(db_user)
     return db_user
 
 @router.put("/{user_id}/password")
 def admin_update_user_password(
+    request: Request,
     user_id: int,
     password_update: schemas.PasswordUpdate,
-    current_user: models.User = Depends(auth.get_current_active_admin),
+    current_user: schemas.TokenData = Depends(auth.get_current_active_admin),
     db: Session = Depends(get_db)
 ):
     """
-    Admin can update any user's password.
+    Admin can update any user's password. Rate limited per target user, so
+    one account can't be hit more often by changing it through several admins.
     """
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
+    ratelimit.enforce(ratelimit.password_buckets(request, user_id))
+    db_user = db.query(models.User).filter(models.User.id == user_id, models.User.deleted_at.is_(None)).first()
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
     db_user.hashed_password = auth.get_password_hash(password_update.new_password)
+    auth.revoke_user_tokens(db, db_user)
     db.commit()
+    auth.invalidate_user(db_user.id)
     return {"message": f"Password updated successfully for user {db_user.email}"} 
\ No newline at end of file
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr
 from datetime import datetime, date
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from .models import UserRole, TaskStatus, Priority
 
 class UserBase(BaseModel):
@@ -25,6 +25,7 @@ class User(BaseModel):
     name: str
     role: str  # Changed to str to match the serialized value
     created_at: datetime
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -32,6 +33,18 @@ class User(BaseModel):
             datetime: lambda v: v.isoformat()
         }
 
+class UserWorkload(BaseModel):
+    open: int  # pending or in progress
+    in_progress: int
+    overdue: int  # open and past their due date
+
+class UserListItem(User):
+    workload: Optional[UserWorkload] = None  # with include_workload=true
+
+class UserPage(BaseModel):
+    items: List[UserListItem]
+    next_cursor: Optional[str] = None
+
 class TaskBase(BaseModel):
     title: str
     description: Optional[str] = None
@@ -73,6 +86,17 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     email: Optional[str] = None
+    id: Optional[int] = None
+    role: Optional[UserRole] = None
+    token_version: Optional[int] = None
+    jti: Optional[str] = None
+    expires_at: Optional[int] = None
+
+    def is_complete(self) -> bool:
+        """
+        Whether the claims alone are enough to authorize a request.
+        """
+        return self.id is not None and self.role is not None and self.token_version is not None
 
 class NoteBase(BaseModel):
     content: str
@@ -85,11 +109,18 @@ class Note(NoteBase):
     created_at: datetime
     updated_at: datetime
     task_id: int
-    user_id: int
+    user_id: Optional[int] = None  # None once the author has been deleted
 
     class Config:
         from_attributes = True
 
+class NotePage(BaseModel):
+    items: List[Note]
+    next_cursor: Optional[str] = None
+
+class NoteBatch(BaseModel):
+    notes: Dict[int, List[Note]]  # task id -> notes, newest first
+
 class TaskResponse(BaseModel):
     id: int
     title: str
@@ -100,6 +131,7 @@ class TaskResponse(BaseModel):
     created_by: Optional[int] = None
     assigned_to: Optional[int] = None
     created_at: datetime
+    updated_at: Optional[datetime] = None
     assignee: Optional[User] = None
     creator: Optional[User] = None
 
@@ -110,12 +142,69 @@ class TaskResponse(BaseModel):
             date: lambda v: v.isoformat()
         }
 
+class TaskBulkUpdate(TaskUpdate):
+    id: int
+
+class TaskBulkDelete(BaseModel):
+    ids: List[int]
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    status: str  # created, updated, deleted or error
+    detail: Optional[str] = None
+
+class BulkResult(BaseModel):
+    results: List[BulkItemResult]
+
+class AssigneeStats(BaseModel):
+    user_id: Optional[int] = None  # None for unassigned tasks
+    total: int
+    by_status: Dict[str, int]
+
+class TaskStats(BaseModel):
+    total: int
+    overdue: int
+    by_status: Dict[str, int]
+    by_priority: Dict[str, int]
+    by_assignee: List[AssigneeStats]
+
+class TaskListItem(BaseModel):
+    id: int
+    title: str
+    description: Optional[str] = None
+    status: TaskStatus
+    priority: Priority
+    due_date: Optional[date] = None
+    created_by: Optional[int] = None
+    assigned_to: Optional[int] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+class TaskListPage(BaseModel):
+    items: List[TaskListItem]
+    included_users: List[User]  # creators and assignees referenced by items
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+class SearchResult(BaseModel):
+    type: str  # task or note
+    id: int
+    task_id: int
+    title: Optional[str] = None
+    snippet: Optional[str] = None
+    rank: float
+
+class SearchResponse(BaseModel):
+    results: List[SearchResult]
+
 class LoginCredentials(BaseModel):
     email: EmailStr
     password: str
 
 class TokenResponse(BaseModel):
     access_token: str
+    refresh_token: Optional[str] = None
     token_type: str
     user: User
 
@@ -123,4 +212,51 @@ class TokenResponse(BaseModel):
         from_attributes = True
         json_encoders = {
             datetime: lambda v: v.isoformat()
-        } 
\ No newline at end of file
+        }
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
+
+class TokenPair(BaseModel):
+    access_token: str
+    refresh_token: str
+    token_type: str
+
+class UserDeletion(BaseModel):
+    id: int
+    user_id: int
+    reassign_to: Optional[int] = None
+    status: str
+    tasks_reassigned: int
+    notes_detached: int
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class Job(BaseModel):
+    id: int
+    kind: str
+    status: str
+    attempts: int
+    max_attempts: int
+    progress: int
+    total: Optional[int] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class TaskReassign(BaseModel):
+    from_user: int
+    to_user: Optional[int] = None  # None leaves the tasks unassigned
+    include_archived: bool = False
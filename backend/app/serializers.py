@@ -0,0 +1,102 @@
+from typing import Iterable, List, Optional, Sequence
+
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
+
+from . import models, stats
+from .pagination import encode_cursor
+
+# Task columns clients may ask for with `fields=`, in output order.
+# Rows are turned into dicts directly, skipping ORM objects and per-row
+# pydantic validation.
+TASK_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "status",
+    "priority",
+    "due_date",
+    "created_by",
+    "assigned_to",
+    "created_at",
+    "updated_at",
+)
+
+# Related users clients may ask for with `include=`, and the column holding each id
+TASK_RELATIONS = {
+    "creator": "created_by",
+    "assignee": "assigned_to",
+}
+
+USER_COLUMNS = (
+    models.User.id,
+    models.User.email,
+    models.User.name,
+    models.User.role,
+    models.User.created_at,
+    models.User.updated_at,
+)
+USER_FIELDS = tuple(column.key for column in USER_COLUMNS)
+
+def task_dicts(rows: Iterable, fields: Sequence[str] = TASK_FIELDS) -> List[dict]:
+    return [{field: getattr(row, field) for field in fields} for row in rows]
+
+def referenced_user_ids(rows: Iterable, include: Iterable[str] = TASK_RELATIONS) -> set:
+    """
+    Ids of the related users (creators and/or assignees) of a page of task rows.
+    """
+    keys = [TASK_RELATIONS[relation] for relation in include]
+    ids = set()
+    for row in rows:
+        for key in keys:
+            ids.add(getattr(row, key))
+    ids.discard(None)
+    return ids
+
+def users_statement(user_ids: set):
+    return select(*USER_COLUMNS).where(models.User.id.in_(user_ids))
+
+def user_dict(user) -> dict:
+    data = {field: getattr(user, field) for field in USER_FIELDS}
+    data["role"] = getattr(data["role"], "value", data["role"])
+    return data
+
+def user_dicts(rows: Iterable) -> List[dict]:
+    return [user_dict(row) for row in rows]
+
+def task_detail(task: models.Task, fields: Sequence[str], include: Iterable[str]) -> dict:
+    """
+    A single task with the requested columns and related users nested in.
+    """
+    data = {field: getattr(task, field) for field in fields}
+    for relation in include:
+        user: Optional[models.User] = getattr(task, relation)
+        data[relation] = user_dict(user) if user is not None else None
+    return data
+
+def task_page_response(tasks: List[dict], users: List[dict], next_cursor, total) -> ORJSONResponse:
+    """
+    Render a page of tasks. Each creator/assignee is serialized once in
+    `included_users` instead of being nested into every task that references it.
+    """
+    return ORJSONResponse({
+        "items": tasks,
+        "included_users": users,
+        "next_cursor": next_cursor,
+        "total": total,
+    })
+
+def user_page_response(rows: list, limit: int, workloads: Optional[dict] = None) -> ORJSONResponse:
+    """
+    Render a page of users from a `limit + 1` row fetch. With `workloads`
+    (user id -> task counts) each user carries a `workload` object.
+    """
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].id)
+    items = user_dicts(rows)
+    if workloads is not None:
+        for item in items:
+            item["workload"] = workloads.get(item["id"], stats.NO_WORKLOAD)
+    return ORJSONResponse({"items": items, "next_cursor": next_cursor})
@@ -0,0 +1,205 @@
+from collections import Counter
+from datetime import date
+from enum import Enum
+from typing import Iterable, Optional
+
+from sqlalchemy import event, func, or_, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import get_history
+
+from . import models
+from .models import Priority, TaskStatus
+
+# task_summary.user_id for tasks nobody is assigned to
+UNASSIGNED = 0
+OPEN_STATUSES = [s.value for s in TaskStatus if s != TaskStatus.completed]
+NO_WORKLOAD = {"open": 0, "in_progress": 0, "overdue": 0}
+SCOPE_ASSIGNED = "assigned"
+SCOPE_CREATED = "created"
+_KEY_FIELDS = ("created_by", "assigned_to", "status", "priority")
+
+def _value(value):
+    return value.value if isinstance(value, Enum) else value
+
+def summary_keys(created_by: Optional[int], assigned_to: Optional[int], status, priority) -> list:
+    """
+    The task_summary rows a task with these values is counted in.
+    """
+    status, priority = _value(status), _value(priority)
+    keys = [(assigned_to if assigned_to is not None else UNASSIGNED, SCOPE_ASSIGNED, status, priority)]
+    if created_by is not None and created_by != assigned_to:
+        keys.append((created_by, SCOPE_CREATED, status, priority))
+    return keys
+
+def count_task(deltas: Counter, values: dict, sign: int) -> None:
+    """
+    Add (sign=1) or remove (sign=-1) a task, given as a dict of its column values.
+    """
+    for key in summary_keys(*(values.get(field) for field in _KEY_FIELDS)):
+        deltas[key] += sign
+
+def _upsert(dialect_name: str):
+    table = models.TaskSummary.__table__
+    if dialect_name == "postgresql":
+        stmt = postgresql.insert(table)
+    elif dialect_name == "sqlite":
+        stmt = sqlite.insert(table)
+    else:
+        raise NotImplementedError(f"task_summary upsert is not supported on {dialect_name}")
+    return stmt.on_conflict_do_update(
+        index_elements=["user_id", "scope", "status", "priority"],
+        set_={"task_count": table.c.task_count + stmt.excluded.task_count}
+    )
+
+def apply_deltas(db: Session, deltas: Counter) -> None:
+    """
+    Fold count changes into task_summary inside the session's current transaction.
+    """
+    rows = [
+        {"user_id": user_id, "scope": scope, "status": status, "priority": priority, "task_count": delta}
+        # Sorted so concurrent writers lock summary rows in the same order
+        for (user_id, scope, status, priority), delta in sorted(deltas.items())
+        if delta
+    ]
+    if rows:
+        connection = db.connection()
+        connection.execute(_upsert(connection.dialect.name), rows)
+
+def _old_values(task: models.Task) -> dict:
+    values = {}
+    for field in _KEY_FIELDS:
+        history = get_history(task, field)
+        if history.deleted:
+            values[field] = history.deleted[0]
+        elif history.unchanged:
+            values[field] = history.unchanged[0]
+        else:
+            values[field] = getattr(task, field)
+    return values
+
+def _new_values(task: models.Task) -> dict:
+    return {field: getattr(task, field) for field in _KEY_FIELDS}
+
+def _track_task_writes(session: Session, flush_context, instances) -> None:
+    """
+    Keep task_summary in step with ORM writes to tasks, in the same transaction.
+    Bulk statements that bypass the ORM call apply_deltas themselves.
+    """
+    deltas = Counter()
+    for obj in session.new:
+        if isinstance(obj, models.Task):
+            count_task(deltas, _new_values(obj), 1)
+    for obj in session.deleted:
+        if isinstance(obj, models.Task):
+            count_task(deltas, _old_values(obj), -1)
+    for obj in session.dirty:
+        if isinstance(obj, models.Task) and session.is_modified(obj):
+            count_task(deltas, _old_values(obj), -1)
+            count_task(deltas, _new_values(obj), 1)
+    apply_deltas(session, deltas)
+
+def register_listeners() -> None:
+    """
+    Hook _track_task_writes into every Session. Called by models.py, so any
+    code that maps tasks keeps task_summary in step; safe to call again.
+    """
+    if not event.contains(Session, "before_flush", _track_task_writes):
+        event.listen(Session, "before_flush", _track_task_writes)
+
+def _count_map(rows: Iterable, keys: type) -> dict:
+    """
+    Counts for every member of the enum `keys`, zero when no row has it, so
+    the response has the same shape whatever the data.
+    """
+    counts = {member.value: 0 for member in keys}
+    for key, count in rows:
+        counts[key] = counts.get(key, 0) + int(count)
+    return counts
+
+def summary_stats(db: Session, user_id: Optional[int] = None) -> dict:
+    """
+    Counts by status and priority (and by assignee when user_id is None) read
+    from task_summary, so the cost grows with the number of groups, not tasks.
+    With a user_id only that user's visible tasks are counted.
+    Archived tasks stay in task_summary, so the counts match a listing with
+    include_archived=true rather than the default one.
+    """
+    summary = models.TaskSummary
+    if user_id is None:
+        scope = summary.scope == SCOPE_ASSIGNED
+    else:
+        scope = summary.user_id == user_id
+
+    by_status = _count_map(db.execute(
+        select(summary.status, func.sum(summary.task_count)).where(scope).group_by(summary.status)
+    ), TaskStatus)
+    by_priority = _count_map(db.execute(
+        select(summary.priority, func.sum(summary.task_count)).where(scope).group_by(summary.priority)
+    ), Priority)
+    stats = {
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        "by_priority": by_priority,
+        "by_assignee": [],
+    }
+    if user_id is None:
+        by_assignee = {}
+        rows = db.execute(
+            select(summary.user_id, summary.status, func.sum(summary.task_count))
+            .where(scope)
+            .group_by(summary.user_id, summary.status)
+        )
+        for assignee, status, count in rows:
+            entry = by_assignee.setdefault(assignee, {"user_id": assignee or None, "total": 0, "by_status": _count_map((), TaskStatus)})
+            entry["by_status"][status] = int(count)
+            entry["total"] += int(count)
+        stats["by_assignee"] = [entry for entry in by_assignee.values() if entry["total"]]
+    return stats
+
+def overdue_count(db: Session, scope=None, today: Optional[date] = None) -> int:
+    """
+    Open tasks past their due date. Depends on the date, so it is counted live
+    through the (status, due_date) index rather than kept in task_summary.
+    """
+    stmt = select(func.count()).select_from(models.Task).where(
+        models.Task.status.in_(OPEN_STATUSES),
+        models.Task.due_date < (today or date.today())
+    )
+    if scope is not None:
+        stmt = stmt.where(scope)
+    return db.scalar(stmt)
+
+def workload_statement(user_ids: Iterable[int], today: Optional[date] = None):
+    """
+    Open, in-progress and overdue task counts for each of `user_ids` in one
+    GROUP BY over assigned_to and created_by, counting the tasks each user can
+    see. Only open tasks are read, through the (assigned_to|created_by,
+    created_at) indexes; archived tasks are all completed.
+    """
+    task = models.Task
+    user_ids = list(user_ids)
+    is_open = task.status.in_(OPEN_STATUSES)
+    involved = union_all(
+        select(task.assigned_to.label("user_id"), task.status, task.due_date)
+        .where(is_open, task.assigned_to.in_(user_ids)),
+        # Counted once when the creator is also the assignee
+        select(task.created_by.label("user_id"), task.status, task.due_date)
+        .where(is_open, task.created_by.in_(user_ids),
+               or_(task.assigned_to.is_(None), task.assigned_to != task.created_by)),
+    ).subquery()
+    return select(
+        involved.c.user_id,
+        func.count(),
+        func.count().filter(involved.c.status == TaskStatus.in_progress.value),
+        func.count().filter(involved.c.due_date < (today or date.today())),
+    ).group_by(involved.c.user_id)
+
+def workload_map(rows: Iterable) -> dict:
+    """
+    User id -> counts, from the rows of workload_statement.
+    """
+    return {
+        user_id: {"open": int(open_count), "in_progress": int(in_progress), "overdue": int(overdue)}
+        for user_id, open_count, in_progress, overdue in rows
+    }
@@ -0,0 +1,201 @@
+import logging
+import os
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Optional, Sequence
+
+from sqlalchemy import case, delete, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from . import events, jobs, models, stats
+from .database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Tasks or notes moved off a user per transaction
+USER_DELETION_BATCH_SIZE = int(os.getenv("USER_DELETION_BATCH_SIZE", "1000"))
+# Seconds to sleep between batches so regular writes aren't starved
+USER_DELETION_BATCH_PAUSE = float(os.getenv("USER_DELETION_BATCH_PAUSE", "0.05"))
+
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+_TASK_TABLES = (models.Task.__table__, models.ArchivedTask.__table__)
+_NOTE_TABLES = (models.Note.__table__, models.ArchivedNote.__table__)
+_CREATOR_AND_ASSIGNEE = ("created_by", "assigned_to")
+
+def start(db, user: models.User, reassign_to: Optional[int]) -> models.UserDeletion:
+    """
+    Soft-delete `user` and record a deletion for queue() to hand to a worker.
+    Takes sync or async sessions: nothing is flushed here. Calling it again
+    for a soft-deleted user records a new run that resumes the work.
+    """
+    if user.deleted_at is None:
+        user.deleted_at = datetime.utcnow()
+    deletion = models.UserDeletion(user_id=user.id, reassign_to=reassign_to, status=PENDING)
+    db.add(deletion)
+    return deletion
+
+def queue(db, deletion: models.UserDeletion, created_by: Optional[int] = None) -> models.Job:
+    """
+    Queue the delete_user job that runs `deletion` once the caller commits.
+    The deletion must have been flushed, so it has an id.
+    """
+    return jobs.enqueue(db, "delete_user", {"deletion_id": deletion.id}, created_by=created_by)
+
+def _reassign_batch(db: Session, table, column_names: Sequence[str], user_id: int, reassign_to: Optional[int], batch_size: int) -> int:
+    """
+    Point one batch of the tasks whose `column_names` hold `user_id` at
+    `reassign_to`, keeping task_summary in step. Returns the number of tasks changed.
+    """
+    columns = [table.c[name] for name in column_names]
+    rows = db.execute(
+        select(table.c.id, table.c.created_by, table.c.assigned_to, table.c.status, table.c.priority)
+        .where(or_(*(column == user_id for column in columns)))
+        .limit(batch_size)
+        .with_for_update()
+    ).all()
+    if not rows:
+        return 0
+
+    deltas = Counter()
+    task_events = []
+    for row in rows:
+        old = row._asdict()
+        new = {**old, **{name: reassign_to for name in column_names if old[name] == user_id}}
+        stats.count_task(deltas, old, -1)
+        stats.count_task(deltas, new, 1)
+        if table is models.Task.__table__:
+            task_events.append(events.task_event("updated", row.id, (row.created_by, row.assigned_to, reassign_to)))
+    db.execute(
+        update(table)
+        .where(table.c.id.in_([row.id for row in rows]))
+        .values({column: case((column == user_id, reassign_to), else_=column) for column in columns})
+    )
+    stats.apply_deltas(db, deltas)
+    events.publish(db, task_events)
+    return len(rows)
+
+def _detach_notes_batch(db: Session, table, user_id: int, batch_size: int) -> int:
+    """
+    Clear the author of one batch of the user's notes. The notes stay on their tasks.
+    """
+    ids = db.scalars(
+        select(table.c.id).where(table.c.user_id == user_id).limit(batch_size).with_for_update()
+    ).all()
+    if ids:
+        db.execute(update(table).where(table.c.id.in_(ids)).values(user_id=None))
+    return len(ids)
+
+def _count(db: Session, table, condition) -> int:
+    return db.scalar(select(func.count()).select_from(table).where(condition))
+
+class _Batches:
+    """
+    Runs batch steps one short transaction each, reporting progress to the job.
+    """
+    def __init__(self, db: Session, job: jobs.JobContext, batch_size: int, total: int):
+        self.db, self.job, self.batch_size = db, job, batch_size
+        self.done = 0
+        job.progress(0, total)
+
+    def drain(self, step, deletion: Optional[models.UserDeletion] = None, counter: Optional[str] = None) -> int:
+        """
+        Run `step` until a batch comes up short. With a `deletion`, its
+        `counter` is advanced in the same transaction as each batch.
+        """
+        moved_total = 0
+        while True:
+            moved = step()
+            if deletion is not None:
+                setattr(deletion, counter, getattr(deletion, counter) + moved)
+            self.db.commit()
+            moved_total += moved
+            self.done += moved
+            self.job.progress(self.done)
+            if moved < self.batch_size:
+                return moved_total
+            time.sleep(USER_DELETION_BATCH_PAUSE)
+
+def _reassign(db: Session, batches: _Batches, tables, column_names, user_id: int, reassign_to: Optional[int],
+              deletion: Optional[models.UserDeletion] = None) -> int:
+    return sum(
+        batches.drain(
+            lambda: _reassign_batch(db, table, column_names, user_id, reassign_to, batches.batch_size),
+            deletion, "tasks_reassigned"
+        )
+        for table in tables
+    )
+
+@jobs.handler("reassign_tasks")
+def reassign_tasks(job: jobs.JobContext, batch_size: int = USER_DELETION_BATCH_SIZE) -> dict:
+    """
+    Move every task assigned to `from_user` to `to_user` (or unassign it).
+    Archived tasks are included when `include_archived` is set.
+    """
+    user_id, reassign_to = job.params["from_user"], job.params.get("to_user")
+    tables = _TASK_TABLES if job.params.get("include_archived") else _TASK_TABLES[:1]
+    db = SessionLocal()
+    try:
+        total = sum(_count(db, table, table.c.assigned_to == user_id) for table in tables)
+        batches = _Batches(db, job, batch_size, total)
+        return {"tasks_reassigned": _reassign(db, batches, tables, ("assigned_to",), user_id, reassign_to)}
+    finally:
+        db.close()
+
+@jobs.handler("delete_user")
+def delete_user(job: jobs.JobContext, batch_size: int = USER_DELETION_BATCH_SIZE) -> dict:
+    """
+    Run a deletion recorded by start(): move the soft-deleted user's tasks, hot
+    and archived, to `reassign_to` (or clear those references), clear the
+    author of their notes, then delete the user row. The deletion's status and
+    counts follow along. A failed or interrupted run resumes where it stopped.
+    """
+    deletion_id = job.params["deletion_id"]
+    db = SessionLocal()
+    try:
+        deletion = db.get(models.UserDeletion, deletion_id)
+        if deletion is None or deletion.status == COMPLETED:
+            return {"deletion_id": deletion_id}
+        deletion.status, deletion.error = RUNNING, None
+        db.commit()
+        user_id, reassign_to = deletion.user_id, deletion.reassign_to
+
+        total = sum(
+            _count(db, table, or_(table.c.created_by == user_id, table.c.assigned_to == user_id))
+            for table in _TASK_TABLES
+        ) + sum(_count(db, table, table.c.user_id == user_id) for table in _NOTE_TABLES)
+        batches = _Batches(db, job, batch_size, total)
+
+        _reassign(db, batches, _TASK_TABLES, _CREATOR_AND_ASSIGNEE, user_id, reassign_to, deletion)
+        for table in _NOTE_TABLES:
+            batches.drain(lambda: _detach_notes_batch(db, table, user_id, batch_size), deletion, "notes_detached")
+
+        # Nothing references the row any more, so no relationships are loaded
+        db.execute(delete(models.User).where(models.User.id == user_id, models.User.deleted_at.isnot(None)))
+        deletion.status, deletion.finished_at = COMPLETED, datetime.utcnow()
+        db.commit()
+        logger.info("User deleted", extra={
+            "user_id": user_id,
+            "reassign_to": reassign_to,
+            "tasks": deletion.tasks_reassigned,
+            "notes": deletion.notes_detached,
+        })
+        return {
+            "deletion_id": deletion_id,
+            "tasks_reassigned": deletion.tasks_reassigned,
+            "notes_detached": deletion.notes_detached,
+        }
+    except Exception as e:
+        db.rollback()
+        deletion = db.get(models.UserDeletion, deletion_id)
+        if deletion is not None:
+            # Until the job's next attempt, if it has one left
+            deletion.status, deletion.error = FAILED, str(e)[:500]
+            db.commit()
+        raise
+    finally:
+        db.close()
@@ -0,0 +1,25 @@
+"""
+Move completed tasks that have been untouched for --days, with their notes,
+into the partitioned tasks_archive and notes_archive tables.
+
+    python archive_tasks.py --days 180 --batch-size 500
+
+Works in short transactions of --batch-size tasks, skipping rows other
+transactions hold, so it can run while the app serves traffic (e.g. nightly
+from cron). Archived tasks are listed with GET /api/tasks?include_archived=true.
+"""
+import argparse
+
+from app import archive
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=archive.ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--batch-size", type=int, default=archive.ARCHIVE_BATCH_SIZE)
+    parser.add_argument("--max-batches", type=int, help="stop after this many batches")
+    args = parser.parse_args()
+    moved = archive.archive_completed(args.days, args.batch_size, args.max_batches)
+    print(f"Archived {moved} tasks")
+
+if __name__ == "__main__":
+    main()
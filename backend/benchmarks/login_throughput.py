@@ -0,0 +1,125 @@
+"""
+Login throughput benchmark.
+
+Drives POST /api/auth/login from many threads against a running server while a
+probe thread keeps calling GET /, then reports logins per second and the probe
+latency. The probe shows whether a login burst stalls unrelated requests.
+
+    python benchmarks/login_throughput.py --email admin@example.com --password admin123
+
+Run it once with HASH_WORKERS=0 (inline bcrypt) and once with the process pool
+to compare. `--hash-only` skips the server and measures raw hashing throughput
+of the inline path against the pool in this process.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+def _post_login(url: str, email: str, password: str) -> int:
+    body = json.dumps({"email": email, "password": password}).encode()
+    request = urllib.request.Request(
+        f"{url}/api/auth/login",
+        data=body,
+        headers={"Content-Type": "application/json"},
+        method="POST"
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+def _percentile(samples, pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def run_server(args) -> dict:
+    stop = threading.Event()
+    probe_latencies = []
+
+    def probe():
+        while not stop.is_set():
+            started = time.perf_counter()
+            with urllib.request.urlopen(f"{args.url}/") as response:
+                response.read()
+            probe_latencies.append(time.perf_counter() - started)
+            time.sleep(0.01)
+
+    def worker(deadline: float) -> tuple:
+        ok = failed = 0
+        while time.perf_counter() < deadline:
+            if _post_login(args.url, args.email, args.password) == 200:
+                ok += 1
+            else:
+                failed += 1
+        return ok, failed
+
+    probe_thread = threading.Thread(target=probe, daemon=True)
+    probe_thread.start()
+    started = time.perf_counter()
+    deadline = started + args.duration
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(worker, [deadline] * args.concurrency))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    probe_thread.join()
+
+    ok = sum(r[0] for r in results)
+    return {
+        "concurrency": args.concurrency,
+        "seconds": round(elapsed, 2),
+        "logins": ok,
+        "failures": sum(r[1] for r in results),
+        "logins_per_second": round(ok / elapsed, 2),
+        "probe_p50_ms": round(_percentile(probe_latencies, 50) * 1000, 2),
+        "probe_p95_ms": round(_percentile(probe_latencies, 95) * 1000, 2),
+        "probe_max_ms": round(max(probe_latencies, default=0) * 1000, 2),
+    }
+
+def run_hash_only(args) -> dict:
+    from app import hashing
+
+    stored = hashing.pwd_context.hash(args.password)
+    results = {}
+    for label, workers in (("inline", 0), ("pool", hashing.HASH_WORKERS or os.cpu_count() or 1)):
+        hashing.HASH_WORKERS = workers
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            list(pool.map(lambda _: hashing.verify_and_update(args.password, stored), range(args.iterations)))
+        elapsed = time.perf_counter() - started
+        results[label] = {
+            "workers": workers,
+            "verifications": args.iterations,
+            "verifications_per_second": round(args.iterations / elapsed, 2),
+        }
+    hashing.shutdown()
+    results["bcrypt_rounds"] = hashing.BCRYPT_ROUNDS
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--email", default="admin@example.com")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds to run against the server")
+    parser.add_argument("--iterations", type=int, default=64, help="verifications per mode with --hash-only")
+    parser.add_argument("--hash-only", action="store_true")
+    args = parser.parse_args()
+
+    result = run_hash_only(args) if args.hash_only else run_server(args)
+    print(json.dumps(result, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Load-test suite for the main API paths.
+
+Runs each scenario for --duration seconds from --concurrency threads against a
+running server and records per-request latency (p50/p95/p99, mean) and
+throughput into a JSON baseline. Seed the database first with seed_data.py so
+the numbers reflect production-sized tables; point the server at Postgres or,
+with DATABASE_URL=sqlite:///./bench.db, at SQLite.
+
+    python benchmarks/run.py --output baseline.json
+    python benchmarks/run.py --output after.json --compare baseline.json
+
+Threads log in as user<id>@example.com for ids in --user-ids (the seeded users).
+"""
+import argparse
+import json
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import cycle
+
+METRICS = ("throughput_rps", "p50_ms", "p95_ms", "p99_ms", "mean_ms", "errors")
+
+class Recorder:
+    """
+    Latency samples and error counts per operation, shared by all threads.
+    """
+    def __init__(self):
+        self.samples = {}
+        self.errors = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self.samples.setdefault(name, []).append(seconds)
+            if not ok:
+                self.errors[name] = self.errors.get(name, 0) + 1
+
+class Rotation:
+    """
+    An endless rotation over user ids, shared by all threads.
+    """
+    def __init__(self, user_ids):
+        self._ids = cycle(user_ids)
+        self._lock = threading.Lock()
+
+    def __next__(self) -> int:
+        with self._lock:
+            return next(self._ids)
+
+class Client:
+    def __init__(self, url: str, recorder: Recorder):
+        self.url = url
+        self.recorder = recorder
+        self.token = None
+
+    def call(self, name: str, method: str, path: str, body=None):
+        data = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        request = urllib.request.Request(f"{self.url}{path}", data=data, headers=headers, method=method)
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request) as response:
+                payload = response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            payload, status = e.read(), e.code
+        self.recorder.add(name, time.perf_counter() - started, status < 400)
+        if status >= 400:
+            return None
+        return json.loads(payload) if payload else {}
+
+    def login(self, email: str, password: str, name: str = "login") -> bool:
+        result = self.call(name, "POST", "/api/auth/login", {"email": email, "password": password})
+        self.token = result["access_token"] if result else None
+        return self.token is not None
+
+def scenario_login(client: Client, args, user_ids):
+    client.login(args.email_pattern.format(next(user_ids)), args.password)
+
+def scenario_list_tasks(client: Client, args, user_ids):
+    page = client.call("list_tasks", "GET", "/api/tasks?limit=50")
+    if page and page.get("next_cursor"):
+        client.call("list_tasks_next_page", "GET", f"/api/tasks?limit=50&cursor={page['next_cursor']}")
+
+def scenario_task_crud(client: Client, args, user_ids):
+    task = client.call("create_task", "POST", "/api/tasks", {
+        "title": "Benchmark task",
+        "description": "Created by benchmarks/run.py",
+        "priority": "medium",
+    })
+    if task is None:
+        return
+    client.call("read_task", "GET", f"/api/tasks/{task['id']}")
+    client.call("update_task", "PUT", f"/api/tasks/{task['id']}", {"status": "in_progress"})
+    client.call("delete_task", "DELETE", f"/api/tasks/{task['id']}")
+
+def scenario_notes(client: Client, args, user_ids):
+    page = client.call("list_task_ids", "GET", "/api/tasks?limit=20&fields=id&include=")
+    if not page or not page["items"]:
+        return
+    task_ids = ",".join(str(item["id"]) for item in page["items"])
+    client.call("notes_batch", "GET", f"/api/notes/notes/?task_ids={task_ids}&per_task=5")
+    client.call("list_notes", "GET", "/api/notes/notes/?limit=50")
+    client.call("create_note", "POST", "/api/notes/notes/", {
+        "task_id": page["items"][0]["id"],
+        "content": "Benchmark note",
+    })
+
+SCENARIOS = {
+    "login": scenario_login,
+    "list_tasks": scenario_list_tasks,
+    "task_crud": scenario_task_crud,
+    "notes": scenario_notes,
+}
+
+def _percentile(ordered, pct: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def run_scenario(name: str, args, user_ids) -> Recorder:
+    recorder = Recorder()
+    step = SCENARIOS[name]
+
+    def worker(deadline: float):
+        client = Client(args.url, recorder)
+        if name != "login" and not client.login(args.email_pattern.format(next(user_ids)), args.password, "setup_login"):
+            return
+        while time.perf_counter() < deadline:
+            step(client, args, user_ids)
+
+    deadline = time.perf_counter() + args.duration
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(worker, [deadline] * args.concurrency))
+    recorder.samples.pop("setup_login", None)
+    return recorder
+
+def summarize(recorder: Recorder, seconds: float) -> dict:
+    results = {}
+    for name, samples in sorted(recorder.samples.items()):
+        ordered = sorted(samples)
+        results[name] = {
+            "requests": len(ordered),
+            "errors": recorder.errors.get(name, 0),
+            "throughput_rps": round(len(ordered) / seconds, 2),
+            "p50_ms": round(_percentile(ordered, 50) * 1000, 2),
+            "p95_ms": round(_percentile(ordered, 95) * 1000, 2),
+            "p99_ms": round(_percentile(ordered, 99) * 1000, 2),
+            "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2),
+        }
+    return results
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def compare(baseline: dict, current: dict) -> None:
+    """
+    Print each operation's metrics next to the baseline with the relative change.
+    """
+    print(f"{'operation':<24}{'metric':<16}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, metrics in current["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if old is None:
+            continue
+        for metric in METRICS:
+            before, after = old[metric], metrics[metric]
+            change = f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+            print(f"{name:<24}{metric:<16}{before:>12}{after:>12}{change:>10}")
+
+def parse_range(value: str) -> range:
+    first, _, last = value.partition("-")
+    return range(int(first), int(last or first) + 1)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"comma-separated subset of {', '.join(SCENARIOS)}")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per scenario")
+    parser.add_argument("--user-ids", type=parse_range, default=parse_range("2-101"), help="seeded user ids to log in as, e.g. 2-101")
+    parser.add_argument("--email-pattern", default="user{}@example.com")
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to diff the results against")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.scenarios.split(","):
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario {name}")
+        recorder = run_scenario(name, args, Rotation(args.user_ids))
+        results.update(summarize(recorder, args.duration))
+        print(f"{name}: done")
+
+    report = {
+        "meta": {
+            "url": args.url,
+            "git_commit": _git_commit(),
+            "started_at": datetime.utcnow().isoformat(),
+            "concurrency": args.concurrency,
+            "duration_per_scenario": args.duration,
+        },
+        "results": results,
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Task list serialization microbenchmark.
+
+Compares the old response path for GET /api/tasks (pydantic validation of
+TaskResponse with two nested users per task, jsonable_encoder, stdlib json)
+with the current one (rows to dicts, users once in included_users, orjson).
+No database is needed; pages are built from synthetic rows.
+
+    python benchmarks/serialization.py --page-size 100 --users 10
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from typing import List
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, TypeAdapter
+
+from app import schemas, serializers
+from app.models import Task, User, UserRole
+
+TaskRow = namedtuple("TaskRow", serializers.TASK_FIELDS)
+UserRow = namedtuple("UserRow", serializers.USER_FIELDS)
+
+class OldTaskPage(BaseModel):
+    items: List[schemas.TaskResponse]
+    next_cursor: str = None
+    total: int = None
+
+def build_page(page_size: int, user_count: int):
+    now = datetime.utcnow()
+    users = [
+        User(id=i, email=f"user{i}@example.com", name=f"User {i}", role=UserRole.member, created_at=now)
+        for i in range(1, user_count + 1)
+    ]
+    tasks = []
+    for i in range(page_size):
+        creator, assignee = users[i % user_count], users[(i * 7) % user_count]
+        tasks.append(Task(
+            id=i + 1,
+            title=f"Rotate certificates on host {i}",
+            description="Renew and deploy the TLS certificate before it expires. " * 3,
+            status="pending",
+            priority="high",
+            due_date=date.today() + timedelta(days=i % 30),
+            created_by=creator.id,
+            assigned_to=assignee.id,
+            created_at=now - timedelta(minutes=i),
+            creator=creator,
+            assignee=assignee,
+        ))
+    task_rows = [TaskRow(*(getattr(t, f) for f in serializers.TASK_FIELDS)) for t in tasks]
+    user_rows = [UserRow(*(getattr(u, f) for f in serializers.USER_FIELDS)) for u in users]
+    return tasks, task_rows, user_rows
+
+def old_path(tasks) -> bytes:
+    # What FastAPI does for response_model=TaskPage with nested users
+    page = TypeAdapter(OldTaskPage).validate_python(
+        {"items": tasks, "next_cursor": "x", "total": None},
+        from_attributes=True
+    )
+    return json.dumps(jsonable_encoder(page)).encode()
+
+def new_path(task_rows, user_rows) -> bytes:
+    wanted = serializers.referenced_user_ids(task_rows)
+    users = [row for row in user_rows if row.id in wanted]
+    response = serializers.task_page_response(
+        serializers.task_dicts(task_rows),
+        serializers.user_dicts(users),
+        "x",
+        None
+    )
+    return response.body
+
+def timeit(fn, iterations: int) -> float:
+    fn()  # warm up
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    tasks, task_rows, user_rows = build_page(args.page_size, args.users)
+    old_seconds = timeit(lambda: old_path(tasks), args.iterations)
+    new_seconds = timeit(lambda: new_path(task_rows, user_rows), args.iterations)
+    print(json.dumps({
+        "page_size": args.page_size,
+        "distinct_users": args.users,
+        "old_us_per_page": round(old_seconds * 1e6, 1),
+        "new_us_per_page": round(new_seconds * 1e6, 1),
+        "speedup": round(old_seconds / new_seconds, 1),
+        "old_bytes": len(old_path(tasks)),
+        "new_bytes": len(new_path(task_rows, user_rows)),
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,9 @@
 from sqlalchemy.orm import Session
-from app.database import SessionLocal, engine
-from app.models import User, UserRole, Base
+from app.database import SessionLocal
+from app.models import User, UserRole
 from app.auth import get_password_hash
 
-# Create tables if they don't exist
-Base.metadata.create_all(bind=engine)
+# Run `alembic upgrade head` first; the schema is managed by migrations
 
 def create_admin_user(db: Session):
     # Check if admin user already exists
@@ -0,0 +1,193 @@
+"""
+Bulk-generate realistic users, tasks and notes for load testing.
+
+    python seed_data.py --users 1000 --tasks 1000000 --notes 5000000
+
+Rows are loaded with COPY on Postgres (plain multi-row INSERTs on SQLite) in
+batches of --batch-size, one transaction per batch, and task_summary is kept
+in step. The same --seed always produces the same data. Seeded users log in as
+user<id>@example.com with --password; the first one is an admin.
+"""
+import argparse
+import csv
+import io
+import random
+import time
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from app import hashing, stats
+from app.database import SessionLocal, engine
+from app.models import Base, Note, Task, User, UserRole, TaskStatus, Priority
+
+# The migrations target Postgres; a throwaway SQLite benchmark database
+# gets its tables straight from the models. Run `alembic upgrade head` on Postgres.
+if engine.dialect.name == "sqlite":
+    Base.metadata.create_all(bind=engine)
+
+VERBS = ["Fix", "Review", "Update", "Deploy", "Document", "Investigate", "Migrate", "Refactor", "Test", "Rotate"]
+OBJECTS = [
+    "login flow", "billing report", "CI pipeline", "TLS certificates", "backup job", "search index",
+    "user onboarding", "API rate limits", "dashboard charts", "database replica", "VPN config", "release notes",
+]
+SENTENCES = [
+    "Customer reported this twice last week.",
+    "Blocked until the vendor confirms the new limits.",
+    "See the incident review for context.",
+    "Needs a second pair of eyes before merging.",
+    "Coordinate with the network team for the maintenance window.",
+    "Low risk, but touches the payment path.",
+    "Reproduced on staging with production data volumes.",
+    "Follow up with the owner after the sprint demo.",
+]
+ROLES = [
+    (UserRole.developer, 40), (UserRole.member, 20), (UserRole.system_engineer, 10),
+    (UserRole.devops_engineer, 10), (UserRole.network_engineer, 5), (UserRole.ai_engineer, 5),
+    (UserRole.team_leader, 5), (UserRole.manager, 4), (UserRole.admin, 1),
+]
+STATUSES = [(TaskStatus.pending, 45), (TaskStatus.in_progress, 25), (TaskStatus.completed, 30)]
+PRIORITIES = [(Priority.low, 30), (Priority.medium, 50), (Priority.high, 20)]
+HISTORY_DAYS = 730
+
+def _weighted(rng: random.Random, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights=weights)[0].value
+
+def _next_id(db: Session, model) -> int:
+    return (db.scalar(select(func.max(model.id))) or 0) + 1
+
+def copy_rows(db: Session, table, columns, rows) -> None:
+    """
+    Load one batch of row tuples into `table` in the session's transaction.
+    """
+    if engine.dialect.name == "postgresql":
+        buffer = io.StringIO()
+        # Empty unquoted CSV fields load as NULL
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        cursor = db.connection().connection.cursor()
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    else:
+        db.execute(table.insert(), [dict(zip(columns, row)) for row in rows])
+
+def load(db: Session, model, columns, rows, batch_size: int, on_batch=None) -> int:
+    table = model.__table__
+    started, total, batch = time.perf_counter(), 0, []
+
+    def flush():
+        copy_rows(db, table, columns, batch)
+        if on_batch is not None:
+            on_batch(batch)
+        db.commit()
+
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            flush()
+            total += len(batch)
+            batch = []
+            print(f"  {table.name}: {total} rows")
+    if batch:
+        flush()
+        total += len(batch)
+    elapsed = time.perf_counter() - started
+    print(f"{table.name}: {total} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):.0f} rows/s)")
+    return total
+
+def generate_users(rng: random.Random, first_id: int, count: int, hashed_password: str, now: datetime):
+    for user_id in range(first_id, first_id + count):
+        role = UserRole.admin.value if user_id == first_id else _weighted(rng, ROLES)
+        created_at = now - timedelta(days=rng.uniform(HISTORY_DAYS, HISTORY_DAYS + 365))
+        yield (user_id, f"User {user_id}", f"user{user_id}@example.com", hashed_password, role, created_at, created_at, 0)
+
+def generate_tasks(rng: random.Random, first_id: int, count: int, user_ids: range, owners: array, now: datetime):
+    today = now.date()
+    for task_id in range(first_id, first_id + count):
+        created_by = rng.choice(user_ids)
+        assigned_to = rng.choice(user_ids) if rng.random() < 0.9 else None
+        created_at = now - timedelta(seconds=rng.uniform(0, HISTORY_DAYS * 86400))
+        updated_at = min(now, created_at + timedelta(seconds=rng.expovariate(1 / 86400)))
+        due_date = today + timedelta(days=rng.randint(-90, 180)) if rng.random() < 0.7 else None
+        owners.append(created_by)
+        owners.append(assigned_to or created_by)
+        yield (
+            task_id,
+            f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} #{task_id}",
+            " ".join(rng.sample(SENTENCES, rng.randint(1, 3))),
+            _weighted(rng, STATUSES),
+            _weighted(rng, PRIORITIES),
+            due_date,
+            created_by,
+            assigned_to,
+            created_at,
+            updated_at,
+        )
+
+def generate_notes(rng: random.Random, first_id: int, count: int, first_task_id: int, owners: array, now: datetime):
+    task_count = len(owners) // 2
+    for note_id in range(first_id, first_id + count):
+        offset = rng.randrange(task_count)
+        # Notes are written by the task's creator or assignee
+        user_id = owners[2 * offset + rng.randint(0, 1)]
+        created_at = now - timedelta(seconds=rng.uniform(0, HISTORY_DAYS * 86400))
+        yield (note_id, " ".join(rng.sample(SENTENCES, rng.randint(1, 4))), created_at, created_at, first_task_id + offset, user_id)
+
+def reset_sequences(db: Session) -> None:
+    # Rows were loaded with explicit ids; move the serial sequences past them
+    if engine.dialect.name != "postgresql":
+        return
+    for table in ("users", "tasks", "notes"):
+        db.execute(text(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))"))
+    db.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--notes", type=int, default=5_000_000)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        # bcrypt once; every seeded user shares the hash
+        hashed_password = hashing.pwd_context.hash(args.password)
+        first_user = _next_id(db, User)
+        load(db, User, ["id", "name", "email", "hashed_password", "role", "created_at", "updated_at", "token_version"],
+             generate_users(rng, first_user, args.users, hashed_password, now), args.batch_size)
+        user_ids = range(first_user, first_user + args.users)
+
+        def count_tasks(batch):
+            deltas = Counter()
+            for row in batch:
+                stats.count_task(deltas, {"created_by": row[6], "assigned_to": row[7], "status": row[3], "priority": row[4]}, 1)
+            stats.apply_deltas(db, deltas)
+
+        # Two possible note authors per task: the creator and the assignee (or creator again)
+        owners = array("i")
+        first_task = _next_id(db, Task)
+        load(db, Task, ["id", "title", "description", "status", "priority", "due_date", "created_by", "assigned_to", "created_at", "updated_at"],
+             generate_tasks(rng, first_task, args.tasks, user_ids, owners, now), args.batch_size, count_tasks)
+
+        if args.tasks:
+            load(db, Note, ["id", "content", "created_at", "updated_at", "task_id", "user_id"],
+                 generate_notes(rng, _next_id(db, Note), args.notes, first_task, owners, now), args.batch_size)
+
+        reset_sequences(db)
+        if engine.dialect.name == "postgresql":
+            db.execute(text("ANALYZE users, tasks, notes, task_summary"))
+            db.commit()
+        print(f"Log in as user{first_user}@example.com (admin) or any user<id>@example.com, password {args.password}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
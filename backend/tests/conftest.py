@@ -0,0 +1,100 @@
+import os
+import tempfile
+import time
+from collections import Counter
+
+# Settings are read when the app modules are imported, so set them first
+_DB_DIR = tempfile.mkdtemp(prefix="task-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_DB_DIR}/test.db")
+os.environ.setdefault("HASH_WORKERS", "0")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("JOB_WORKERS", "0")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("STARTUP_WARMUP", "false")
+os.environ.setdefault("LOG_FORMAT", "text")
+# Both engines exist, so each router test runs against the sync and the async routers
+os.environ.setdefault("DB_ASYNC", "true")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from app import auth, hashing, models, revocation, stats
+from app.database import SessionLocal, engine
+from app.main import create_app
+
+_APPS = {"sync": create_app(async_routes=False), "async": create_app(async_routes=True)}
+
+@pytest.fixture
+def db():
+    """
+    A fresh schema per test. In-process caches keyed on user ids are reset
+    too, since the ids are handed out again.
+    """
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    auth.user_cache.clear()
+    revocation.revocations.load()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture(params=sorted(_APPS))
+def client(request, db):
+    with TestClient(_APPS[request.param]) as client:
+        for _ in range(50):
+            if client.get("/readyz").status_code == 200:
+                break
+            time.sleep(0.1)
+        yield client
+
+def make_user(db, name: str, role: models.UserRole = models.UserRole.member) -> models.User:
+    user = models.User(
+        name=name.title(),
+        email=f"{name}@example.com",
+        role=role,
+        hashed_password=hashing.hash_password(f"{name}-password"),
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+def login(client, user: models.User) -> dict:
+    response = client.post("/api/auth/login", json={"email": user.email, "password": f"{user.name.lower()}-password"})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+@pytest.fixture
+def admin(db):
+    return make_user(db, "admin", models.UserRole.admin)
+
+@pytest.fixture
+def admin_headers(client, admin):
+    return login(client, admin)
+
+def create_task(client, headers: dict, **values) -> dict:
+    response = client.post("/api/tasks", json={"title": "Task", **values}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def assert_summary_matches(db) -> None:
+    """
+    task_summary holds exactly what a GROUP BY over tasks gives.
+    """
+    db.expire_all()
+    task = models.Task
+    expected = Counter()
+    rows = db.execute(
+        select(task.created_by, task.assigned_to, task.status, task.priority, func.count())
+        .group_by(task.created_by, task.assigned_to, task.status, task.priority)
+    )
+    for created_by, assigned_to, status, priority, count in rows:
+        for key in stats.summary_keys(created_by, assigned_to, status, priority):
+            expected[key] += count
+    actual = {
+        (row.user_id, row.scope, row.status, row.priority): row.task_count
+        for row in db.scalars(select(models.TaskSummary)) if row.task_count
+    }
+    assert actual == {key: count for key, count in expected.items() if count}
@@ -0,0 +1,23 @@
+import pytest
+
+from app.database import _async_url
+from tests.conftest import _APPS
+
+@pytest.mark.parametrize("path, method, sync_module, async_module", [
+    ("/api/tasks", "GET", "tasks", "async_tasks"),
+    ("/api/notes/notes/", "GET", "notes", "async_notes"),
+    ("/api/auth/login", "POST", "auth", "async_auth"),
+    ("/api/users/me", "GET", "users", "async_users"),
+])
+def test_async_routers_are_matched_first(path, method, sync_module, async_module):
+    for name, module in (("sync", sync_module), ("async", async_module)):
+        endpoint = next(
+            route.endpoint for route in _APPS[name].routes
+            if getattr(route, "path", None) == path and method in route.methods
+        )
+        assert endpoint.__module__ == f"app.routers.{module}"
+
+def test_async_url_picks_the_async_driver():
+    assert _async_url("postgresql://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+    assert _async_url("sqlite:///./bench.db") == "sqlite+aiosqlite:///./bench.db"
+    assert _async_url("postgresql+asyncpg://db/app") == "postgresql+asyncpg://db/app"
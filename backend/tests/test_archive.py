@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select, update
+
+from app import archive, jobs, models
+from tests.conftest import create_task, login, make_user
+
+def _pages(client, headers, **params) -> list:
+    """
+    Every page of a listing, walked with its cursors.
+    """
+    pages, cursor = [], None
+    while True:
+        query = {"limit": 2, "include_total": True, **params}
+        if cursor is not None:
+            query["cursor"] = cursor
+        response = client.get("/api/tasks", params=query, headers=headers)
+        assert response.status_code == 200, response.text
+        pages.append(response.json())
+        cursor = pages[-1]["next_cursor"]
+        if cursor is None:
+            return pages
+
+def _summary(db) -> set:
+    return {(row.user_id, row.scope, row.status, row.priority, row.task_count) for row in db.scalars(select(models.TaskSummary))}
+
+@pytest.fixture
+def old_tasks(client, admin_headers, db):
+    """
+    Five tasks, three of them completed; two of those untouched for a year.
+    """
+    member = make_user(db, "bob")
+    ids = [
+        create_task(client, admin_headers, title=title, status=status, assigned_to=member.id)["id"]
+        for title, status in [("a", "completed"), ("b", "pending"), ("c", "completed"), ("d", "completed"), ("e", "in_progress")]
+    ]
+    note = client.post("/api/notes/notes/", json={"task_id": ids[0], "content": "Done"}, headers=admin_headers)
+    assert note.status_code == 200, note.text
+    year_ago = datetime.utcnow() - timedelta(days=365)
+    db.execute(update(models.Task).where(models.Task.id.in_([ids[0], ids[2]])).values(updated_at=year_ago))
+    db.commit()
+    return member, ids
+
+def test_archived_tasks_leave_tasks_but_not_the_listing(client, admin_headers, db, old_tasks):
+    member, ids = old_tasks
+    member_headers = login(client, member)
+    listings = {
+        "admin": _pages(client, admin_headers, include_archived=True),
+        "member": _pages(client, member_headers, include_archived=True, sort="title"),
+    }
+    summary = _summary(db)
+    stats = client.get("/api/tasks/stats", headers=admin_headers).json()
+
+    assert archive.archive_completed(older_than_days=30, batch_size=1) == 2
+
+    db.expire_all()
+    assert set(db.scalars(select(models.Task.id))) == {ids[1], ids[3], ids[4]}
+    assert set(db.scalars(select(models.ArchivedTask.id))) == {ids[0], ids[2]}
+    assert db.scalar(select(func.count()).select_from(models.Note)) == 0
+    assert [note.content for note in db.scalars(select(models.ArchivedNote))] == ["Done"]
+
+    assert _pages(client, admin_headers, include_archived=True) == listings["admin"]
+    assert _pages(client, member_headers, include_archived=True, sort="title") == listings["member"]
+    default = _pages(client, admin_headers)
+    assert default[0]["total"] == 3
+    assert [task["id"] for page in default for task in page["items"]] == [ids[4], ids[3], ids[1]]
+
+    # Archived tasks stay counted
+    assert _summary(db) == summary
+    assert client.get("/api/tasks/stats", headers=admin_headers).json() == stats
+
+def test_archive_job(client, admin_headers, db, old_tasks):
+    response = client.post("/api/tasks/archive", params={"older_than_days": 30}, headers=admin_headers)
+    assert response.status_code == 202
+    assert jobs.run_one()
+    job = client.get(response.headers["location"], headers=admin_headers).json()
+    assert job["status"] == jobs.COMPLETED
+    assert job["result"] == {"tasks_archived": 2}
+    assert job["progress"] == 2
+
+def test_only_admins_archive(client, db, old_tasks):
+    member, _ = old_tasks
+    assert client.post("/api/tasks/archive", headers=login(client, member)).status_code == 403
@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+
+from jose import jwt
+from sqlalchemy import func, select
+
+from app import auth, models, revocation
+from tests.conftest import make_user
+
+def _legacy_headers(user) -> dict:
+    # Tokens issued before the uid and ver claims only carried the email
+    token = jwt.encode({"sub": user.email, "exp": datetime.utcnow() + timedelta(minutes=5)}, auth.SECRET_KEY, algorithm=auth.ALGORITHM)
+    return {"Authorization": f"Bearer {token}"}
+
+def test_legacy_token_is_accepted(client, db):
+    user = make_user(db, "alice")
+    assert client.get("/api/tasks", headers=_legacy_headers(user)).status_code == 200
+
+def test_legacy_token_of_deleted_user_is_rejected(client, db):
+    user = make_user(db, "alice")
+    user.deleted_at = datetime.utcnow()
+    db.commit()
+    assert client.get("/api/tasks", headers=_legacy_headers(user)).status_code == 401
+
+def test_legacy_token_is_revoked_with_the_users_other_tokens(client, db):
+    user = make_user(db, "alice")
+    user.token_version += 1
+    db.commit()
+    assert client.get("/api/tasks", headers=_legacy_headers(user)).status_code == 401
+
+def _login(client, user) -> dict:
+    response = client.post("/api/auth/login", json={"email": user.email, "password": "alice-password"})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def _refresh(client, refresh_token: str):
+    return client.post("/api/auth/refresh", json={"refresh_token": refresh_token})
+
+def test_refresh_rotates_the_refresh_token(client, db):
+    tokens = _login(client, make_user(db, "alice"))
+    rotated = _refresh(client, tokens["refresh_token"])
+    assert rotated.status_code == 200
+    headers = {"Authorization": f"Bearer {rotated.json()['access_token']}"}
+    assert client.get("/api/tasks", headers=headers).status_code == 200
+    assert _refresh(client, tokens["refresh_token"]).status_code == 401
+    assert _refresh(client, rotated.json()["refresh_token"]).status_code == 200
+
+def test_refresh_token_is_single_use_across_processes(client, db, monkeypatch):
+    tokens = _login(client, make_user(db, "alice"))
+    assert _refresh(client, tokens["refresh_token"]).status_code == 200
+    # A process that hasn't heard of the revocation yet still finds it taken
+    monkeypatch.setattr(revocation.revocations, "is_revoked", lambda *args: False)
+    replay = _refresh(client, tokens["refresh_token"])
+    assert replay.status_code == 401
+    assert replay.json()["detail"] == "Could not validate credentials"
+    jti = jwt.get_unverified_claims(tokens["refresh_token"])["jti"]
+    assert db.scalar(select(func.count()).where(models.RevokedToken.jti == jti)) == 1
@@ -0,0 +1,116 @@
+import pytest
+
+from app import events
+from app.routers import tasks as tasks_router
+from tests.conftest import assert_summary_matches, create_task, login, make_user
+
+@pytest.fixture
+def published(monkeypatch):
+    """
+    Events handed to events.publish, which the bulk (Core) paths call themselves.
+    """
+    recorded = []
+    publish = events.publish
+
+    def record(session, task_events):
+        recorded.extend(task_events)
+        publish(session, task_events)
+    monkeypatch.setattr(events, "publish", record)
+    return recorded
+
+def _statuses(response) -> list:
+    assert response.status_code == 200, response.text
+    return [(item["status"], item["detail"]) for item in response.json()["results"]]
+
+def _ids(response) -> list:
+    return [item["id"] for item in response.json()["results"]]
+
+def test_bulk_create(client, admin, admin_headers, db, published):
+    member = make_user(db, "bob")
+    response = client.post("/api/tasks/bulk", json=[
+        {"title": "a", "assigned_to": member.id},
+        {"title": "b", "assigned_to": 9999},
+        {"title": "c", "status": "completed", "priority": "high"},
+    ], headers=admin_headers)
+    assert _statuses(response) == [("created", None), ("error", "Assignee not found"), ("created", None)]
+    a, _, c = _ids(response)
+    assert [(e["type"], e["id"], e["audience"]) for e in published] == [
+        ("task.created", a, sorted([admin.id, member.id])),
+        ("task.created", c, [admin.id]),
+    ]
+    assert_summary_matches(db)
+
+def test_bulk_update(client, admin, admin_headers, db, published):
+    member = make_user(db, "bob")
+    a = create_task(client, admin_headers, title="a")["id"]
+    b = create_task(client, admin_headers, title="b", assigned_to=member.id)["id"]
+    c = create_task(client, admin_headers, title="c")["id"]
+    published.clear()
+    response = client.put("/api/tasks/bulk", json=[
+        {"id": a, "assigned_to": member.id},
+        {"id": b, "assigned_to": None, "status": "completed"},
+        {"id": c, "assigned_to": member.id},
+        {"id": a, "title": "again"},
+        {"id": 9999, "title": "missing"},
+    ], headers=admin_headers)
+    assert _statuses(response) == [
+        ("updated", None), ("updated", None), ("updated", None),
+        ("error", "Duplicate task id in request"), ("error", "Task not found"),
+    ]
+    assert sorted((e["id"], e["audience"]) for e in published) == [
+        (a, sorted([admin.id, member.id])), (b, sorted([admin.id, member.id])), (c, sorted([admin.id, member.id])),
+    ]
+    assert client.get(f"/api/tasks/{a}", headers=admin_headers).json()["title"] == "a"
+    assert client.get(f"/api/tasks/{b}", headers=admin_headers).json()["status"] == "completed"
+    assert_summary_matches(db)
+
+def test_bulk_delete(client, admin, admin_headers, db, published):
+    a = create_task(client, admin_headers, title="a", status="in_progress")["id"]
+    b = create_task(client, admin_headers, title="b")["id"]
+    published.clear()
+    response = client.request("DELETE", "/api/tasks/bulk", json={"ids": [a, b, a, 9999]}, headers=admin_headers)
+    assert _statuses(response) == [
+        ("deleted", None), ("deleted", None),
+        ("error", "Duplicate task id in request"), ("error", "Task not found"),
+    ]
+    assert [(e["type"], e["id"]) for e in published] == [("task.deleted", a), ("task.deleted", b)]
+    assert client.get(f"/api/tasks/{a}", headers=admin_headers).status_code == 404
+    assert_summary_matches(db)
+
+def test_members_can_only_change_their_own_tasks(client, admin_headers, db, published):
+    member = make_user(db, "bob")
+    headers = login(client, member)
+    theirs = create_task(client, admin_headers, title="theirs")["id"]
+    assigned = create_task(client, admin_headers, title="assigned", assigned_to=member.id)["id"]
+    mine = create_task(client, headers, title="mine")["id"]
+    published.clear()
+
+    response = client.put("/api/tasks/bulk", json=[
+        {"id": theirs, "status": "completed"},
+        {"id": assigned, "status": "completed"},
+    ], headers=headers)
+    assert _statuses(response) == [("error", "Not authorized to update this task"), ("updated", None)]
+
+    # Assignees may update a task but only its creator may delete it
+    response = client.request("DELETE", "/api/tasks/bulk", json={"ids": [theirs, assigned, mine]}, headers=headers)
+    assert _statuses(response) == [
+        ("error", "Not authorized to delete this task"),
+        ("error", "Not authorized to delete this task"),
+        ("deleted", None),
+    ]
+    assert [(e["type"], e["id"]) for e in published] == [("task.updated", assigned), ("task.deleted", mine)]
+    assert_summary_matches(db)
+
+def test_bulk_size_limit(client, admin_headers, db, published, monkeypatch):
+    monkeypatch.setattr(tasks_router, "MAX_BULK_ITEMS", 2)
+    a = create_task(client, admin_headers, title="a")["id"]
+    published.clear()
+    items = [{"title": str(n)} for n in range(3)]
+    assert client.post("/api/tasks/bulk", json=items, headers=admin_headers).status_code == 413
+    updates = [{"id": a, "title": str(n)} for n in range(3)]
+    assert client.put("/api/tasks/bulk", json=updates, headers=admin_headers).status_code == 413
+    delete = {"ids": [a, a, a]}
+    assert client.request("DELETE", "/api/tasks/bulk", json=delete, headers=admin_headers).status_code == 413
+    assert client.post("/api/tasks/bulk", json=items[:2], headers=admin_headers).status_code == 200
+    assert [e["type"] for e in published] == ["task.created", "task.created"]
+    assert_summary_matches(db)
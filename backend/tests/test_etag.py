@@ -0,0 +1,90 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+def _get(client, url, headers, etag=None, **params):
+    if etag is not None:
+        headers = {**headers, "If-None-Match": etag}
+    return client.get(url, params=params, headers=headers)
+
+def _create_tasks(client, headers, count: int) -> list:
+    ids = []
+    for i in range(count):
+        response = client.post("/api/tasks", json={"title": f"Task {i}"}, headers=headers)
+        assert response.status_code == 200, response.text
+        ids.append(response.json()["id"])
+    return ids
+
+def test_task_page_is_revalidated(client, admin_headers):
+    _create_tasks(client, admin_headers, 3)
+    first = _get(client, "/api/tasks", admin_headers, limit=2)
+    assert first.status_code == 200
+    assert _get(client, "/api/tasks", admin_headers, first.headers["ETag"], limit=2).status_code == 304
+
+def test_task_etag_covers_the_scope_from_the_cursor(client, admin_headers):
+    ids = _create_tasks(client, admin_headers, 3)
+    # Newest first: the first page holds the last two tasks created
+    first = _get(client, "/api/tasks", admin_headers, limit=2)
+    cursor = first.json()["next_cursor"]
+    second = _get(client, "/api/tasks", admin_headers, limit=2, cursor=cursor)
+    assert [task["id"] for task in second.json()["items"]] == [ids[0]]
+
+    # A change before the cursor leaves later pages alone
+    response = client.put(f"/api/tasks/{ids[2]}", json={"title": "Renamed"}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    assert _get(client, "/api/tasks", admin_headers, second.headers["ETag"], limit=2, cursor=cursor).status_code == 304
+    assert _get(client, "/api/tasks", admin_headers, first.headers["ETag"], limit=2).status_code == 200
+
+    # Any change from the cursor on, deletes included, changes the tag
+    assert client.delete(f"/api/tasks/{ids[0]}", headers=admin_headers).status_code == 200
+    response = _get(client, "/api/tasks", admin_headers, second.headers["ETag"], limit=2, cursor=cursor)
+    assert response.status_code == 200
+    assert response.json()["items"] == []
+
+def test_not_modified_loads_no_rows(client, admin_headers):
+    (task_id,) = _create_tasks(client, admin_headers, 1)
+    client.post("/api/notes/notes/", json={"task_id": task_id, "content": "First"}, headers=admin_headers)
+    for url, column in (("/api/tasks", "tasks.title"), ("/api/notes/notes/", "notes.content")):
+        tag = _get(client, url, admin_headers).headers["ETag"]
+        statements = []
+        record = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(Engine, "before_cursor_execute", record)
+        try:
+            assert _get(client, url, admin_headers, tag).status_code == 304
+        finally:
+            event.remove(Engine, "before_cursor_execute", record)
+        assert statements
+        assert not [statement for statement in statements if column in statement]
+
+def test_task_page_etag_changes_when_a_task_enters_the_page(client, admin_headers):
+    _create_tasks(client, admin_headers, 3)
+    etag = _get(client, "/api/tasks", admin_headers, limit=2).headers["ETag"]
+    _create_tasks(client, admin_headers, 1)
+    response = _get(client, "/api/tasks", admin_headers, etag, limit=2)
+    assert response.status_code == 200
+    assert response.json()["items"][0]["title"] == "Task 0"
+
+def test_task_page_etag_covers_the_total(client, admin_headers):
+    _create_tasks(client, admin_headers, 3)
+    first = _get(client, "/api/tasks", admin_headers, limit=1, sort="created_at", include_total=True)
+    assert first.json()["total"] == 3
+    _create_tasks(client, admin_headers, 1)
+    response = _get(client, "/api/tasks", admin_headers, first.headers["ETag"], limit=1, sort="created_at", include_total=True)
+    assert response.status_code == 200
+    assert response.json()["total"] == 4
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_notes_list_is_revalidated(client, admin_headers, batch):
+    (task_id,) = _create_tasks(client, admin_headers, 1)
+    params = {"task_ids": str(task_id)} if batch else {"limit": 10}
+    client.post("/api/notes/notes/", json={"task_id": task_id, "content": "First"}, headers=admin_headers)
+    first = _get(client, "/api/notes/notes/", admin_headers, **params)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert _get(client, "/api/notes/notes/", admin_headers, etag, **params).status_code == 304
+
+    client.post("/api/notes/notes/", json={"task_id": task_id, "content": "Second"}, headers=admin_headers)
+    response = _get(client, "/api/notes/notes/", admin_headers, etag, **params)
+    assert response.status_code == 200
+    notes = response.json()["notes"][str(task_id)] if batch else response.json()["items"]
+    assert [note["content"] for note in notes] == ["Second", "First"]
@@ -0,0 +1,80 @@
+import asyncio
+import json
+
+from app import events, models, schemas
+from app.routers import events as events_router
+from tests.conftest import make_user
+
+class _Connected:
+    async def is_disconnected(self) -> bool:
+        return False
+
+def _principal(user: models.User) -> schemas.TokenData:
+    return schemas.TokenData(email=user.email, id=user.id, role=user.role, token_version=user.token_version)
+
+def _task(**values) -> models.Task:
+    return models.Task(status=models.TaskStatus.pending.value, priority=models.Priority.medium.value, **values)
+
+def _write(db, *tasks: models.Task, commit: bool = True) -> list:
+    db.add_all(tasks)
+    if commit:
+        db.commit()
+        return [task.id for task in tasks]
+    db.flush()
+    db.rollback()
+    return []
+
+def _first_event(user: models.User, *writes) -> str:
+    """
+    Subscribe as `user`, run `writes` in a worker thread like a sync endpoint
+    would, and return the first event streamed to the client.
+    """
+    async def run():
+        subscriber = events.subscribe(_principal(user))
+        stream = events_router._stream(_Connected(), subscriber)
+        try:
+            assert await stream.__anext__() == "retry: 3000\n\n"
+            for write in writes:
+                await asyncio.to_thread(write)
+            return await asyncio.wait_for(stream.__anext__(), 2)
+        finally:
+            await stream.aclose()
+    return asyncio.run(run())
+
+def _sse(event_type: str, task_id: int) -> str:
+    data = {"type": event_type, "id": task_id, "task_id": task_id}
+    return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+def test_sqlite_uses_the_local_broker():
+    assert isinstance(events.broker, events.LocalBroker)
+
+def test_committed_write_is_streamed(db):
+    admin = make_user(db, "admin", models.UserRole.admin)
+    ids = []
+    chunk = _first_event(admin, lambda: ids.extend(_write(db, _task(title="New", created_by=admin.id))))
+    assert chunk == _sse("task.created", ids[0])
+    assert not events.hub._subscribers
+
+def test_members_only_get_events_for_their_tasks(db):
+    admin = make_user(db, "admin", models.UserRole.admin)
+    member = make_user(db, "bob")
+    ids = []
+    chunk = _first_event(
+        member,
+        lambda: _write(db, _task(title="Not mine", created_by=admin.id)),
+        lambda: ids.extend(_write(db, _task(title="Mine", created_by=admin.id, assigned_to=member.id))),
+    )
+    assert chunk == _sse("task.created", ids[0])
+
+def test_rolled_back_write_is_not_streamed(db):
+    admin = make_user(db, "admin", models.UserRole.admin)
+    ids = []
+    chunk = _first_event(
+        admin,
+        lambda: _write(db, _task(title="Undone", created_by=admin.id), commit=False),
+        lambda: ids.extend(_write(db, _task(title="Kept", created_by=admin.id))),
+    )
+    assert chunk == _sse("task.created", ids[0])
+
+def test_stream_requires_a_token(client):
+    assert client.get("/api/events").status_code == 401
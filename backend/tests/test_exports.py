@@ -0,0 +1,92 @@
+import csv
+import io
+import json
+
+import pytest
+
+from app import jobs
+from tests.conftest import create_task, login, make_user
+
+def _ndjson(response) -> list:
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"] == "application/x-ndjson"
+    return [json.loads(line) for line in response.text.splitlines()]
+
+@pytest.fixture
+def member(client, admin_headers, db):
+    member = make_user(db, "bob")
+    headers = login(client, member)
+    create_task(client, admin_headers, title="a", status="pending", due_date="2030-01-01", assigned_to=member.id)
+    create_task(client, admin_headers, title="b", status="completed")
+    create_task(client, headers, title="c", priority="high")
+    return member
+
+def test_task_export_ndjson(client, admin, admin_headers, member):
+    rows = _ndjson(client.get("/api/tasks/export", params={"sort": "title"}, headers=admin_headers))
+    assert [row["title"] for row in rows] == ["a", "b", "c"]
+    assert rows[0] == {
+        "id": rows[0]["id"], "title": "a", "description": None, "status": "pending", "priority": "medium",
+        "due_date": "2030-01-01", "created_by": admin.id, "assigned_to": member.id,
+        "created_at": rows[0]["created_at"],
+    }
+
+def test_task_export_csv(client, admin_headers, member):
+    response = client.get("/api/tasks/export", params={"format": "csv", "sort": "title"}, headers=admin_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == 'attachment; filename="tasks.csv"'
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(row["title"], row["status"], row["due_date"]) for row in rows] == [
+        ("a", "pending", "2030-01-01"), ("b", "completed", ""), ("c", "pending", ""),
+    ]
+
+def test_task_export_applies_filters(client, admin_headers, member):
+    params = {"status": "pending", "sort": "-title"}
+    rows = _ndjson(client.get("/api/tasks/export", params=params, headers=admin_headers))
+    assert [row["title"] for row in rows] == ["c", "a"]
+    params = {"member_id": member.id, "sort": "title"}
+    rows = _ndjson(client.get("/api/tasks/export", params=params, headers=admin_headers))
+    assert [row["title"] for row in rows] == ["a", "c"]
+
+def test_members_export_their_own_tasks(client, member):
+    headers = login(client, member)
+    rows = _ndjson(client.get("/api/tasks/export", params={"sort": "title"}, headers=headers))
+    assert [row["title"] for row in rows] == ["a", "c"]
+
+def test_task_export_rejects_bad_requests(client, admin_headers):
+    assert client.get("/api/tasks/export", params={"format": "xml"}, headers=admin_headers).status_code == 422
+    assert client.get("/api/tasks/export", params={"sort": "priority"}, headers=admin_headers).status_code == 400
+    assert client.get("/api/tasks/export", params={"member_id": 9999}, headers=admin_headers).status_code == 404
+    assert client.get("/api/tasks/export").status_code == 401
+
+def test_note_export_is_scoped_to_the_author(client, admin, admin_headers, member):
+    headers = login(client, member)
+    task_id = _ndjson(client.get("/api/tasks/export", params={"sort": "title"}, headers=headers))[0]["id"]
+    for content, author in [("first", admin_headers), ("second", headers), ("third", admin_headers)]:
+        response = client.post("/api/notes/notes/", json={"task_id": task_id, "content": content}, headers=author)
+        assert response.status_code == 200, response.text
+
+    rows = _ndjson(client.get("/api/notes/export", headers=admin_headers))
+    assert [(row["content"], row["user_id"]) for row in rows] == [
+        ("first", admin.id), ("second", member.id), ("third", admin.id),
+    ]
+    rows = _ndjson(client.get("/api/notes/export", headers=headers))
+    assert [row["content"] for row in rows] == ["second"]
+    response = client.get("/api/notes/export", params={"format": "csv", "task_id": task_id + 100}, headers=admin_headers)
+    assert response.text.splitlines() == ["id,task_id,user_id,content,created_at,updated_at"]
+
+def test_queued_export_matches_the_streamed_one(client, member):
+    headers = login(client, member)
+    response = client.post("/api/tasks/export", params={"format": "csv", "sort": "title"}, headers=headers)
+    assert response.status_code == 202
+    job_url = response.headers["location"]
+    assert client.get(f"{job_url}/download", headers=headers).status_code == 409
+
+    assert jobs.run_one()
+    job = client.get(job_url, headers=headers).json()
+    assert job["status"] == jobs.COMPLETED
+    assert job["result"]["rows"] == 2
+    download = client.get(f"{job_url}/download", headers=headers)
+    streamed = client.get("/api/tasks/export", params={"format": "csv", "sort": "title"}, headers=headers)
+    assert download.status_code == 200
+    assert download.text == streamed.text
@@ -0,0 +1,57 @@
+import pytest
+
+from tests.conftest import create_task, login, make_user
+
+@pytest.fixture
+def task(client, admin_headers, db):
+    member = make_user(db, "bob")
+    created = create_task(client, admin_headers, title="a", due_date="2030-01-01", assigned_to=member.id)
+    return created["id"], member
+
+@pytest.mark.parametrize("params, detail", [
+    ({"fields": "title,password"}, "Unknown field: password. Allowed: id, title, description"),
+    ({"fields": "title; DROP TABLE tasks"}, "Unknown field: title; DROP TABLE tasks"),
+    ({"include": "creator,notes"}, "Unknown include: notes. Allowed: creator, assignee"),
+])
+def test_unknown_names_are_rejected(client, admin_headers, task, params, detail):
+    task_id, _ = task
+    for url in ("/api/tasks", f"/api/tasks/{task_id}"):
+        response = client.get(url, params=params, headers=admin_headers)
+        assert response.status_code == 400
+        assert response.json()["detail"].startswith(detail)
+
+def test_fields_trim_list_items(client, admin_headers, task):
+    task_id, _ = task
+    params = {"fields": " title , due_date,", "include": ""}
+    page = client.get("/api/tasks", params=params, headers=admin_headers).json()
+    assert page["items"] == [{"id": task_id, "title": "a", "due_date": "2030-01-01"}]
+    assert page["included_users"] == []
+
+def test_include_picks_the_related_users(client, admin, admin_headers, task):
+    task_id, member = task
+    page = client.get("/api/tasks", params={"include": "assignee"}, headers=admin_headers).json()
+    assert [user["id"] for user in page["included_users"]] == [member.id]
+    assert set(page["items"][0]) == {
+        "id", "title", "description", "status", "priority", "due_date",
+        "created_by", "assigned_to", "created_at", "updated_at",
+    }
+    page = client.get("/api/tasks", params={"fields": "title", "include": "creator"}, headers=admin_headers).json()
+    assert page["items"] == [{"id": task_id, "title": "a"}]
+    assert [user["id"] for user in page["included_users"]] == [admin.id]
+
+def test_fields_trim_the_task_detail(client, admin, admin_headers, task):
+    task_id, member = task
+    params = {"fields": "status", "include": "creator"}
+    body = client.get(f"/api/tasks/{task_id}", params=params, headers=admin_headers).json()
+    assert set(body) == {"id", "status", "creator"}
+    assert body["creator"]["id"] == admin.id
+    body = client.get(f"/api/tasks/{task_id}", params={"include": ""}, headers=admin_headers).json()
+    assert "creator" not in body and "assignee" not in body
+    assert body["assigned_to"] == member.id
+
+def test_trimmed_fields_still_check_access(client, task, db):
+    task_id, member = task
+    params = {"fields": "title", "include": ""}
+    assert client.get(f"/api/tasks/{task_id}", params=params, headers=login(client, member)).json() == {"id": task_id, "title": "a"}
+    outsider = login(client, make_user(db, "carol"))
+    assert client.get(f"/api/tasks/{task_id}", params=params, headers=outsider).status_code == 403
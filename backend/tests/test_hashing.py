@@ -0,0 +1,24 @@
+import asyncio
+import threading
+
+from app import hashing
+
+def test_async_hashing_without_workers_leaves_the_event_loop(monkeypatch):
+    assert hashing.HASH_WORKERS <= 0
+    threads = []
+    def fake_hash(password):
+        threads.append(threading.get_ident())
+        return "hashed"
+    monkeypatch.setattr(hashing.pwd_context, "hash", fake_hash)
+
+    async def hash_on_loop():
+        return threading.get_ident(), await hashing.hash_password_async("secret")
+
+    loop_thread, hashed = asyncio.run(hash_on_loop())
+    assert hashed == "hashed"
+    assert threads and threads[0] != loop_thread
+
+def test_hash_round_trip():
+    hashed = hashing.hash_password("secret")
+    assert hashing.verify_and_update("secret", hashed) == (True, None)
+    assert hashing.verify_and_update("wrong", hashed)[0] is False
@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app import database, revocation
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _fail():
+    raise ConnectionError("database is down")
+
+async def _fail_async():
+    _fail()
+
+def test_liveness_never_touches_the_database(client, monkeypatch):
+    monkeypatch.setattr(database, "ping", _fail)
+    statements = []
+    record = lambda *args: statements.append(args[2])
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        response = client.get("/healthz")
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+    assert statements == []
+
+def test_ready_once_started_and_the_database_answers(client):
+    response = client.get("/readyz")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "ok"
+    assert body["startup_seconds"] >= 0
+    assert set(body["pools"]) == {"sync", "async"}
+    assert body["replicas"] == {}
+
+def test_not_ready_while_the_database_is_down(client, monkeypatch):
+    monkeypatch.setattr(database, "ping", _fail)
+    response = client.get("/readyz")
+    assert response.status_code == 503
+    assert response.json()["status"] == "unavailable"
+    assert client.get("/healthz").status_code == 200
+
+def test_not_ready_while_the_async_pool_is_down(client, monkeypatch):
+    monkeypatch.setattr(database, "ping_async", _fail_async)
+    response = client.get("/readyz")
+    assert response.status_code == 503
+    assert response.json()["status"] == "unavailable"
+
+def test_not_ready_before_revoked_tokens_load(client, monkeypatch):
+    monkeypatch.setattr(revocation.revocations, "loaded", False)
+    response = client.get("/readyz")
+    assert response.status_code == 503
+    assert response.json()["status"] == "starting"
+
+def test_importing_the_app_does_no_io(tmp_path):
+    """
+    No create_all, and no connection at all, until the app is started.
+    """
+    path = tmp_path / "untouched.db"
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{path}", "DB_ASYNC": "true"}
+    result = subprocess.run(
+        [sys.executable, "-c", "import app.main"], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    assert not path.exists()
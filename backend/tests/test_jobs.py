@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql
+
+from app import jobs, models
+from tests.conftest import login, make_user
+
+@pytest.fixture
+def handlers(monkeypatch):
+    """
+    Test job kinds; each run is recorded as (kind, params, attempt).
+    """
+    runs = []
+
+    def record(kind):
+        def run(job: jobs.JobContext) -> dict:
+            runs.append((kind, job.params, job.attempt))
+            if kind == "boom":
+                raise RuntimeError("it broke")
+            job.progress(1, 1)
+            return {"ok": True}
+        return run
+    for kind in ("echo", "boom"):
+        monkeypatch.setitem(jobs._handlers, kind, record(kind))
+    return runs
+
+def _enqueue(db, kind: str, **values) -> int:
+    job = jobs.enqueue(db, kind, {"n": 1}, **values)
+    db.commit()
+    return job.id
+
+def _job(db, job_id: int) -> models.Job:
+    db.expire_all()
+    return db.get(models.Job, job_id)
+
+def _backdate(db, job_id: int, **columns) -> None:
+    past = datetime.utcnow() - timedelta(seconds=1)
+    db.execute(update(models.Job).where(models.Job.id == job_id).values(**{column: past for column in columns}))
+    db.commit()
+
+def test_claim_skips_locked_rows():
+    sql = str(jobs._claim_statement(datetime.utcnow()).compile(dialect=postgresql.dialect()))
+    assert "FOR UPDATE SKIP LOCKED" in sql
+
+def test_jobs_run_in_order_and_complete(db, handlers):
+    first = _enqueue(db, "echo")
+    second = _enqueue(db, "echo")
+    assert jobs.run_one() and jobs.run_one()
+    assert not jobs.run_one()
+    assert [run[2] for run in handlers] == [1, 1]
+    for job_id in (first, second):
+        job = _job(db, job_id)
+        assert (job.status, job.attempts, job.result, job.progress, job.total) == (jobs.COMPLETED, 1, {"ok": True}, 1, 1)
+        assert job.locked_until is None and job.finished_at is not None
+
+def test_running_job_is_not_claimed_twice(db, handlers):
+    job_id = _enqueue(db, "echo")
+    claimed = jobs._claim()
+    assert claimed.id == job_id
+    # Another worker finds nothing while the lease holds
+    assert jobs._claim() is None
+    assert not jobs.run_one()
+    assert _job(db, job_id).status == jobs.RUNNING
+
+def test_expired_lease_is_reclaimed(db, handlers):
+    job_id = _enqueue(db, "echo")
+    stale = jobs._claim()
+    _backdate(db, job_id, locked_until=True)
+
+    assert jobs.run_one()
+    assert handlers == [("echo", {"n": 1}, 2)]
+    job = _job(db, job_id)
+    assert (job.status, job.attempts) == (jobs.COMPLETED, 2)
+
+    # The first worker finishing late doesn't overwrite the newer run
+    jobs._finish(stale.id, stale.attempts, status=jobs.FAILED, error="late")
+    assert _job(db, job_id).status == jobs.COMPLETED
+
+def test_failures_are_retried_then_recorded(db, handlers):
+    job_id = _enqueue(db, "boom", max_attempts=2)
+    assert jobs.run_one()
+    job = _job(db, job_id)
+    assert (job.status, job.attempts, job.error) == (jobs.QUEUED, 1, "it broke")
+    assert job.run_at > datetime.utcnow()
+    # Not due until the retry delay has passed
+    assert not jobs.run_one()
+
+    _backdate(db, job_id, run_at=True)
+    assert jobs.run_one()
+    job = _job(db, job_id)
+    assert (job.status, job.attempts, job.error) == (jobs.FAILED, 2, "it broke")
+    assert job.finished_at is not None
+    assert [run[2] for run in handlers] == [1, 2]
+
+def test_unknown_kind_fails_without_retry(db, handlers):
+    job_id = _enqueue(db, "echo")
+    del jobs._handlers["echo"]
+    assert jobs.run_one()
+    job = _job(db, job_id)
+    assert (job.status, job.attempts) == (jobs.FAILED, 1)
+    assert "No handler" in job.error
+
+def test_enqueue_rejects_unknown_kinds(db):
+    with pytest.raises(ValueError):
+        jobs.enqueue(db, "nothing", {})
+
+def test_jobs_are_visible_to_their_owner_and_admins(client, admin, admin_headers, db, handlers):
+    member, other = make_user(db, "bob"), make_user(db, "carol")
+    mine = _enqueue(db, "echo", created_by=member.id)
+    admins = _enqueue(db, "echo", created_by=admin.id)
+    headers, other_headers = login(client, member), login(client, other)
+
+    assert [job["id"] for job in client.get("/api/jobs", headers=headers).json()] == [mine]
+    assert [job["id"] for job in client.get("/api/jobs", headers=admin_headers).json()] == [admins]
+    assert client.get("/api/jobs", headers=other_headers).json() == []
+
+    assert client.get(f"/api/jobs/{mine}", headers=headers).json()["status"] == jobs.QUEUED
+    assert client.get(f"/api/jobs/{mine}", headers=admin_headers).status_code == 200
+    assert client.get(f"/api/jobs/{mine}", headers=other_headers).status_code == 404
+    assert client.get(f"/api/jobs/{admins}", headers=headers).status_code == 404
+    assert client.get(f"/api/jobs/{mine}/download", headers=other_headers).status_code == 404
@@ -0,0 +1,67 @@
+from prometheus_client import REGISTRY
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.routing import Match
+
+from tests.conftest import create_task
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+def _template(client, path: str) -> str:
+    """
+    The path template of the route `path` is served by; the async routers use their own.
+    """
+    scope = {"type": "http", "method": "GET", "path": path}
+    return next(route.path for route in client.app.routes if route.matches(scope)[0] == Match.FULL)
+
+def test_requests_are_counted_by_route_template(client, admin_headers):
+    task_id = create_task(client, admin_headers, title="a")["id"]
+    labels = {"method": "GET", "route": _template(client, f"/api/tasks/{task_id}"), "status": "200"}
+    assert labels["route"].startswith("/api/tasks/{task_id")
+    before = _sample("http_request_duration_seconds_count", **labels)
+    for _ in range(2):
+        assert client.get(f"/api/tasks/{task_id}", headers=admin_headers).status_code == 200
+    assert _sample("http_request_duration_seconds_count", **labels) == before + 2
+
+def test_unmatched_paths_share_one_label(client, admin_headers):
+    labels = {"method": "GET", "route": "unmatched", "status": "404"}
+    before = _sample("http_request_duration_seconds_count", **labels)
+    assert client.get("/no/such/path/1").status_code == 404
+    assert client.get("/no/such/path/2").status_code == 404
+    assert _sample("http_request_duration_seconds_count", **labels) == before + 2
+
+def test_statements_are_counted_per_request(client, admin_headers):
+    create_task(client, admin_headers, title="a")
+    labels = {"method": "GET", "route": "/api/tasks"}
+    count_before = _sample("http_request_queries_count", **labels)
+    sum_before = _sample("http_request_queries_sum", **labels)
+
+    statements = []
+    record = lambda *args: statements.append(args[2])
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        assert client.get("/api/tasks", params={"include_total": True}, headers=admin_headers).status_code == 200
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+    assert statements
+    assert _sample("http_request_queries_count", **labels) == count_before + 1
+    assert _sample("http_request_queries_sum", **labels) == sum_before + len(statements)
+    assert _sample("http_request_db_seconds_count", **labels) >= 1
+
+def test_metrics_endpoint_exposes_every_family(client, admin_headers):
+    client.get("/api/tasks", headers=admin_headers)
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    for name in (
+        "http_request_duration_seconds_bucket",
+        "http_request_db_seconds_bucket",
+        "http_request_queries_bucket",
+        "db_query_duration_seconds_count",
+        'db_pool_size{pool="sync"}',
+        'db_pool_connections{pool="sync",state="checked_out"}',
+        "app_startup_seconds",
+    ):
+        assert name in response.text
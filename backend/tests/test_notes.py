@@ -0,0 +1,91 @@
+import pytest
+
+from app.pagination import MAX_PAGE_SIZE
+from tests.conftest import create_task, login, make_user
+
+def _note(client, headers, task_id: int, content: str) -> int:
+    response = client.post("/api/notes/notes/", json={"task_id": task_id, "content": content}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+@pytest.fixture
+def notes(client, admin_headers, db):
+    """
+    Two tasks shared with bob, with notes written alternately by admin and bob.
+    """
+    member = make_user(db, "bob")
+    headers = login(client, member)
+    tasks = [create_task(client, admin_headers, title=title, assigned_to=member.id)["id"] for title in ("a", "b")]
+    written = []
+    for n in range(5):
+        task_id = tasks[n % 2]
+        author = admin_headers if n % 2 == 0 else headers
+        written.append((task_id, f"note {n}", _note(client, author, task_id, f"note {n}")))
+    return member, tasks, written
+
+def _contents(notes: list) -> list:
+    return [note["content"] for note in notes]
+
+def test_cursor_walks_every_note_newest_first(client, admin_headers, notes):
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2} if cursor is None else {"limit": 2, "cursor": cursor}
+        response = client.get("/api/notes/notes/", params=params, headers=admin_headers)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        assert len(body["items"]) <= 2
+        seen += _contents(body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [f"note {n}" for n in reversed(range(5))]
+
+def test_members_page_through_their_own_notes(client, notes):
+    member, _, _ = notes
+    headers = login(client, member)
+    first = client.get("/api/notes/notes/", params={"limit": 1}, headers=headers).json()
+    assert _contents(first["items"]) == ["note 3"]
+    second = client.get("/api/notes/notes/", params={"limit": 1, "cursor": first["next_cursor"]}, headers=headers).json()
+    assert _contents(second["items"]) == ["note 1"]
+    assert second["next_cursor"] is None
+
+def test_bad_cursor_is_rejected(client, admin_headers, notes):
+    assert client.get("/api/notes/notes/", params={"cursor": "nonsense"}, headers=admin_headers).status_code == 400
+
+def test_batch_groups_notes_by_task(client, admin_headers, notes):
+    _, (a, b), _ = notes
+    empty = create_task(client, admin_headers, title="empty")["id"]
+    response = client.get("/api/notes/notes/", params={"task_ids": f"{b},{a},{empty},{a}"}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    grouped = {int(task_id): _contents(items) for task_id, items in response.json()["notes"].items()}
+    assert grouped == {a: ["note 4", "note 2", "note 0"], b: ["note 3", "note 1"], empty: []}
+
+def test_per_task_keeps_the_latest_notes(client, admin_headers, notes):
+    _, (a, b), _ = notes
+    response = client.get("/api/notes/notes/", params={"task_ids": f"{a},{b}", "per_task": 1}, headers=admin_headers)
+    grouped = {int(task_id): _contents(items) for task_id, items in response.json()["notes"].items()}
+    assert grouped == {a: ["note 4"], b: ["note 3"]}
+    response = client.get("/api/notes/notes/", params={"task_ids": f"{a},{b}", "per_task": 2}, headers=admin_headers)
+    grouped = {int(task_id): _contents(items) for task_id, items in response.json()["notes"].items()}
+    assert grouped == {a: ["note 4", "note 2"], b: ["note 3", "note 1"]}
+
+def test_batch_checks_access_to_every_task(client, admin_headers, notes, db):
+    _, (a, b), _ = notes
+    outsider = login(client, make_user(db, "carol"))
+    theirs = create_task(client, outsider, title="theirs")["id"]
+    response = client.get("/api/notes/notes/", params={"task_ids": f"{a},{theirs},{b}"}, headers=outsider)
+    assert response.status_code == 403
+    assert response.json()["detail"] == f"Not authorized to view notes for tasks: {a}, {b}"
+    response = client.get("/api/notes/notes/", params={"task_ids": f"{a},9998,9999"}, headers=admin_headers)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Tasks not found: 9998, 9999"
+
+@pytest.mark.parametrize("params, status", [
+    ({"task_ids": "1,two"}, 400),
+    ({"task_ids": ","}, 400),
+    ({"task_ids": ",".join(str(n) for n in range(1, MAX_PAGE_SIZE + 2))}, 400),
+    ({"task_ids": "1", "per_task": 0}, 422),
+    ({"limit": 0}, 422),
+])
+def test_bad_parameters_are_rejected(client, admin_headers, notes, params, status):
+    assert client.get("/api/notes/notes/", params=params, headers=admin_headers).status_code == status
@@ -0,0 +1,47 @@
+import pytest
+
+from app.pagination import encode_cursor
+
+def _create_tasks(client, headers, count: int) -> None:
+    for i in range(count):
+        response = client.post("/api/tasks", json={"title": f"Task {i}"}, headers=headers)
+        assert response.status_code == 200, response.text
+
+@pytest.mark.parametrize("sort", ["created_at", "-created_at", "title", "-title", "due_date", "-due_date"])
+def test_pages_follow_the_cursor(client, admin_headers, sort):
+    for i in range(7):
+        due_date = f"2030-01-0{i % 3 + 1}" if i % 2 else None
+        response = client.post("/api/tasks", json={"title": f"Task {i % 4}", "due_date": due_date}, headers=admin_headers)
+        assert response.status_code == 200, response.text
+    expected = [task["id"] for task in client.get("/api/tasks", params={"sort": sort, "limit": 100}, headers=admin_headers).json()["items"]]
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, "sort": sort}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/api/tasks", params=params, headers=admin_headers).json()
+        seen += [task["id"] for task in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert len(expected) == 7
+    assert seen == expected
+
+@pytest.mark.parametrize("sort, cursor", [
+    ("title", "not-a-cursor"),
+    ("title", encode_cursor("title", "Task 1", "1; DROP TABLE tasks")),
+    ("title", encode_cursor("title", "Task 1", True)),
+    ("title", encode_cursor("title", 7, 1)),
+    ("title", encode_cursor("title", None, 1)),
+    ("created_at", encode_cursor("created_at", "yesterday", 1)),
+    ("due_date", encode_cursor("due_date", [2024, 1, 1], 1)),
+    ("title", encode_cursor("title", "Task 1")),
+])
+def test_tampered_task_cursor_is_rejected(client, admin_headers, sort, cursor):
+    _create_tasks(client, admin_headers, 2)
+    response = client.get("/api/tasks", params={"sort": sort, "cursor": cursor}, headers=admin_headers)
+    assert response.status_code == 400
+
+def test_tampered_user_cursor_is_rejected(client, admin_headers):
+    response = client.get("/api/users", params={"cursor": encode_cursor("abc")}, headers=admin_headers)
+    assert response.status_code == 400
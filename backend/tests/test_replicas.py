@@ -0,0 +1,71 @@
+import os
+
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+
+from app import database, models
+
+@pytest.fixture
+def replica_set(db, tmp_path, monkeypatch):
+    """
+    Two SQLite replicas with the schema, routed to by read_session.
+    """
+    urls = [f"sqlite:///{tmp_path}/replica1.db", f"sqlite:///{tmp_path}/replica2.db"]
+    replicas = database.ReplicaSet(urls)
+    for replica in replicas.replicas:
+        models.Base.metadata.create_all(bind=replica.engine)
+    monkeypatch.setattr(database, "replicas", replicas)
+    yield replicas
+    for replica in replicas.replicas:
+        replica.engine.dispose()
+
+def _read_from() -> str:
+    with database.read_session() as db:
+        return os.path.basename(db.connection().engine.url.database)
+
+def test_reads_rotate_over_healthy_replicas(replica_set):
+    assert sorted(_read_from() for _ in range(4)) == ["replica1.db", "replica1.db", "replica2.db", "replica2.db"]
+
+def test_reads_go_to_the_primary_without_replicas(db):
+    assert _read_from() == "test.db"
+
+def test_failed_health_check_takes_a_replica_out(replica_set, tmp_path):
+    down = replica_set.replicas[0]
+    down.engine.dispose()
+    down.engine = database._create_engine(f"sqlite:///{tmp_path}/missing/replica1.db")
+    replica_set.check()
+    assert replica_set.status()["replica1"]["healthy"] is False
+    assert {_read_from() for _ in range(4)} == {"replica2.db"}
+
+    os.mkdir(tmp_path / "missing")
+    replica_set.check()
+    assert replica_set.status()["replica1"]["healthy"] is True
+    assert {_read_from() for _ in range(4)} == {"replica1.db", "replica2.db"}
+
+def test_reads_fall_back_to_the_primary_when_every_replica_is_down(replica_set, tmp_path):
+    for replica in replica_set.replicas:
+        replica.engine.dispose()
+        replica.engine = database._create_engine(f"sqlite:///{tmp_path}/missing/{replica.name}.db")
+    # Still trusted: the failed connect itself takes each replica out
+    assert _read_from() == "test.db"
+    assert not replica_set.candidates()
+
+def test_lagging_replica_is_taken_out(replica_set, monkeypatch):
+    monkeypatch.setattr(database, "DB_REPLICA_MAX_LAG", -1)
+    replica_set.check()
+    assert _read_from() == "test.db"
+
+def test_read_session_refuses_writes(replica_set):
+    with database.read_session() as db:
+        db.add(models.User(name="X", email="x@example.com", hashed_password="x", role=models.UserRole.member))
+        with pytest.raises(InvalidRequestError):
+            db.flush()
+
+def test_listing_endpoint_reads_the_replica(client, admin_headers, replica_set):
+    with database.SessionLocal(bind=replica_set.replicas[0].engine) as replica_db:
+        replica_db.add(models.Task(title="Replicated", status="pending", priority="medium", created_by=1))
+        replica_db.commit()
+    replica_set.replicas[1].healthy = False
+    response = client.get("/api/tasks", headers=admin_headers)
+    assert response.status_code == 200, response.text
+    assert [task["title"] for task in response.json()["items"]] == ["Replicated"]
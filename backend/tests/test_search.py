@@ -0,0 +1,54 @@
+import pytest
+
+from tests.conftest import login, make_user
+
+@pytest.fixture
+def member(db):
+    return make_user(db, "bob")
+
+@pytest.fixture
+def tasks(client, admin_headers, member):
+    created = {}
+    for title, description, assigned_to in [
+        ("Deploy the release", "Ship it", member.id),
+        ("Write docs", "Explain how to deploy", member.id),
+        ("Deploy the hotfix", "Admin only", None),
+        ("Budget 100% done", None, None),
+    ]:
+        response = client.post("/api/tasks", json={"title": title, "description": description, "assigned_to": assigned_to}, headers=admin_headers)
+        assert response.status_code == 200, response.text
+        created[title] = response.json()["id"]
+    response = client.post("/api/notes/notes/", json={"task_id": created["Write docs"], "content": "Deploy checklist attached"}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    return created
+
+def _search(client, headers, **params):
+    response = client.get("/api/search", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["results"]
+
+def test_title_hits_rank_above_description_and_note_hits(client, admin_headers, tasks):
+    results = _search(client, admin_headers, q="deploy")
+    hits = [(r["type"], r["task_id"]) for r in results]
+    assert set(hits[:2]) == {("task", tasks["Deploy the release"]), ("task", tasks["Deploy the hotfix"])}
+    assert set(hits[2:]) == {("task", tasks["Write docs"]), ("note", tasks["Write docs"])}
+    assert results[1]["rank"] > results[2]["rank"]
+
+def test_members_only_find_their_tasks(client, member, tasks):
+    results = _search(client, login(client, member), q="deploy")
+    assert tasks["Deploy the hotfix"] not in {r["task_id"] for r in results}
+    assert len(results) == 3
+
+def test_types_narrow_the_search(client, admin_headers, tasks):
+    results = _search(client, admin_headers, q="checklist", types="notes")
+    assert [(r["type"], r["task_id"]) for r in results] == [("note", tasks["Write docs"])]
+    assert _search(client, admin_headers, q="checklist", types="tasks") == []
+
+def test_like_wildcards_are_matched_literally(client, admin_headers, tasks):
+    assert [r["task_id"] for r in _search(client, admin_headers, q="100%")] == [tasks["Budget 100% done"]]
+    assert _search(client, admin_headers, q="_") == []
+
+@pytest.mark.parametrize("types", ["users", "task", ""])
+def test_unknown_types_are_rejected(client, admin_headers, types):
+    response = client.get("/api/search", params={"q": "docs", "types": types}, headers=admin_headers)
+    assert response.status_code == 422
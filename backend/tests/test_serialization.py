@@ -0,0 +1,31 @@
+from sqlalchemy import select
+
+from app import models, schemas
+from tests.conftest import create_task, make_user
+
+def test_task_page_matches_the_pydantic_output(client, admin_headers, db):
+    """
+    The orjson page has the same bytes TaskListPage would have produced.
+    """
+    member = make_user(db, "bob")
+    create_task(client, admin_headers, title="a", description="Første – “quoted”", due_date="2030-01-01")
+    create_task(client, admin_headers, title="b", status="in_progress", priority="high", assigned_to=member.id)
+    create_task(client, admin_headers, title="c", assigned_to=member.id)
+
+    response = client.get("/api/tasks", params={"sort": "title", "limit": 2, "include_total": True}, headers=admin_headers)
+    assert response.status_code == 200
+    body = response.json()
+
+    db.expire_all()
+    tasks = db.scalars(select(models.Task).order_by(models.Task.title).limit(2)).all()
+    # included_users order is not part of the contract; follow the response's
+    users = {user.id: user for user in db.scalars(select(models.User))}
+    expected = schemas.TaskListPage(
+        items=[schemas.TaskListItem.model_validate(task, from_attributes=True) for task in tasks],
+        included_users=[schemas.User.model_validate(users[user["id"]]) for user in body["included_users"]],
+        next_cursor=body["next_cursor"],
+        total=3,
+    )
+    assert sorted(user["id"] for user in body["included_users"]) == sorted(users)
+    assert body["next_cursor"] is not None
+    assert response.content == expected.model_dump_json().encode()
@@ -0,0 +1,82 @@
+from sqlalchemy import func, select
+
+from app import models
+from tests.conftest import assert_summary_matches, create_task, login, make_user
+
+def _recount(db, user_id=None) -> dict:
+    """
+    The counts /api/tasks/stats should report, by GROUP BY over tasks.
+    """
+    db.expire_all()
+    task = models.Task
+    scope = True if user_id is None else (task.created_by == user_id) | (task.assigned_to == user_id)
+
+    def counts(column) -> dict:
+        return dict(db.execute(select(column, func.count()).where(scope).group_by(column)).all())
+    by_status, by_priority = counts(task.status), counts(task.priority)
+    return {"total": sum(by_status.values()), "by_status": by_status, "by_priority": by_priority}
+
+def _stats(client, headers, **params) -> dict:
+    response = client.get("/api/tasks/stats", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    nonzero = lambda counts: {key: count for key, count in counts.items() if count}
+    return {"total": body["total"], "by_status": nonzero(body["by_status"]), "by_priority": nonzero(body["by_priority"])}
+
+def _check(client, headers, db, member) -> None:
+    assert_summary_matches(db)
+    assert _stats(client, headers) == _recount(db)
+    assert _stats(client, headers, member_id=member.id) == _recount(db, member.id)
+    assert _stats(client, login(client, member)) == _recount(db, member.id)
+
+def test_stats_follow_single_writes(client, admin_headers, db):
+    member = make_user(db, "bob")
+    a = create_task(client, admin_headers, title="a", assigned_to=member.id)["id"]
+    b = create_task(client, admin_headers, title="b", priority="high")["id"]
+    create_task(client, login(client, member), title="c", status="in_progress")
+    _check(client, admin_headers, db, member)
+
+    response = client.put(f"/api/tasks/{a}", json={"status": "completed", "assigned_to": None}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    response = client.put(f"/api/tasks/{b}", json={"priority": "low", "assigned_to": member.id}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    _check(client, admin_headers, db, member)
+
+    assert client.delete(f"/api/tasks/{b}", headers=admin_headers).status_code == 200
+    _check(client, admin_headers, db, member)
+
+def test_stats_follow_bulk_writes(client, admin_headers, db):
+    member = make_user(db, "bob")
+    response = client.post("/api/tasks/bulk", json=[
+        {"title": "a", "assigned_to": member.id},
+        {"title": "b", "status": "completed"},
+        {"title": "c", "priority": "high", "assigned_to": member.id},
+    ], headers=admin_headers)
+    assert response.status_code == 200, response.text
+    a, b, c = [item["id"] for item in response.json()["results"]]
+    _check(client, admin_headers, db, member)
+
+    response = client.put("/api/tasks/bulk", json=[
+        {"id": a, "status": "in_progress"},
+        {"id": b, "assigned_to": member.id},
+        {"id": c, "assigned_to": None, "priority": "low"},
+    ], headers=admin_headers)
+    assert response.status_code == 200, response.text
+    _check(client, admin_headers, db, member)
+
+    response = client.request("DELETE", "/api/tasks/bulk", json={"ids": [a, c]}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    _check(client, admin_headers, db, member)
+
+def test_stats_list_every_status_and_priority(client, admin_headers, db):
+    member = make_user(db, "bob")
+    create_task(client, admin_headers, title="a", status="in_progress", assigned_to=member.id)
+    body = client.get("/api/tasks/stats", headers=admin_headers).json()
+    assert body["by_status"] == {"pending": 0, "in_progress": 1, "completed": 0}
+    assert body["by_priority"] == {"low": 0, "medium": 1, "high": 0}
+    assert body["by_assignee"] == [
+        {"user_id": member.id, "total": 1, "by_status": {"pending": 0, "in_progress": 1, "completed": 0}},
+    ]
+    empty = client.get("/api/tasks/stats", headers=login(client, make_user(db, "carol"))).json()
+    assert empty["by_status"] == {"pending": 0, "in_progress": 0, "completed": 0}
+    assert empty["by_priority"] == {"low": 0, "medium": 0, "high": 0}
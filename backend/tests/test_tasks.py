@@ -0,0 +1,54 @@
+import pytest
+
+from tests.conftest import create_task, login, make_user
+
+def _titles(client, headers, **params) -> list:
+    response = client.get("/api/tasks", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return [task["title"] for task in response.json()["items"]]
+
+@pytest.fixture
+def tasks(client, admin_headers, db):
+    member = make_user(db, "bob")
+    create_task(client, admin_headers, title="a", status="pending", priority="high", due_date="2030-01-01", assigned_to=member.id)
+    create_task(client, admin_headers, title="b", status="completed", priority="low", due_date="2030-02-01")
+    create_task(client, admin_headers, title="c", status="in_progress", priority="high")
+    return member
+
+@pytest.mark.parametrize("params, expected", [
+    ({"status": "pending"}, ["a"]),
+    ({"status": ["pending", "completed"]}, ["a", "b"]),
+    ({"priority": "high"}, ["a", "c"]),
+    ({"due_after": "2030-01-15"}, ["b"]),
+    ({"due_before": "2030-01-15"}, ["a"]),
+    ({"priority": "high", "status": "in_progress"}, ["c"]),
+])
+def test_filters(client, admin_headers, tasks, params, expected):
+    assert _titles(client, admin_headers, sort="title", **params) == expected
+
+def test_assigned_to_filter(client, admin_headers, tasks):
+    assert _titles(client, admin_headers, assigned_to=tasks.id) == ["a"]
+
+@pytest.mark.parametrize("sort, expected", [
+    ("title", ["a", "b", "c"]),
+    ("-title", ["c", "b", "a"]),
+    ("created_at", ["a", "b", "c"]),
+    ("-created_at", ["c", "b", "a"]),
+    ("due_date", ["a", "b", "c"]),
+    ("-due_date", ["b", "a", "c"]),
+])
+def test_sorts(client, admin_headers, tasks, sort, expected):
+    assert _titles(client, admin_headers, sort=sort) == expected
+
+@pytest.mark.parametrize("sort", ["priority", "-id", "description", "title; DROP TABLE tasks"])
+def test_unknown_sort_is_rejected(client, admin_headers, tasks, sort):
+    response = client.get("/api/tasks", params={"sort": sort}, headers=admin_headers)
+    assert response.status_code == 400
+    assert "Allowed: created_at, due_date, title" in response.json()["detail"]
+
+@pytest.mark.parametrize("params", [{"status": "archived"}, {"priority": "urgent"}, {"due_after": "soon"}])
+def test_invalid_filter_values_are_rejected(client, admin_headers, params):
+    assert client.get("/api/tasks", params=params, headers=admin_headers).status_code == 422
+
+def test_members_only_list_their_tasks(client, tasks):
+    assert _titles(client, login(client, tasks), sort="title") == ["a"]
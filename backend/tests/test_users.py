@@ -0,0 +1,62 @@
+from app import jobs, models, ratelimit
+from tests.conftest import login, make_user
+
+class _RecordingBackend:
+    blocking = False
+
+    def __init__(self):
+        self.keys = []
+
+    def take(self, key: str, limit: ratelimit.Limit) -> float:
+        self.keys.append(key)
+        return 0.0
+
+def test_admin_password_change_is_limited_per_target_user(client, db, admin, admin_headers, monkeypatch):
+    member = make_user(db, "bob")
+    recorder = _RecordingBackend()
+    monkeypatch.setattr(ratelimit, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(ratelimit, "backend", recorder)
+
+    response = client.put(f"/api/users/{member.id}/password", json={"new_password": "changed"}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    assert f"{ratelimit.PASSWORD_BY_USER.name}:{member.id}" in recorder.keys
+    assert f"{ratelimit.PASSWORD_BY_USER.name}:{admin.id}" not in recorder.keys
+
+def test_notes_of_a_deleted_author_are_still_listed(client, db, admin, admin_headers):
+    member = make_user(db, "bob")
+    member_headers = login(client, member)
+    task = client.post("/api/tasks", json={"title": "Shared", "assigned_to": member.id}, headers=admin_headers).json()
+    response = client.post("/api/notes/notes/", json={"task_id": task["id"], "content": "Bob's note"}, headers=member_headers)
+    assert response.status_code == 200, response.text
+
+    assert client.delete(f"/api/users/{member.id}", headers=admin_headers).status_code == 202
+    while jobs.run_one():
+        pass
+
+    by_task = client.get(f"/api/notes/notes/task/{task['id']}", headers=admin_headers)
+    assert by_task.status_code == 200, by_task.text
+    batch = client.get("/api/notes/notes/", params={"task_ids": task["id"]}, headers=admin_headers)
+    assert batch.status_code == 200, batch.text
+    for notes in (by_task.json(), batch.json()["notes"][str(task["id"])]):
+        assert [(note["content"], note["user_id"]) for note in notes] == [("Bob's note", None)]
+
+def test_user_deletion_is_tracked_until_the_job_finishes(client, db, admin, admin_headers):
+    member = make_user(db, "bob")
+    for i in range(3):
+        client.post("/api/tasks", json={"title": f"Task {i}", "assigned_to": member.id}, headers=admin_headers)
+
+    response = client.delete(f"/api/users/{member.id}", params={"reassign_to": admin.id}, headers=admin_headers)
+    assert response.status_code == 202, response.text
+    deletion = response.json()
+    assert response.headers["Location"] == f"/api/users/deletions/{deletion['id']}"
+    assert (deletion["user_id"], deletion["status"]) == (member.id, "pending")
+    assert client.get(f"/api/users/{member.id}", headers=admin_headers).status_code == 404
+
+    while jobs.run_one():
+        pass
+    deletion = client.get(f"/api/users/deletions/{deletion['id']}", headers=admin_headers).json()
+    assert (deletion["status"], deletion["tasks_reassigned"], deletion["notes_detached"]) == ("completed", 3, 0)
+    db.expire_all()
+    assert db.get(models.User, deletion["user_id"]) is None
+    tasks = client.get("/api/tasks", headers=admin_headers).json()["items"]
+    assert {task["assigned_to"] for task in tasks} == {admin.id}
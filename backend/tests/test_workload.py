@@ -0,0 +1,77 @@
+from datetime import date, timedelta
+
+from sqlalchemy import select
+
+from app import models
+from tests.conftest import create_task, login, make_user
+
+def _recount(db) -> dict:
+    """
+    User id -> workload, counted task by task in Python.
+    """
+    db.expire_all()
+    today = date.today()
+    workloads = {}
+    for user_id in db.scalars(select(models.User.id).where(models.User.deleted_at.is_(None))):
+        mine = [
+            task for task in db.scalars(select(models.Task))
+            if user_id in (task.created_by, task.assigned_to) and task.status != models.TaskStatus.completed.value
+        ]
+        workloads[user_id] = {
+            "open": len(mine),
+            "in_progress": sum(task.status == models.TaskStatus.in_progress.value for task in mine),
+            "overdue": sum(task.due_date is not None and task.due_date < today for task in mine),
+        }
+    return workloads
+
+def _workloads(client, headers) -> dict:
+    workloads, cursor = {}, None
+    while True:
+        params = {"include_workload": True, "limit": 2}
+        if cursor is not None:
+            params["cursor"] = cursor
+        response = client.get("/api/users", params=params, headers=headers)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        workloads.update({user["id"]: user["workload"] for user in body["items"]})
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return workloads
+
+def test_workloads_match_a_recount(client, admin_headers, db):
+    bob, carol = make_user(db, "bob"), make_user(db, "carol")
+    make_user(db, "idle")
+    bob_headers = login(client, bob)
+    yesterday, tomorrow = str(date.today() - timedelta(days=1)), str(date.today() + timedelta(days=1))
+    create_task(client, admin_headers, title="a", assigned_to=bob.id, due_date=yesterday)
+    create_task(client, admin_headers, title="b", assigned_to=bob.id, status="in_progress", due_date=tomorrow)
+    create_task(client, admin_headers, title="c", assigned_to=carol.id, status="completed", due_date=yesterday)
+    create_task(client, admin_headers, title="d", status="in_progress")
+    # Created and assigned to the same user: counted once
+    create_task(client, bob_headers, title="e", assigned_to=bob.id, due_date=yesterday)
+    create_task(client, bob_headers, title="f", assigned_to=carol.id, status="in_progress")
+
+    workloads = _workloads(client, admin_headers)
+    assert workloads == _recount(db)
+    assert workloads[bob.id] == {"open": 4, "in_progress": 2, "overdue": 2}
+
+def test_workload_etag_follows_task_writes(client, admin_headers, db):
+    bob = make_user(db, "bob")
+    task_id = create_task(client, admin_headers, title="a", assigned_to=bob.id)["id"]
+    params = {"include_workload": True}
+    first = client.get("/api/users", params=params, headers=admin_headers)
+    etag = first.headers["ETag"]
+    assert client.get("/api/users", params=params, headers={**admin_headers, "If-None-Match": etag}).status_code == 304
+
+    response = client.put(f"/api/tasks/{task_id}", json={"status": "completed"}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    changed = client.get("/api/users", params=params, headers={**admin_headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert {user["id"]: user["workload"] for user in changed.json()["items"]} == _recount(db)
+
+    assert client.delete(f"/api/tasks/{task_id}", headers=admin_headers).status_code == 200
+    assert client.get("/api/users", params=params, headers={**admin_headers, "If-None-Match": changed.headers["ETag"]}).status_code == 200
+
+def test_workload_is_left_out_unless_asked(client, admin_headers):
+    items = client.get("/api/users", headers=admin_headers).json()["items"]
+    assert items and all("workload" not in user for user in items)